@@ -0,0 +1,16 @@
+"""
+Last- und Benchmark-Suite für die KanMind-API.
+
+- `benchmarks.data`: erzeugt einen realistischen, reproduzierbaren
+  Datenbestand (Benutzer mit Profil und Token, Boards mit Mitgliedern,
+  ungleich verteilte Tasks und Kommentar-Threads) in wählbarer Größe.
+- `benchmarks.scenarios`: Szenarien (Board-Polling, Task-CRUD,
+  Kommentar-Threads, Login-Sturm) als Folgen von Requests.
+- `benchmarks.runner`: schickt die Szenarien in-process durch die echte
+  URLconf und Middleware und wertet Latenzen (p50/p95/p99), Requests pro
+  Sekunde und Queries pro Request aus.
+
+Aufruf über `manage.py run_benchmarks`; das Ergebnis ist JSON und lässt
+sich mit `--compare` gegen ein früheres Ergebnis (z.B. eines anderen
+Commits) vergleichen.
+"""
@@ -0,0 +1,138 @@
+"""
+Reproduzierbarer Datenbestand für die Benchmarks.
+
+Anders als `kanmind_board_app.management.seeding` (gleichmäßig verteilte
+Daten für Index-Messungen) bildet der Generator eine echte Installation
+nach: Benutzer mit Namen, Profil, Token und Suchindex, Boards mit
+unterschiedlich vielen Mitgliedern, wenige große und viele kleine Boards
+und Kommentar-Threads, die meist kurz und selten sehr lang sind.
+
+Alles wird per bulk_create in Chunks geschrieben; der Speicherbedarf hängt
+nicht von der Anzahl der Tasks ab.
+"""
+import random
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+from kanmind_board_app import counters
+from kanmind_board_app.models import Board, Comment, Task
+from user_auth_app.models import UserProfile
+from user_auth_app.search import index_users
+
+
+CHUNK_SIZE = 5000
+PASSWORD = 'benchmark'
+
+# Größenstufen; `tasks` lässt sich beim Aufruf überschreiben.
+SCALES = {
+    'small': {'users': 500, 'boards': 200, 'tasks': 10_000},
+    'medium': {'users': 5_000, 'boards': 2_000, 'tasks': 100_000},
+    'large': {'users': 20_000, 'boards': 10_000, 'tasks': 1_000_000},
+}
+
+SYLLABLES = ['an', 'ber', 'chri', 'da', 'el', 'fa', 'ge', 'han', 'is', 'jo', 'ka', 'lu', 'ma', 'ni', 'ol', 'pe', 'ra', 'si', 'to', 'ul']
+DOMAINS = ['example.com', 'firma.de', 'mail.org', 'team.io']
+TITLES = ['Login-Seite', 'API-Doku', 'Bugfix Export', 'Release vorbereiten', 'Design-Review', 'Tests ergänzen', 'Kunden-Feedback']
+
+
+@dataclass
+class DatasetSummary:
+    users: int = 0
+    boards: int = 0
+    memberships: int = 0
+    tasks: int = 0
+    comments: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _name(rng, number):
+    first = ''.join(rng.choices(SYLLABLES, k=2)).capitalize()
+    last = ''.join(rng.choices(SYLLABLES, k=3)).capitalize()
+    return f'{first} {last} {number}', f'{first.lower()}.{last.lower()}{number}@{rng.choice(DOMAINS)}'
+
+
+def _thread_length(rng):
+    """Meist 0-3 Kommentare, selten lange Threads (bis 300)."""
+    return min(300, int(rng.paretovariate(1.3)) - 1)
+
+
+def generate(users, boards, tasks, seed=42):
+    """
+    Erzeugt den Datenbestand und gibt eine `DatasetSummary` zurück.
+    Alle Benutzer haben das Passwort `PASSWORD`.
+    """
+    rng = random.Random(seed)
+    summary = DatasetSummary()
+    password = make_password(PASSWORD)
+
+    created_users = []
+    for offset in range(0, users, CHUNK_SIZE):
+        chunk = []
+        for number in range(offset, min(users, offset + CHUNK_SIZE)):
+            username, email = _name(rng, number)
+            chunk.append(User(username=username, email=email, password=password))
+        chunk = User.objects.bulk_create(chunk)
+        UserProfile.objects.bulk_create([UserProfile(user=user) for user in chunk])
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in chunk])
+        index_users(chunk, replace=False)
+        created_users.extend(chunk)
+    summary.users = len(created_users)
+    user_ids = [user.pk for user in created_users]
+
+    created_boards = Board.objects.bulk_create(
+        [Board(title=f'Projekt {i}', owner_id=rng.choice(user_ids)) for i in range(boards)],
+        batch_size=CHUNK_SIZE,
+    )
+    summary.boards = len(created_boards)
+
+    Membership = Board.members.through
+    members_by_board = {}
+    memberships = []
+    for board in created_boards:
+        size = min(len(user_ids), max(2, int(rng.lognormvariate(1.6, 0.6))))
+        members = {board.owner_id, *rng.sample(user_ids, size)}
+        members_by_board[board.pk] = list(members)
+        memberships.extend(Membership(board_id=board.pk, user_id=user_id) for user_id in members)
+    Membership.objects.bulk_create(memberships, batch_size=CHUNK_SIZE)
+    summary.memberships = len(memberships)
+
+    # Wenige große, viele kleine Boards (Zipf-ähnlich).
+    board_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(created_boards))]
+    statuses, status_weights = Task.Status.values, [4, 2, 1, 6]
+    priorities, priority_weights = Task.Priority.values, [3, 5, 2]
+    today = date.today()
+    for offset in range(0, tasks, CHUNK_SIZE):
+        count = min(CHUNK_SIZE, tasks - offset)
+        chunk = []
+        for board in rng.choices(created_boards, board_weights, k=count):
+            members = members_by_board[board.pk]
+            chunk.append(Task(
+                board=board,
+                title=rng.choice(TITLES),
+                description='Automatisch erzeugt.',
+                status=rng.choices(statuses, status_weights)[0],
+                priority=rng.choices(priorities, priority_weights)[0],
+                assignee_id_id=rng.choice(members) if rng.random() < 0.8 else None,
+                reviewer_id_id=rng.choice(members) if rng.random() < 0.5 else None,
+                due_date=today + timedelta(days=rng.randint(-30, 180)),
+            ))
+        chunk = Task.objects.bulk_create(chunk)
+        summary.tasks += len(chunk)
+
+        comments = [
+            Comment(task=task, author_id=rng.choice(members_by_board[task.board_id]), content='Kommentar')
+            for task in chunk
+            for _ in range(_thread_length(rng))
+        ]
+        Comment.objects.bulk_create(comments, batch_size=CHUNK_SIZE)
+        summary.comments += len(comments)
+
+    if created_boards:
+        counters.rebuild(Board.objects.filter(pk__range=(created_boards[0].pk, created_boards[-1].pk)))
+    return summary
@@ -0,0 +1,143 @@
+"""
+Führt Szenarien aus und wertet sie aus.
+
+Die Requests laufen in-process über den DRF-Testclient durch die echte
+URLconf und alle Middlewares, aber ohne Netzwerk und nacheinander;
+Requests pro Sekunde entsprechen damit dem Durchsatz eines Workers. Die
+Query-Anzahl stammt aus dem Profil von `core.middleware.QueryBudgetMiddleware`.
+"""
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+
+import django
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+def percentile(values, fraction):
+    """Perzentil nach Nearest-Rank; `values` müssen sortiert sein."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summarize(latencies, queries):
+    latencies = sorted(latencies)
+    return {
+        'count': len(latencies),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'max': round(latencies[-1], 3),
+            'mean': round(statistics.fmean(latencies), 3),
+        },
+        'queries': {
+            'mean': round(statistics.fmean(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+    }
+
+
+def send(client, step):
+    extra = dict(step.headers)
+    if step.token:
+        extra['HTTP_AUTHORIZATION'] = f'Token {step.token}'
+    if step.method == 'get':
+        return client.get(step.path, step.data, **extra)
+    return getattr(client, step.method)(step.path, step.data, format='json', **extra)
+
+
+def run_scenario(scenario, context, requests, warmup=10, seed=0):
+    """
+    Führt `warmup` + `requests` Requests des Szenarios aus und gibt die
+    Auswertung (gesamt und pro Schritt) zurück.
+    """
+    client = APIClient()
+    steps = scenario(context, random.Random(seed))
+    step = next(steps)
+    for _ in range(warmup):
+        step = steps.send(send(client, step))
+
+    latencies, queries, errors = [], [], []
+    per_step = defaultdict(lambda: ([], []))
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = send(client, step)
+        elapsed = (time.perf_counter() - start) * 1000
+        profile = getattr(response, 'query_profile', None)
+
+        latencies.append(elapsed)
+        per_step[step.name][0].append(elapsed)
+        if profile is not None:
+            queries.append(profile.queries)
+            per_step[step.name][1].append(profile.queries)
+        if response.status_code not in step.expect:
+            errors.append(f'{step.method.upper()} {step.path}: HTTP {response.status_code}')
+        step = steps.send(response)
+    duration = time.perf_counter() - started
+
+    result = summarize(latencies, queries)
+    result.update({
+        'duration_s': round(duration, 3),
+        'rps': round(requests / duration, 2),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'steps': {name: summarize(*samples) for name, samples in sorted(per_step.items())},
+    })
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata(**extra):
+    """Umgebung des Laufs, damit Ergebnisse vergleichbar bleiben."""
+    return {
+        'commit': git_commit(),
+        'created_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        **extra,
+    }
+
+
+def compare(baseline, current):
+    """
+    Vergleicht zwei Ergebnisse (wie von `run_benchmarks` geschrieben) und
+    liefert pro Szenario die relative Änderung von p50, p99 und rps.
+    """
+    changes = {}
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        changes[name] = {
+            'p50': _relative(before['latency_ms']['p50'], result['latency_ms']['p50']),
+            'p99': _relative(before['latency_ms']['p99'], result['latency_ms']['p99']),
+            'rps': _relative(before['rps'], result['rps']),
+        }
+    return changes
+
+
+def _relative(before, after):
+    return round((after - before) / before * 100, 1) if before else None
+
+
+def dumps(result):
+    return json.dumps(result, indent=2, sort_keys=True)
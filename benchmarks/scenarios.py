@@ -0,0 +1,139 @@
+"""
+Benchmark-Szenarien.
+
+Ein Szenario ist ein Generator, der `Step`s liefert und über `send()` die
+jeweilige Antwort zurückbekommt; so können Folge-Requests auf Antworten
+aufbauen (z.B. die ID einer angelegten Task oder den nächsten Cursor).
+Die Szenarien laufen endlos, der Runner bestimmt die Anzahl der Requests.
+"""
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db.models import Count
+from rest_framework.authtoken.models import Token
+
+from benchmarks.data import PASSWORD
+from kanmind_board_app.models import Board, Comment, Task
+
+
+@dataclass
+class Step:
+    """Ein Request eines Szenarios; `expect` sind die erwarteten Statuscodes."""
+    name: str
+    method: str
+    path: str
+    data: dict | None = None
+    token: str | None = None
+    headers: dict = field(default_factory=dict)
+    expect: tuple = (200,)
+
+
+@dataclass
+class Context:
+    """Vom Datenbestand abgeleitete Parameter der Szenarien."""
+    user_id: int
+    token: str
+    board_ids: list
+    task_ids: list
+    thread_task_ids: list
+    login_emails: list
+
+
+def build_context(sample_size=500):
+    """
+    Wählt den Benutzer mit den meisten Boards (Worst Case für Listen und
+    Zugriffsprüfung), seine Tasks, die längsten Kommentar-Threads darin und
+    eine Stichprobe von E-Mails für Logins.
+    """
+    Membership = Board.members.through
+    user_id = (
+        Membership.objects.values('user_id').annotate(boards=Count('id'))
+        .order_by('-boards').values_list('user_id', flat=True).first()
+    )
+    token, _ = Token.objects.get_or_create(user_id=user_id)
+    board_ids = list(Membership.objects.filter(user_id=user_id).values_list('board_id', flat=True))
+    task_ids = list(Task.objects.filter(board_id__in=board_ids).values_list('id', flat=True)[:sample_size])
+    thread_task_ids = list(
+        Comment.objects.filter(task__board_id__in=board_ids)
+        .values('task_id').annotate(comments=Count('id')).order_by('-comments')
+        .values_list('task_id', flat=True)[:20]
+    )
+    login_emails = list(User.objects.order_by('?').values_list('email', flat=True)[:sample_size])
+    return Context(user_id, token.key, board_ids, task_ids, thread_task_ids, login_emails)
+
+
+def board_polling(context, rng):
+    """Board-Liste und -Details im Polling-Takt: meist 304, ab und zu Änderungs-Feed."""
+    etags, cursors = {}, {}
+    while True:
+        yield Step('boards', 'get', '/api/boards/', token=context.token)
+        for _ in range(3):
+            board_id = rng.choice(context.board_ids)
+            headers = {'HTTP_IF_NONE_MATCH': etags[board_id]} if board_id in etags else {}
+            response = yield Step(
+                'board_detail', 'get', f'/api/boards/{board_id}/',
+                token=context.token, headers=headers, expect=(200, 304),
+            )
+            etags[board_id] = response.get('ETag', etags.get(board_id))
+        board_id = rng.choice(context.board_ids)
+        response = yield Step(
+            'board_changes', 'get', f'/api/boards/{board_id}/changes/',
+            data={'since': cursors[board_id]} if board_id in cursors else None, token=context.token,
+        )
+        cursors[board_id] = response.json()['cursor']
+
+
+def task_crud(context, rng):
+    """Anlegen, Lesen, Ändern und Löschen von Tasks plus die Task-Listen."""
+    while True:
+        board_id = rng.choice(context.board_ids)
+        response = yield Step('task_create', 'post', '/api/tasks/', data={
+            'board': board_id, 'title': 'Benchmark', 'description': 'Neu', 'status': 'to-do',
+            'priority': 'medium', 'assignee_id': context.user_id, 'due_date': '2030-01-01',
+        }, token=context.token, expect=(201,))
+        task_id = response.json()['id']
+        yield Step('task_detail', 'get', f'/api/tasks/{task_id}/', token=context.token)
+        yield Step('task_update', 'patch', f'/api/tasks/{task_id}/', data={'status': 'in-progress'}, token=context.token)
+        yield Step('task_list', 'get', '/api/tasks/', data={'board': board_id}, token=context.token)
+        yield Step('tasks_assigned', 'get', '/api/tasks/assigned-to-me/', token=context.token)
+        yield Step('task_delete', 'delete', f'/api/tasks/{task_id}/', token=context.token, expect=(204,))
+
+
+def comment_threads(context, rng):
+    """Lange Kommentar-Threads seitenweise lesen, kommentieren und eigene Kommentare löschen."""
+    task_ids = context.thread_task_ids or context.task_ids
+    while True:
+        task_id = rng.choice(task_ids)
+        path = f'/api/tasks/{task_id}/comments/'
+        for _ in range(3):
+            response = yield Step('comments_page', 'get', path, token=context.token)
+            path = response.json()['next']
+            if not path:
+                break
+        response = yield Step(
+            'comment_create', 'post', f'/api/tasks/{task_id}/comments/',
+            data={'content': 'Benchmark-Kommentar'}, token=context.token, expect=(201,),
+        )
+        comment_id = response.json()['id']
+        yield Step(
+            'comment_delete', 'delete', f'/api/tasks/{task_id}/comments/{comment_id}/',
+            token=context.token, expect=(204,),
+        )
+
+
+def login_storm(context, rng):
+    """Viele Logins verschiedener Benutzer, jeder zehnte mit falschem Passwort."""
+    while True:
+        email = rng.choice(context.login_emails)
+        if rng.random() < 0.1:
+            yield Step('login_failed', 'post', '/api/login/', data={'email': email, 'password': 'falsch'}, expect=(400,))
+        else:
+            yield Step('login', 'post', '/api/login/', data={'email': email, 'password': PASSWORD})
+
+
+SCENARIOS = {
+    'board_polling': board_polling,
+    'task_crud': task_crud,
+    'comment_threads': comment_threads,
+    'login_storm': login_storm,
+}
@@ -0,0 +1,115 @@
+"""
+Datenbank-Profile, ausgewählt über Umgebungsvariablen.
+
+`KANMIND_DB_PROFILE` wählt das Profil:
+
+- `sqlite` (Standard): SQLite-Datei mit WAL, `synchronous=NORMAL`, mmap,
+  Busy-Timeout und `BEGIN IMMEDIATE` für Transaktionen. Lesende Requests
+  blockieren Schreiber nicht mehr, und schreibende Transaktionen holen die
+  Schreibsperre gleich zu Beginn; das verhindert "database is locked",
+  wenn zwei Transaktionen gleichzeitig von Lesen auf Schreiben wechseln.
+  Die PRAGMAs laufen über `init_command` bei jeder neuen Verbindung.
+- `sqlite-basic`: SQLite mit Django-Standardeinstellungen (zum Vergleich).
+- `postgres`: PostgreSQL mit Health-Checks und wahlweise Djangos
+  Connection-Pool (`KANMIND_DB_POOL_MAX_SIZE` > 0, benötigt
+  `psycopg[pool]`) oder persistenten Verbindungen (`KANMIND_DB_CONN_MAX_AGE`).
+  Verbindungsdaten über `KANMIND_DB_NAME`, `KANMIND_DB_USER`,
+  `KANMIND_DB_PASSWORD`, `KANMIND_DB_HOST`, `KANMIND_DB_PORT`.
+
+Lese-Replikate über `KANMIND_DB_REPLICAS` (kommagetrennt): bei SQLite
+Dateipfade, bei PostgreSQL Hosts (`host` oder `host:port`, sonst dieselben
+Verbindungsdaten). Sie werden als `replica1`, `replica2`, ... eingetragen
+und von `core.routers` für lesende Requests verwendet; die Replikation
+selbst ist Sache der Datenbank.
+
+Vergleich der Profile per `manage.py bench_database`.
+"""
+import os
+
+
+PROFILES = ('sqlite', 'sqlite-basic', 'postgres')
+
+
+def _int(env, name, default):
+    value = env.get(name)
+    return default if value in (None, '') else int(value)
+
+
+def sqlite_pragmas(mmap_size=256 * 1024 * 1024, cache_size_kib=20_000):
+    """PRAGMAs für das Profil `sqlite` (als `init_command`)."""
+    return ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA mmap_size={mmap_size}',
+        f'PRAGMA cache_size=-{cache_size_kib}',
+        'PRAGMA temp_store=MEMORY',
+    ])
+
+
+def sqlite_config(name, tuned=True, env=os.environ):
+    config = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+    }
+    if tuned:
+        config['OPTIONS'] = {
+            'init_command': sqlite_pragmas(mmap_size=_int(env, 'KANMIND_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+            'transaction_mode': 'IMMEDIATE',
+            # Busy-Timeout in Sekunden (sqlite3.connect(timeout=...)).
+            'timeout': _int(env, 'KANMIND_SQLITE_BUSY_TIMEOUT', 20),
+        }
+    return config
+
+
+def postgres_config(env=os.environ):
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('KANMIND_DB_NAME', 'kanmind'),
+        'USER': env.get('KANMIND_DB_USER', 'kanmind'),
+        'PASSWORD': env.get('KANMIND_DB_PASSWORD', ''),
+        'HOST': env.get('KANMIND_DB_HOST', 'localhost'),
+        'PORT': env.get('KANMIND_DB_PORT', '5432'),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    pool_max_size = _int(env, 'KANMIND_DB_POOL_MAX_SIZE', 0)
+    if pool_max_size > 0:
+        # Djangos Pool verwaltet die Verbindungen selbst; CONN_MAX_AGE muss 0 sein.
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': _int(env, 'KANMIND_DB_POOL_MIN_SIZE', 2),
+            'max_size': pool_max_size,
+            'timeout': _int(env, 'KANMIND_DB_POOL_TIMEOUT', 10),
+        }
+    else:
+        config['CONN_MAX_AGE'] = _int(env, 'KANMIND_DB_CONN_MAX_AGE', 60)
+    return config
+
+
+def database_config(base_dir, env=os.environ):
+    """Konfiguration des `default`-Alias für das gewählte Profil."""
+    profile = env.get('KANMIND_DB_PROFILE', 'sqlite')
+    if profile == 'postgres':
+        return postgres_config(env)
+    if profile in ('sqlite', 'sqlite-basic'):
+        name = env.get('KANMIND_DB_NAME') or base_dir / 'db.sqlite3'
+        return sqlite_config(name, tuned=profile == 'sqlite', env=env)
+    raise ValueError(f'KANMIND_DB_PROFILE={profile!r} unbekannt, erlaubt: {", ".join(PROFILES)}')
+
+
+def replica_configs(base_dir, env=os.environ):
+    """Aliase `replica1`, `replica2`, ... aus `KANMIND_DB_REPLICAS`."""
+    primary = database_config(base_dir, env)
+    replicas = {}
+    names = [name.strip() for name in env.get('KANMIND_DB_REPLICAS', '').split(',') if name.strip()]
+    for number, name in enumerate(names, start=1):
+        config = {**primary, 'OPTIONS': dict(primary.get('OPTIONS', {}))}
+        if config['ENGINE'] == 'django.db.backends.postgresql':
+            host, _, port = name.partition(':')
+            config.update(HOST=host, PORT=port or config['PORT'])
+        else:
+            config['NAME'] = name
+        # In Tests zeigen Replikate auf die Test-Datenbank des Primärsystems.
+        config['TEST'] = {'MIRROR': 'default'}
+        replicas[f'replica{number}'] = config
+    return replicas
@@ -0,0 +1,229 @@
+"""
+Query-Budget und Server-Timing pro Request.
+
+`QueryBudgetMiddleware` misst für jeden Request
+
+- Anzahl und Dauer der SQL-Queries (alle Datenbank-Aliase, auch aus
+  sync_to_async-Threads der async Views),
+- die Zeit im View (bei DRF inklusive `serializer.data`),
+- davon die Zeit in `serializer.data` (alle DRF-Serializer, siehe
+  `install_serializer_timer()`),
+- die Zeit für das Rendern der Antwort (DRF-Renderer),
+- die Gesamtzeit und die Größe der Antwort.
+
+Die Werte stehen im Header `Server-Timing` (nur mit
+`KANMIND_SERVER_TIMING`, Standard: `DEBUG`) und als JSON-Zeile im Logger `kanmind.requests`
+(Level INFO). Überschreitet ein Request das Query-Budget seiner Route,
+wird die Zeile mit Level WARNING geschrieben und `budget_exceeded`
+gesetzt. Budgets stehen in `KANMIND_QUERY_BUDGETS` (Schlüssel ist die
+Route wie `api/boards/<int:pk>/`, Wert eine Zahl oder ein Dict pro
+Methode), sonst gilt `KANMIND_QUERY_BUDGET_DEFAULT`.
+
+Das Profil hängt als `response.query_profile` an der Antwort; darauf
+baut `core.testing` auf.
+"""
+import json
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.serializers import BaseSerializer
+
+
+logger = logging.getLogger('kanmind.requests')
+
+_current_profile = ContextVar('kanmind_request_profile', default=None)
+_serializing = ContextVar('kanmind_serializing', default=False)
+_untimed_data = BaseSerializer.data
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    route: str | None = None
+    status: int | None = None
+    queries: int = 0
+    db_ms: float = 0.0
+    view_ms: float | None = None
+    serializer_ms: float | None = None
+    render_ms: float | None = None
+    total_ms: float = 0.0
+    size: int | None = None
+    budget: int | None = None
+    budget_exceeded: bool = False
+
+    def as_dict(self):
+        data = asdict(self)
+        for key in ('db_ms', 'view_ms', 'serializer_ms', 'render_ms', 'total_ms'):
+            if data[key] is not None:
+                data[key] = round(data[key], 2)
+        return data
+
+    def server_timing(self):
+        parts = [f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"']
+        if self.view_ms is not None:
+            parts.append(f'view;dur={self.view_ms:.1f}')
+        if self.serializer_ms is not None:
+            parts.append(f'serializer;dur={self.serializer_ms:.1f}')
+        if self.render_ms is not None:
+            parts.append(f'render;dur={self.render_ms:.1f}')
+        parts.append(f'total;dur={self.total_ms:.1f}')
+        if self.size is not None:
+            parts.append(f'size;desc="{self.size}"')
+        return ', '.join(parts)
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_ms += (time.perf_counter() - start) * 1000
+
+
+def _install(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install_query_counter():
+    """Hängt den Zähler an die Verbindungen des aktuellen Threads."""
+    for connection in connections.all():
+        _install(connection)
+
+
+@receiver(connection_created)
+def _install_on_connect(sender, connection, **kwargs):
+    _install(connection)
+
+
+def _timed_data(serializer):
+    profile = _current_profile.get()
+    # Verschachtelte Aufrufe zählen zur äußeren Messung.
+    if profile is None or _serializing.get():
+        return _untimed_data.fget(serializer)
+    token = _serializing.set(True)
+    start = time.perf_counter()
+    try:
+        return _untimed_data.fget(serializer)
+    finally:
+        _serializing.reset(token)
+        profile.serializer_ms = (profile.serializer_ms or 0.0) + (time.perf_counter() - start) * 1000
+
+
+def install_serializer_timer():
+    """
+    Misst `serializer.data` für das Profil des laufenden Requests;
+    `Serializer` und `ListSerializer` rufen beide `BaseSerializer.data` auf.
+    """
+    BaseSerializer.data = property(_timed_data)
+
+
+def query_budget(route, method):
+    """
+    Query-Budget einer Route aus `KANMIND_QUERY_BUDGETS`: eine Zahl für alle
+    Methoden oder ein Dict pro Methode; sonst `KANMIND_QUERY_BUDGET_DEFAULT`.
+    """
+    budget = settings.KANMIND_QUERY_BUDGETS.get(route, settings.KANMIND_QUERY_BUDGET_DEFAULT)
+    if isinstance(budget, dict):
+        budget = budget.get(method, settings.KANMIND_QUERY_BUDGET_DEFAULT)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Misst Queries und Zeiten pro Request (siehe Modul-Docstring). Läuft
+    synchron und asynchron, damit async Views nicht in einen Thread
+    ausweichen müssen.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self._thread_installed = threading.local()
+        self._executor_installed = False
+        install_serializer_timer()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(self._thread_installed, 'done', False):
+            install_query_counter()
+            self._thread_installed.done = True
+        profile, token, start = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile, start)
+
+    async def __acall__(self, request):
+        if not self._executor_installed:
+            # Das async ORM fragt über den Thread von sync_to_async ab; dessen
+            # Verbindungen existieren evtl. schon vor dieser Middleware.
+            await sync_to_async(install_query_counter)()
+            self._executor_installed = True
+        profile, token, start = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.finish(request, response, profile, start)
+
+    def start(self, request):
+        profile = RequestProfile(method=request.method, path=request.path)
+        request.query_profile = profile
+        return profile, _current_profile.set(profile), time.perf_counter()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF-Responses werden erst nach dem View gerendert. Hat eine andere
+        # Middleware in process_view geantwortet, gibt es keine View-Zeit.
+        profile = request.query_profile
+        view_finished = time.perf_counter()
+        view_started = getattr(request, '_view_started', None)
+        if view_started is not None:
+            profile.view_ms = (view_finished - view_started) * 1000
+
+        def rendered(response):
+            profile.render_ms = (time.perf_counter() - view_finished) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, profile, start):
+        profile.total_ms = (time.perf_counter() - start) * 1000
+        profile.status = response.status_code
+        if request.resolver_match is not None:
+            profile.route = request.resolver_match.route
+        if not response.streaming:
+            profile.size = len(response.content)
+        if profile.route is not None:
+            profile.budget = query_budget(profile.route, profile.method)
+            profile.budget_exceeded = profile.queries > profile.budget
+
+        if settings.KANMIND_SERVER_TIMING:
+            response['Server-Timing'] = profile.server_timing()
+        level = logging.WARNING if profile.budget_exceeded else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(profile.as_dict()))
+        response.query_profile = profile
+        return response
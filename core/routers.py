@@ -0,0 +1,163 @@
+"""
+Lese-Replikate: Routing lesender Requests.
+
+`ReplicaRoutingMiddleware` wählt für jeden Request mit sicherer Methode
+(GET, HEAD, OPTIONS) ein zufälliges Replikat aus `KANMIND_DB_REPLICAS`;
+`ReplicaRouter` schickt dann alle lesenden Queries dieses Requests dorthin.
+Schreibende Requests, Routen aus `KANMIND_REPLICA_EXCLUDED_ROUTES` und
+alles außerhalb von Requests (Management-Commands, Signale nach dem
+Request) lesen wie bisher von `default`.
+
+Read-your-writes: Nach einem erfolgreichen schreibenden Request liest
+derselbe Client `KANMIND_REPLICA_STICKY_SECONDS` lang vom Primärsystem.
+Markiert wird das doppelt, damit beide Client-Arten abgedeckt sind:
+
+- per Cookie (Browser, auch ohne Token, z.B. nach der Registrierung),
+- per Marker im Cache `KANMIND_REPLICA_STICKY_CACHE` zum Token aus dem
+  `Authorization`-Header. DRF vergibt ein Token pro Benutzer, der Marker
+  gilt also pro Benutzer und auch für Clients ohne Cookies. Bei mehreren
+  Workern muss der Cache geteilt sein.
+
+Tokens und Sessions werden immer vom Primärsystem gelesen, damit ein
+gelöschtes Token nicht über ein nachlaufendes Replikat gültig bleibt.
+Einzelne Querysets erzwingen das Primärsystem mit dem Hint `primary`
+(`Model.objects.db_manager(hints={'primary': True})`).
+"""
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+
+STICKY_COOKIE = 'kanmind_primary'
+STICKY_KEY_PREFIX = 'kanmind:db-primary:'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_MODELS = {'authtoken.Token', 'sessions.Session'}
+
+_read_alias = ContextVar('kanmind_read_alias', default=None)
+
+
+class _Routing:
+    """Lese-Alias des laufenden Requests (None = `default`)."""
+    alias = None
+
+
+def current_read_alias():
+    """Alias, von dem der laufende Request liest, oder None (`default`)."""
+    routing = _read_alias.get()
+    return routing.alias if routing is not None else None
+
+
+class ReplicaRouter:
+    """
+    Lesende Queries eines Requests an das von der Middleware gewählte
+    Replikat, Schreibzugriffe an `default`.
+    """
+
+    def db_for_read(self, model, **hints):
+        if hints.get('primary') or model._meta.label in PRIMARY_MODELS:
+            return DEFAULT_DB_ALIAS
+        return current_read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Vom Replikat gelesene Objekte werden auf dem Primärsystem gespeichert;
+        # alles andere bleibt bei Djangos Standardverhalten.
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in settings.KANMIND_DB_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.KANMIND_DB_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+def _sticky_key(request):
+    authorization = request.headers.get('Authorization')
+    if not authorization:
+        return None
+    return STICKY_KEY_PREFIX + hashlib.sha256(authorization.encode()).hexdigest()
+
+
+def _cache():
+    return caches[settings.KANMIND_REPLICA_STICKY_CACHE]
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Wählt das Replikat pro Request und merkt sich Schreibzugriffe (siehe
+    Modul-Docstring). Läuft synchron und asynchron.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _read_alias.set(_Routing())
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.wrote(request, response):
+            key = _sticky_key(request)
+            if key is not None:
+                _cache().set(key, True, settings.KANMIND_REPLICA_STICKY_SECONDS)
+            self.set_cookie(response)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_alias.set(_Routing())
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if self.wrote(request, response):
+            key = _sticky_key(request)
+            if key is not None:
+                await _cache().aset(key, True, settings.KANMIND_REPLICA_STICKY_SECONDS)
+            self.set_cookie(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Erst hier steht die Route fest; das Objekt aus __call__ wird nur
+        # verändert, damit es auch aus dem Thread von sync_to_async wirkt.
+        routing = _read_alias.get()
+        if routing is None or not settings.KANMIND_DB_REPLICAS or request.method not in SAFE_METHODS:
+            return None
+        if request.resolver_match.route in settings.KANMIND_REPLICA_EXCLUDED_ROUTES:
+            return None
+        if STICKY_COOKIE in request.COOKIES:
+            return None
+        key = _sticky_key(request)
+        if key is not None and _cache().get(key):
+            return None
+        routing.alias = random.choice(settings.KANMIND_DB_REPLICAS)
+        return None
+
+    def wrote(self, request, response):
+        return (
+            bool(settings.KANMIND_DB_REPLICAS)
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
+
+    def set_cookie(self, response):
+        response.set_cookie(
+            STICKY_COOKIE, '1',
+            max_age=settings.KANMIND_REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite='Lax',
+        )
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.databases import database_config, replica_configs
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -94,14 +99,31 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Profil über KANMIND_DB_PROFILE (sqlite, sqlite-basic, postgres), Lese-
+# Replikate über KANMIND_DB_REPLICAS, siehe core.databases.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
+    **replica_configs(BASE_DIR),
 }
 
+# Lesende Requests gehen an ein Replikat, Schreibzugriffe an `default`
+# (siehe core.routers). KANMIND_DB_REPLICAS sind die Aliase der Replikate
+# (leer = alles auf `default`). Nach einem Schreibzugriff liest derselbe
+# Client KANMIND_REPLICA_STICKY_SECONDS lang vom Primärsystem (Cookie und
+# Marker im Cache-Alias KANMIND_REPLICA_STICKY_CACHE). Routen in
+# KANMIND_REPLICA_EXCLUDED_ROUTES lesen immer vom Primärsystem.
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+KANMIND_DB_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+KANMIND_REPLICA_STICKY_SECONDS = 5
+KANMIND_REPLICA_STICKY_CACHE = 'default'
+KANMIND_REPLICA_EXCLUDED_ROUTES = [
+    # Der Cursor setzt voraus, dass alle Änderungen bis kurz vor dem
+    # Abfragezeitpunkt sichtbar sind; Replikationsverzug würde sie verlieren.
+    'api/boards/<int:pk>/changes/',
+    'api/boards/<int:pk>/events/',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -121,6 +143,30 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Login per E-Mail (user_auth_app.backends); ModelBackend bleibt für den Admin.
+AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Der erste Hasher wird für neue Passwörter verwendet, die übrigen nur zum
+# Prüfen bestehender Hashes; beim nächsten Login werden diese transparent
+# mit dem ersten Hasher neu berechnet. Auswahl per Umgebungsvariable
+# KANMIND_PASSWORD_HASHER (pbkdf2, argon2, bcrypt, scrypt); argon2 und
+# bcrypt benötigen argon2-cffi bzw. bcrypt.
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+_PRIMARY_PASSWORD_HASHER = _PASSWORD_HASHERS[os.environ.get('KANMIND_PASSWORD_HASHER', 'pbkdf2')]
+PASSWORD_HASHERS = [
+    _PRIMARY_PASSWORD_HASHER,
+    *(hasher for hasher in _PASSWORD_HASHERS.values() if hasher != _PRIMARY_PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -145,9 +191,137 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Standard ist ein prozesslokaler Cache. Bei mehreren Workern sollte ein
+# gemeinsames Backend gesetzt werden, z.B.
+# KANMIND_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# KANMIND_CACHE_LOCATION=redis://127.0.0.1:6379
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('KANMIND_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('KANMIND_CACHE_LOCATION', 'kanmind'),
+    }
+}
+
+# Cache-Alias und Lebensdauer (Sekunden) für die Board-Zugriffsrechte
+# (siehe kanmind_board_app.access_cache). Bei einem prozesslokalen Backend
+# (LocMemCache) gilt KANMIND_BOARD_ACCESS_CACHE_LOCAL_TIMEOUT, weil andere
+# Worker die Invalidierung nicht sehen und entzogene Rechte sonst bis zu
+# KANMIND_BOARD_ACCESS_CACHE_TIMEOUT Sekunden weiter gelten.
+KANMIND_BOARD_ACCESS_CACHE = 'default'
+KANMIND_BOARD_ACCESS_CACHE_TIMEOUT = 300
+KANMIND_BOARD_ACCESS_CACHE_LOCAL_TIMEOUT = 5
+
+# Obergrenze (Bytes) des prozesslokalen Caches für gerenderte Board-Details
+# (siehe kanmind_board_app.render_cache). 0 deaktiviert den Cache.
+KANMIND_BOARD_RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Maximale Anzahl Operationen pro Anfrage an tasks/bulk/.
+KANMIND_BULK_TASK_LIMIT = 1000
+
+# Lädt bei der ersten Berechtigungsprüfung eines Requests alle Board-IDs des
+# Benutzers mit einer Query (siehe kanmind_board_app.api.access).
+KANMIND_BOARD_ACCESS_PRELOAD = True
+
+# Broker für den Ereignis-Stream boards/<pk>/events/ (siehe
+# kanmind_board_app.events), Größe des Ereignisprotokolls pro Board, Anzahl
+# der Boards im Protokoll und Abstand der Keepalive-Kommentare (Sekunden).
+KANMIND_EVENT_BROKER = 'kanmind_board_app.events.InProcessBroker'
+KANMIND_EVENT_LOG_SIZE = 500
+KANMIND_EVENT_LOG_BOARDS = 10_000
+KANMIND_EVENT_HEARTBEAT = 15
+
+# Änderungs-Feed boards/<pk>/changes/ (siehe kanmind_board_app.changes):
+# Überlappung des Cursors (Sekunden) und Aufbewahrung des Löschprotokolls (Tage).
+KANMIND_CHANGES_OVERLAP = 2
+KANMIND_DELETION_LOG_RETENTION_DAYS = 30
+
+# Cache der Token-Authentifizierung (siehe user_auth_app.token_cache):
+# Einträge pro Worker-Prozess, Ablaufzeit (Sekunden) und optional ein
+# gemeinsamer Django-Cache-Alias (None = nur prozesslokal). Im Speicher des
+# Workers gilt KANMIND_TOKEN_CACHE_LOCAL_TIMEOUT (Sekunden; None = 5 ohne
+# und 0 mit gemeinsamem Cache), denn so lange bleiben widerrufene Tokens auf
+# anderen Workern gültig.
+KANMIND_TOKEN_CACHE_MAX_ENTRIES = 10_000
+KANMIND_TOKEN_CACHE_TIMEOUT = 300
+KANMIND_TOKEN_CACHE = None
+KANMIND_TOKEN_CACHE_LOCAL_TIMEOUT = None
+
+# Konten-Provisionierung (siehe user_auth_app.provisioning): maximale Anzahl
+# Konten pro Anfrage an registration/bulk/ und Prozesse für das Hashen der
+# Passwörter in `manage.py provision_accounts` (None = Anzahl CPUs; Requests
+# hashen immer im eigenen Prozess).
+KANMIND_PROVISIONING_LIMIT = 5000
+KANMIND_PROVISIONING_WORKERS = None
+
+# E-Mail-Prüfung (siehe user_auth_app.emails): maximale Anzahl Adressen pro
+# Anfrage an email-check/batch/, Cache-Alias für nicht gefundene Adressen
+# (None = kein Cache) und deren Lebensdauer (Sekunden).
+KANMIND_EMAIL_LOOKUP_LIMIT = 100
+KANMIND_EMAIL_MISS_CACHE = 'default'
+KANMIND_EMAIL_MISS_TIMEOUT = 30
+
+# Query-Budgets pro Route (siehe core.middleware): maximale Anzahl Queries
+# pro Request, Standard für Routen ohne Eintrag, und ob die Messwerte als
+# Server-Timing-Header ausgeliefert werden (nur mit DEBUG, da der Header
+# Query-Anzahl und DB-Zeiten an jeden Client schickt). Jede API-Route
+# braucht einen Eintrag (geprüft in den Tests über core.testing.api_routes()).
+KANMIND_QUERY_BUDGET_DEFAULT = 10
+KANMIND_QUERY_BUDGETS = {
+    'api/boards/': {'GET': 3, 'POST': 13},
+    'api/boards/export/': 2,
+    'api/boards/<int:pk>/': {'GET': 6, 'PATCH': 14, 'PUT': 14, 'DELETE': 10},
+    'api/boards/<int:pk>/export/': 3,
+    'api/boards/<int:pk>/changes/': 6,
+    'api/boards/<int:pk>/events/': 3,
+    'api/boards/<int:pk>/import/': 10,
+    'api/tasks/': {'GET': 3, 'POST': 11},
+    'api/tasks/assigned-to-me/': 2,
+    'api/tasks/reviewing/': 2,
+    'api/tasks/bulk/': 18,
+    'api/tasks/<int:pk>/': {'GET': 3, 'PATCH': 10, 'PUT': 10, 'DELETE': 11},
+    'api/tasks/<int:task_id>/comments/': {'GET': 4, 'POST': 6},
+    'api/tasks/<int:task_id>/comments/<int:pk>/': 7,
+    'api/email-check/': 2,
+    'api/email-check/batch/': 2,
+    'api/metrics/cache/': 1,
+    'api/profiles/': {'GET': 3},
+    'api/profiles/<int:pk>/': {'GET': 2},
+    'api/registration/': 10,
+    'api/registration/bulk/': 9,
+    'api/login/': 4,
+    'api/async/boards/': 3,
+    'api/async/boards/<int:pk>/': 6,
+    'api/async/tasks/assigned-to-me/': 2,
+    'api/async/tasks/reviewing/': 2,
+    'api/async/tasks/<int:pk>/': 3,
+    'api/async/tasks/<int:task_id>/comments/': 4,
+}
+KANMIND_SERVER_TIMING = DEBUG
+
+# Request-Profile (Logger kanmind.requests) als JSON-Zeilen auf der Konsole;
+# INFO schreibt jeden Request, WARNING nur Überschreitungen des Budgets.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'kanmind': {
+            'handlers': ['console'],
+            'level': os.environ.get('KANMIND_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.authentication.CachingTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -0,0 +1,40 @@
+"""
+Test-Hilfen für Query-Budgets (siehe `core.middleware.QueryBudgetMiddleware`).
+
+`api_routes()` listet alle Routen der API-URLconfs, so wie sie in
+`KANMIND_QUERY_BUDGETS` stehen. Mit `QueryBudgetMixin` prüft ein Test,
+dass ein Request das Budget seiner Route einhält:
+
+    response = self.assertWithinQueryBudget(self.client.get('/api/boards/'))
+"""
+from importlib import import_module
+
+
+API_URLCONFS = {
+    'api/': ('kanmind_board_app.api.urls', 'user_auth_app.api.urls'),
+    'api/async/': ('kanmind_board_app.api.async_urls',),
+}
+
+
+def api_routes():
+    """Alle Routen der API (z.B. `api/boards/<int:pk>/`)."""
+    return [
+        prefix + str(pattern.pattern)
+        for prefix, modules in API_URLCONFS.items()
+        for module in modules
+        for pattern in import_module(module).urlpatterns
+    ]
+
+
+class QueryBudgetMixin:
+    """Mixin für TestCases: Assertion auf das Query-Budget eines Requests."""
+
+    def assertWithinQueryBudget(self, response):
+        profile = response.query_profile
+        self.assertIsNotNone(profile.route, f'{profile.path}: keine Route aufgelöst')
+        self.assertLess(response.status_code, 400, f'{profile.method} {profile.path}: Status {response.status_code}')
+        self.assertLessEqual(
+            profile.queries, profile.budget,
+            f'{profile.method} {profile.route}: {profile.queries} Queries, Budget {profile.budget}',
+        )
+        return response
@@ -19,6 +19,7 @@ from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/async/', include('kanmind_board_app.api.async_urls')),
     path('api/', include('kanmind_board_app.api.urls')),
     path('api/', include('user_auth_app.api.urls')),
 ]
@@ -0,0 +1,101 @@
+"""
+Board-Zugriffsrechte eines Benutzers (ohne Bezug zu Requests).
+
+Genutzt von den Views und Permissions (über `kanmind_board_app.api.access`)
+sowie vom Import (`kanmind_board_app.imports`).
+"""
+from django.conf import settings
+from django.db.models import Q
+
+from kanmind_board_app import access_cache
+from kanmind_board_app.models import Board
+
+
+class BoardAccess:
+    """
+    Beantwortet Board-Zugriffsfragen eines Benutzers für die Dauer eines Requests.
+
+    Ist `KANMIND_BOARD_ACCESS_PRELOAD` aktiv (Standard), werden beim ersten
+    Aufruf alle Board-IDs des Benutzers (als Eigentümer oder Mitglied) mit
+    einer einzigen Query geladen; alle weiteren Prüfungen laufen im Speicher.
+    Andernfalls wird jedes Board einzeln geprüft und das Ergebnis gemerkt.
+
+    Die vorab geladene Menge wird über `access_cache` zwischen Requests
+    geteilt, ein Cache-Treffer kostet also gar keine Query.
+    """
+
+    def __init__(self, user, preload=None):
+        self.user = user
+        self.preload = settings.KANMIND_BOARD_ACCESS_PRELOAD if preload is None else preload
+        self._accessible = None
+        self._owned = None
+        self._checked = {}
+
+    def _rows(self):
+        # Immer vom Primärsystem (siehe core.routers): das Ergebnis landet im
+        # Cache und darf nicht den Stand eines nachlaufenden Replikats haben.
+        return Board.objects.db_manager(hints={'primary': True}).filter(
+            Q(owner=self.user) | Q(members=self.user)
+        ).values_list('id', 'owner_id').distinct()
+
+    def _add(self, board_id, owner_id):
+        self._accessible.add(board_id)
+        if owner_id == self.user.id:
+            self._owned.add(board_id)
+
+    def _load(self):
+        cached = access_cache.get(self.user.id)
+        if cached is not None:
+            self._accessible, self._owned = set(cached[0]), set(cached[1])
+            return
+        self._accessible, self._owned = set(), set()
+        for board_id, owner_id in self._rows():
+            self._add(board_id, owner_id)
+        access_cache.store(self.user.id, self._accessible, self._owned)
+
+    async def aload(self):
+        """
+        Lädt die Board-IDs aus einem async Kontext (siehe `async_views`).
+        Danach beantworten `can_access()` und `is_owner()` alles im Speicher.
+        """
+        cached = await access_cache.aget(self.user.id)
+        if cached is not None:
+            self._accessible, self._owned = set(cached[0]), set(cached[1])
+            return
+        self._accessible, self._owned = set(), set()
+        async for board_id, owner_id in self._rows():
+            self._add(board_id, owner_id)
+        await access_cache.astore(self.user.id, self._accessible, self._owned)
+
+    def _ensure_loaded(self):
+        if self._accessible is None:
+            self._load()
+
+    def can_access(self, board_id):
+        """Ist der Benutzer Eigentümer oder Mitglied des Boards?"""
+        board_id = int(board_id)
+        if self.preload:
+            self._ensure_loaded()
+            return board_id in self._accessible
+        key = ('access', board_id)
+        if key not in self._checked:
+            self._checked[key] = Board.objects.filter(
+                Q(owner=self.user) | Q(members=self.user), pk=board_id
+            ).exists()
+        return self._checked[key]
+
+    def is_owner(self, board_id):
+        """Ist der Benutzer Eigentümer des Boards?"""
+        board_id = int(board_id)
+        if self.preload:
+            self._ensure_loaded()
+            return board_id in self._owned
+        key = ('owner', board_id)
+        if key not in self._checked:
+            self._checked[key] = Board.objects.filter(pk=board_id, owner=self.user).exists()
+        return self._checked[key]
+
+    def board_ids(self):
+        """Alle Board-IDs, auf die der Benutzer Zugriff hat."""
+        self._ensure_loaded()
+        return frozenset(self._accessible)
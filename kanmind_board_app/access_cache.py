@@ -0,0 +1,104 @@
+"""
+Prozessübergreifender Cache für Board-Zugriffsrechte.
+
+Pro Benutzer wird die Menge der Board-IDs gespeichert, auf die er als
+Eigentümer oder Mitglied Zugriff hat, sowie die Teilmenge der eigenen
+Boards. Der Cache-Alias ist über `KANMIND_BOARD_ACCESS_CACHE` wählbar
+(Standard: lokaler Speicher, für mehrere Worker z.B. Redis).
+
+Invalidiert wird über die Signal-Handler in `kanmind_board_app.signals`,
+sobald sich Mitglieder, Eigentümer oder Boards ändern. Andere Worker-
+Prozesse sehen die Invalidierung nur in einem geteilten Cache. Ist der
+Alias ein prozesslokales Backend (`LocMemCache`), gelten Einträge daher nur
+`KANMIND_BOARD_ACCESS_CACHE_LOCAL_TIMEOUT` Sekunden; so lange behält ein
+entfernter Benutzer auf anderen Workern höchstens seinen Zugriff.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+KEY_PREFIX = 'kanmind:board-access:'
+
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    return caches[settings.KANMIND_BOARD_ACCESS_CACHE]
+
+
+def _timeout(cache):
+    if isinstance(cache, LocMemCache):
+        return min(settings.KANMIND_BOARD_ACCESS_CACHE_TIMEOUT, settings.KANMIND_BOARD_ACCESS_CACHE_LOCAL_TIMEOUT)
+    return settings.KANMIND_BOARD_ACCESS_CACHE_TIMEOUT
+
+
+def _key(user_id):
+    return f'{KEY_PREFIX}{user_id}'
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def _unpack(value):
+    if value is None:
+        _count('misses')
+        return None
+    _count('hits')
+    accessible, owned = value
+    return frozenset(accessible), frozenset(owned)
+
+
+def get(user_id):
+    """
+    Liefert `(accessible, owned)` als frozensets oder None, falls nicht im Cache.
+    """
+    return _unpack(_cache().get(_key(user_id)))
+
+
+async def aget(user_id):
+    """Async-Variante von `get()`."""
+    return _unpack(await _cache().aget(_key(user_id)))
+
+
+def store(user_id, accessible, owned):
+    cache = _cache()
+    cache.set(_key(user_id), (list(accessible), list(owned)), _timeout(cache))
+
+
+async def astore(user_id, accessible, owned):
+    """Async-Variante von `store()`."""
+    cache = _cache()
+    await cache.aset(_key(user_id), (list(accessible), list(owned)), _timeout(cache))
+
+
+def invalidate(user_ids):
+    """
+    Entfernt die Einträge der Benutzer sofort und erneut nach dem Commit.
+
+    Das zweite Löschen verhindert, dass ein paralleler Request zwischen
+    Löschen und Commit den alten Stand wieder in den Cache schreibt.
+    """
+    keys = [_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    _count('invalidations', len(keys))
+    _cache().delete_many(keys)
+    transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def stats():
+    """
+    Hit/Miss-Zähler dieses Prozesses seit dem Start.
+    """
+    with _stats_lock:
+        current = dict(_stats)
+    lookups = current['hits'] + current['misses']
+    current['hit_ratio'] = round(current['hits'] / lookups, 4) if lookups else None
+    return current
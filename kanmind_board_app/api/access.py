@@ -0,0 +1,31 @@
+from kanmind_board_app.access import BoardAccess
+
+
+def get_board_access(request):
+    """
+    Liefert den `BoardAccess` des Requests und legt ihn beim ersten Aufruf an.
+
+    Das Objekt wird am zugrunde liegenden Django-Request abgelegt, damit
+    Views und alle Permission-Klassen dieselbe Instanz verwenden.
+    """
+    http_request = getattr(request, '_request', request)
+    access = getattr(http_request, '_board_access', None)
+    if access is None or access.user != request.user:
+        access = BoardAccess(request.user)
+        http_request._board_access = access
+    return access
+
+
+async def aget_board_access(request):
+    """
+    Async-Gegenstück zu `get_board_access()` für Django-Requests.
+
+    Die Board-IDs werden immer vorab geladen, da im async Kontext keine
+    synchronen Einzelabfragen möglich sind.
+    """
+    access = getattr(request, '_board_access', None)
+    if access is None or access.user != request.user:
+        access = BoardAccess(request.user, preload=True)
+        await access.aload()
+        request._board_access = access
+    return access
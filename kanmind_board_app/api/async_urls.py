@@ -0,0 +1,15 @@
+from django.urls import path
+from .async_views import (
+    AsyncBoardsView, AsyncBoardSingleView, AsyncTaskSingleView, AsyncCommentsView,
+    AsyncTasksAssignedToMeView, AsyncTasksReviewingView,
+)
+
+
+urlpatterns = [
+    path('boards/', AsyncBoardsView.as_view(), name='async-boards'),
+    path('boards/<int:pk>/', AsyncBoardSingleView.as_view(), name='async-board-detail'),
+    path('tasks/assigned-to-me/', AsyncTasksAssignedToMeView.as_view(), name='async-tasks-assigned-to-me'),
+    path('tasks/reviewing/', AsyncTasksReviewingView.as_view(), name='async-tasks-reviewing'),
+    path('tasks/<int:pk>/', AsyncTaskSingleView.as_view(), name='async-task-detail'),
+    path('tasks/<int:task_id>/comments/', AsyncCommentsView.as_view(), name='async-comments'),
+]
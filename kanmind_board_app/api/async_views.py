@@ -0,0 +1,267 @@
+"""
+Async Lese-Endpunkte für den Betrieb unter ASGI.
+
+Die DRF-Views in `views.py` sind synchron und belegen unter ASGI pro
+Request einen Thread des sync_to_async-Pools. Die Views hier sind native
+async Django-Views für die häufigsten Lesezugriffe; sie liefern dieselben
+Daten (gleiche Serializer, gleiches JSON) wie die synchronen Endpunkte:
+
+- boards/, boards/<id>/
+- tasks/<id>/, tasks/assigned-to-me/, tasks/reviewing/
+- tasks/<id>/comments/
+
+Authentifizierung, Zugriffsprüfung (über `access_cache`) und Queries laufen
+über das async ORM bzw. die async Cache-API. Die Serializer greifen nur auf
+vorab geladene Daten zu und lösen daher keine Queries aus.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from kanmind_board_app.events import get_broker
+from kanmind_board_app.models import Board, Comment, Task
+from kanmind_board_app.render_cache import board_render_cache
+from user_auth_app.authentication import AsyncTokenAuthentication
+from .access import BoardAccess, aget_board_access
+from .conditional import query_fingerprint
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from .pagination import CommentCursorPagination, TaskCursorPagination
+from .serializers import (
+    BoardSerializer, BoardDetailSerializer, CommentSerializer,
+    TaskDetailSerializer, TaskDetailWithOutBoard,
+)
+
+
+def render(data, status_code=status.HTTP_200_OK, etag=None):
+    response = HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status_code)
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
+def not_modified(request, etag):
+    """Gibt eine 304-Antwort zurück, falls `If-None-Match` zum ETag passt, sonst None."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return None
+    etags = [tag.removeprefix('W/') for tag in parse_etags(header)]
+    if '*' in etags or etag in etags:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+    return None
+
+
+class AsyncAPIView(View):
+    """
+    Basis für die async Views: Token-Authentifizierung und Fehlerbehandlung.
+
+    DRF-Exceptions (z.B. `NotFound`, `PermissionDenied`, `ValidationError`)
+    werden wie bei DRF in JSON-Antworten mit passendem Statuscode übersetzt.
+    """
+    http_method_names = ['get', 'options']
+    authentication = AsyncTokenAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            authenticated = await self.authentication.aauthenticate(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = authenticated
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def handle_exception(self, exc):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = render(data, exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response['WWW-Authenticate'] = self.authentication.authenticate_header(None)
+        return response
+
+
+class AsyncBoardsView(AsyncAPIView):
+    """GET: Boards des Benutzers (wie `BoardsView`)."""
+
+    async def get(self, request):
+        board_ids = (await aget_board_access(request)).board_ids()
+        boards = [
+            board async for board in
+            Board.objects.filter(pk__in=board_ids).select_related('owner')
+        ]
+        return render(BoardSerializer(boards, many=True).data)
+
+
+class AsyncBoardSingleView(AsyncAPIView):
+    """
+    GET: Board-Details (wie `BoardSingleView.get`, inklusive ETag/304 und
+    `board_render_cache`).
+    """
+
+    async def get(self, request, pk):
+        version = await Board.objects.filter(pk=pk).values_list('version', flat=True).afirst()
+        if version is None:
+            raise exceptions.NotFound('Board nicht gefunden.')
+        if not (await aget_board_access(request)).can_access(pk):
+            raise exceptions.PermissionDenied()
+
+        etag = quote_etag(f'board-{pk}-{version}')
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        content = board_render_cache.get(pk, version)
+        if content is None:
+            board = await Board.objects.with_details().aget(pk=pk)
+            version = board.version
+            etag = quote_etag(f'board-{pk}-{version}')
+            content = JSONRenderer().render(BoardDetailSerializer(board).data)
+            board_render_cache.set(pk, version, content)
+        response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        return response
+
+
+class AsyncTaskSingleView(AsyncAPIView):
+    """GET: Task-Details (wie `TaskSingleView.get`, inklusive ETag/304)."""
+
+    async def get(self, request, pk):
+        try:
+            task = await Task.objects.with_details().aget(pk=pk)
+        except Task.DoesNotExist:
+            raise exceptions.NotFound('Task nicht gefunden.')
+        if not (await aget_board_access(request)).can_access(task.board_id):
+            raise exceptions.PermissionDenied()
+        etag = quote_etag(f'task-{pk}-{task.version}')
+        return not_modified(request, etag) or render(TaskDetailWithOutBoard(task).data, etag=etag)
+
+
+class AsyncTaskListView(AsyncAPIView):
+    """
+    Basis für paginierte Task-Listen (Filter, Sortierung und Cursor wie bei
+    `TasksView`). Subclasses setzen `user_field`, das Task-Feld, in dem der
+    Benutzer stehen muss.
+    """
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    user_field = None
+
+    async def get(self, request):
+        drf_request = Request(request)
+        queryset = Task.objects.filter(**{self.user_field: request.user}).with_details()
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(drf_request, queryset, self)
+
+        # DRFs Cursor-Pagination ist synchron; ihre eine Seiten-Query läuft
+        # wie die Methoden des async ORM über sync_to_async.
+        paginator = self.pagination_class()
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, drf_request, view=self)
+        return render({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': TaskDetailSerializer(page, many=True).data,
+        })
+
+
+class AsyncTasksAssignedToMeView(AsyncTaskListView):
+    """GET: Tasks, denen der Benutzer zugewiesen ist."""
+    user_field = 'assignee_id'
+
+
+class AsyncTasksReviewingView(AsyncTaskListView):
+    """GET: Tasks, bei denen der Benutzer Reviewer ist."""
+    user_field = 'reviewer_id'
+
+
+class AsyncCommentsView(AsyncAPIView):
+    """GET: Kommentare einer Task (wie `CommentsView`, inklusive ETag/304)."""
+
+    async def get(self, request, task_id):
+        row = await Task.objects.filter(pk=task_id).values_list('version', 'board_id').afirst()
+        if row is None:
+            raise exceptions.NotFound('Task nicht gefunden.')
+        version, board_id = row
+        if not (await aget_board_access(request)).can_access(board_id):
+            raise exceptions.PermissionDenied()
+
+        etag = f'comments-{task_id}-{version}'
+        fingerprint = query_fingerprint(request.META.get('QUERY_STRING', ''))
+        etag = quote_etag(f'{etag}-{fingerprint}' if fingerprint else etag)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        drf_request = Request(request)
+        paginator = CommentCursorPagination()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            Comment.objects.filter(task_id=task_id).select_related('author'), drf_request, view=self
+        )
+        return render({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': CommentSerializer(page, many=True).data,
+        }, etag=etag)
+
+
+class BoardEventsView(AsyncAPIView):
+    """
+    GET boards/<pk>/events/: Server-Sent Events zu Änderungen am Board.
+
+    Ereignisse: task.created, task.updated, task.deleted, tasks.imported,
+    comment.created, comment.deleted, board.updated, board.members. Jedes
+    Ereignis trägt eine pro Board fortlaufende `id`; beim Wiederverbinden
+    (Header `Last-Event-ID` oder Parameter `last_event_id`) werden verpasste
+    Ereignisse nachgeliefert. Sind sie nicht mehr im Protokoll, folgt ein
+    `reset`-Ereignis und der Client lädt das Board neu. Ohne Ereignisse wird
+    alle `KANMIND_EVENT_HEARTBEAT` Sekunden ein Keepalive gesendet und der
+    Zugriff erneut geprüft; wer kein Mitglied mehr ist, wird getrennt.
+    """
+    retry_ms = 3000
+
+    async def get(self, request, pk):
+        if not await Board.objects.filter(pk=pk).aexists():
+            raise exceptions.NotFound('Board nicht gefunden.')
+        if not (await aget_board_access(request)).can_access(pk):
+            raise exceptions.PermissionDenied()
+        last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        if last_id is not None and not last_id.isdigit():
+            raise exceptions.ValidationError({'last_event_id': 'Muss eine Zahl sein.'})
+
+        response = StreamingHttpResponse(
+            self.stream(request.user, pk, None if last_id is None else int(last_id)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, user, pk, last_id):
+        broker = get_broker()
+        yield f'retry: {self.retry_ms}\n\n'.encode()
+        if last_id is None:
+            last_id = broker.latest_id(pk)
+        events = broker.since(pk, last_id)
+        while True:
+            if events is None:
+                last_id = broker.latest_id(pk)
+                yield f'id: {last_id}\nevent: reset\ndata: {{}}\n\n'.encode()
+            elif events:
+                for event in events:
+                    last_id = event.id
+                    yield self.format(event)
+            else:
+                access = BoardAccess(user, preload=True)
+                await access.aload()
+                if not access.can_access(pk):
+                    return
+                yield b': keepalive\n\n'
+            events = await broker.wait(pk, last_id, settings.KANMIND_EVENT_HEARTBEAT)
+
+    def format(self, event):
+        data = JSONRenderer().render(event.data)
+        return b'id: %d\nevent: %s\ndata: %s\n\n' % (event.id, event.type.encode(), data)
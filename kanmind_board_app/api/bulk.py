@@ -0,0 +1,233 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from kanmind_board_app import counters, events
+from kanmind_board_app.models import Board, DeletionLog, Task, new_version
+from kanmind_board_app.render_cache import board_render_cache
+from kanmind_board_app.signals import bulk_task_deletion
+from .access import get_board_access
+from .serializers import TaskSerializer, TaskSerializerWithOutBoard, TaskDetailSerializer
+
+
+NOT_EXECUTED = {
+    'status': status.HTTP_424_FAILED_DEPENDENCY,
+    'detail': 'Nicht ausgeführt, da andere Einträge ungültig sind.',
+}
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BulkTaskOperation:
+    """
+    Validiert und schreibt einen Stapel von Task-Operationen.
+
+    Payload:
+    - create: Liste von Tasks wie bei `POST tasks/`
+    - update: Liste von Teil-Updates wie bei `PATCH tasks/<id>/`, jeweils mit `id`
+    - delete: Liste von Task-IDs
+
+    Alle referenzierten Tasks, Boards und Benutzer werden mit je einer Query
+    geladen, die Mitgliedschaft wird pro Board nur einmal geprüft. Ist ein
+    Eintrag ungültig, wird nichts geschrieben; sonst laufen alle Schreib-
+    zugriffe per bulk_create/bulk_update in einer Transaktion. Grabsteine,
+    Zähler und Versionen gelöschter Tasks werden gesammelt geschrieben statt
+    pro Task in den Signal-Handlern.
+    """
+
+    def __init__(self, request, data):
+        self.request = request
+        self.access = get_board_access(request)
+        self.create_items = data.get('create') or []
+        self.update_items = data.get('update') or []
+        self.delete_items = data.get('delete') or []
+        self.results = {'create': [], 'update': [], 'delete': []}
+        self._creates = []
+        self._updates = []
+        self._deletes = []
+        self._gone = set()
+
+    def check_shape(self):
+        """Gibt eine Fehlermeldung zurück, falls der Payload strukturell ungültig ist."""
+        for key in ('create', 'update', 'delete'):
+            if not isinstance(getattr(self, f'{key}_items'), list):
+                return f'"{key}" muss eine Liste sein.'
+        total = len(self.create_items) + len(self.update_items) + len(self.delete_items)
+        if total == 0:
+            return 'Mindestens eine Operation ist erforderlich.'
+        if total > settings.KANMIND_BULK_TASK_LIMIT:
+            return f'Maximal {settings.KANMIND_BULK_TASK_LIMIT} Operationen pro Anfrage.'
+        return None
+
+    def preload(self):
+        task_ids = {
+            _as_int(item.get('id')) if isinstance(item, dict) else None
+            for item in self.update_items
+        } | {_as_int(item) for item in self.delete_items}
+        self.tasks = Task.objects.in_bulk([pk for pk in task_ids if pk is not None])
+
+        board_ids = {
+            _as_int(item.get('board')) for item in self.create_items if isinstance(item, dict)
+        }
+        user_ids = {
+            _as_int(item.get(field))
+            for item in [*self.create_items, *self.update_items] if isinstance(item, dict)
+            for field in ('assignee_id', 'reviewer_id')
+        }
+        self.context = {
+            'request': self.request,
+            'preloaded': {
+                Board: Board.objects.in_bulk([pk for pk in board_ids if pk is not None]),
+                User: User.objects.in_bulk([pk for pk in user_ids if pk is not None]),
+            },
+        }
+
+    def validate(self):
+        """Validiert alle Einträge und gibt zurück, ob der Stapel ausführbar ist."""
+        self.preload()
+        seen = set()
+
+        for index, item in enumerate(self.create_items):
+            self.results['create'].append(self._validate_create(index, item))
+
+        for item in self.update_items:
+            pk = _as_int(item.get('id')) if isinstance(item, dict) else None
+            self.results['update'].append(self._validate_update(pk, item, seen))
+
+        for item in self.delete_items:
+            self.results['delete'].append(self._validate_delete(_as_int(item), seen))
+
+        valid = all(
+            result['status'] < status.HTTP_400_BAD_REQUEST
+            for results in self.results.values() for result in results
+        )
+        if not valid:
+            for results in self.results.values():
+                for index, result in enumerate(results):
+                    if result['status'] < status.HTTP_400_BAD_REQUEST:
+                        keep = {key: result[key] for key in ('index', 'id') if key in result}
+                        results[index] = {**keep, **NOT_EXECUTED}
+        return valid
+
+    def _validate_create(self, index, item):
+        if not isinstance(item, dict):
+            return {'index': index, 'status': 400, 'errors': {'non_field_errors': ['Objekt erwartet.']}}
+        serializer = TaskSerializer(data=item, context=self.context)
+        if not serializer.is_valid():
+            return {'index': index, 'status': 400, 'errors': serializer.errors}
+        if not self.access.can_access(serializer.validated_data['board'].pk):
+            return {'index': index, 'status': 403, 'detail': 'Benutzer muss Mitglied des Boards sein.'}
+        self._creates.append(Task(**serializer.validated_data))
+        return {'index': index, 'status': 201}
+
+    def _validate_update(self, pk, item, seen):
+        if pk is None:
+            return {'id': None, 'status': 400, 'detail': 'Gültige Task-ID erforderlich.'}
+        if pk in seen:
+            return {'id': pk, 'status': 400, 'detail': 'Task kommt mehrfach vor.'}
+        seen.add(pk)
+        task = self.tasks.get(pk)
+        if task is None:
+            return {'id': pk, 'status': 404, 'detail': 'Task nicht gefunden.'}
+        if 'board' in item:
+            return {'id': pk, 'status': 400, 'detail': 'Das Ändern der Board-ID ist nicht erlaubt.'}
+        if not self.access.can_access(task.board_id):
+            return {'id': pk, 'status': 403, 'detail': 'Benutzer muss Mitglied des Boards sein.'}
+        data = {key: value for key, value in item.items() if key != 'id'}
+        serializer = TaskSerializerWithOutBoard(task, data=data, partial=True, context=self.context)
+        if not serializer.is_valid():
+            return {'id': pk, 'status': 400, 'errors': serializer.errors}
+        self._updates.append((task, serializer.validated_data))
+        return {'id': pk, 'status': 200}
+
+    def _validate_delete(self, pk, seen):
+        if pk is None:
+            return {'id': None, 'status': 400, 'detail': 'Gültige Task-ID erforderlich.'}
+        if pk in seen:
+            return {'id': pk, 'status': 400, 'detail': 'Task kommt mehrfach vor.'}
+        seen.add(pk)
+        task = self.tasks.get(pk)
+        if task is None:
+            return {'id': pk, 'status': 404, 'detail': 'Task nicht gefunden.'}
+        user_id = self.request.user.id
+        if user_id not in (task.assignee_id_id, task.reviewer_id_id) and not self.access.is_owner(task.board_id):
+            return {'id': pk, 'status': 403, 'detail': 'Nur der Ersteller der Task oder der Board-Eigentümer kann löschen.'}
+        self._deletes.append(task)
+        return {'id': pk, 'status': 204}
+
+    def _lock(self):
+        """
+        Liest die zu ändernden und zu löschenden Tasks erneut mit
+        Zeilensperre; die Zählerdeltas beruhen auf diesem Stand, nicht auf
+        dem vor der Transaktion geladenen. Parallel gelöschte Tasks entfallen.
+        """
+        locked = Task.objects.select_for_update().in_bulk(
+            [task.pk for task, _ in self._updates] + [task.pk for task in self._deletes]
+        )
+        self._gone = {
+            task.pk for task in [*(task for task, _ in self._updates), *self._deletes] if task.pk not in locked
+        }
+        self._updates = [(locked[task.pk], data) for task, data in self._updates if task.pk in locked]
+        self._deletes = [locked[task.pk] for task in self._deletes if task.pk in locked]
+
+    def execute(self):
+        """Schreibt alle validierten Operationen in einer Transaktion."""
+        changed = []
+        update_fields = {'version', 'updated_at'}
+        now = timezone.now()
+
+        with transaction.atomic():
+            self._lock()
+            for task, validated_data in self._updates:
+                changed.append((task, task.status, task.priority))
+                for attr, value in validated_data.items():
+                    setattr(task, attr, value)
+                    update_fields.add(attr)
+                task.version = new_version()
+                task.updated_at = now
+
+            created = Task.objects.bulk_create(self._creates, batch_size=500)
+            if self._updates:
+                Task.objects.bulk_update([task for task, _ in self._updates], update_fields, batch_size=500)
+            if self._deletes:
+                with bulk_task_deletion():
+                    Task.objects.filter(pk__in=[task.pk for task in self._deletes]).delete()
+                DeletionLog.objects.bulk_create([
+                    DeletionLog(board_id=task.board_id, kind=DeletionLog.Kind.TASK, object_id=task.pk)
+                    for task in self._deletes
+                ], batch_size=500)
+            counters.tasks_bulk_changed(created=created, deleted=self._deletes, changed=changed)
+
+            board_ids = {
+                task.board_id for task in [*created, *(task for task, _ in self._updates), *self._deletes]
+            }
+            if board_ids:
+                Board.objects.filter(pk__in=board_ids).bump_version()
+        board_render_cache.evict(board_ids)
+
+        written = Task.objects.filter(
+            pk__in=[task.pk for task in created] + [task.pk for task, _ in self._updates]
+        ).with_details().in_bulk()
+        for result, task in zip(self.results['create'], created):
+            result['task'] = TaskDetailSerializer(written[task.pk]).data
+            events.publish(task.board_id, 'task.created', result['task'])
+        for results in (self.results['update'], self.results['delete']):
+            for result in results:
+                if result['id'] in self._gone:
+                    result.update(status=status.HTTP_404_NOT_FOUND, detail='Task nicht gefunden.')
+        for result in self.results['update']:
+            if result['id'] in self._gone:
+                continue
+            result['task'] = TaskDetailSerializer(written[result['id']]).data
+            events.publish(result['task']['board'], 'task.updated', result['task'])
+        for task in self._deletes:
+            events.publish(task.board_id, 'task.deleted', {'id': task.pk})
@@ -0,0 +1,99 @@
+import hashlib
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from kanmind_board_app.models import Board, Task
+from .access import get_board_access
+
+
+def query_fingerprint(query_string):
+    """
+    Kurzer Hash der Query-Parameter (Reihenfolge egal) für ETags von Views,
+    deren Antwort außer von der Version auch von `cursor` o.ä. abhängt.
+    """
+    params = '&'.join(sorted(part for part in query_string.split('&') if part))
+    return hashlib.sha1(params.encode()).hexdigest()[:12] if params else ''
+
+
+class ConditionalGetMixin:
+    """
+    Mixin für bedingte GET-Requests über den `version`-Stempel von Board/Task.
+
+    Schickt der Client `If-None-Match`, liefert `get_version()` den Stempel
+    aus `version_model` mit einer einzigen indizierten Query. Hat der Benutzer Zugriff auf das
+    Board und passt der ETag, wird sofort 304 ohne Serialisierung geantwortet.
+    Sonst läuft der normale View-Code; dieser ruft `remember_version()` mit
+    dem geladenen Objekt auf, und die Antwort erhält den ETag.
+
+    Mit `etag_varies_on_query` gehen die Query-Parameter in den ETag ein
+    (z.B. pro Seite einer paginierten Liste).
+    """
+    etag_prefix = None
+    etag_varies_on_query = False
+    version_model = None
+    # Feld des Versions-Modells mit der Board-ID ('pk' beim Board selbst).
+    version_board_field = 'board_id'
+
+    def get_version_pk(self):
+        return self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+    def get_version(self):
+        """Liefert `(version, board_id)` oder None (einmal pro Request)."""
+        if not hasattr(self, '_version_row'):
+            self._version_row = self.version_model.objects.filter(pk=self.get_version_pk()).values_list(
+                'version', self.version_board_field
+            ).first()
+        return self._version_row
+
+    def build_etag(self, version):
+        etag = f'{self.etag_prefix}-{self.get_version_pk()}-{version}'
+        if self.etag_varies_on_query:
+            fingerprint = query_fingerprint(self.request.META.get('QUERY_STRING', ''))
+            if fingerprint:
+                etag = f'{etag}-{fingerprint}'
+        return quote_etag(etag)
+
+    def remember_version(self, obj):
+        """Merkt sich den ETag des geladenen Objekts für die Antwort."""
+        self._etag = self.build_etag(obj.version)
+
+    def not_modified(self):
+        """
+        Gibt eine 304-Antwort zurück, falls der Client den aktuellen Stand hat, sonst None.
+        """
+        header = self.request.headers.get('If-None-Match')
+        if not header:
+            return None
+        row = self.get_version()
+        if row is None:
+            return None
+        version, board_id = row
+        if not get_board_access(self.request).can_access(board_id):
+            return None
+        etag = self.build_etag(version)
+        etags = [tag.removeprefix('W/') for tag in parse_etags(header)]
+        if '*' in etags or etag in etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+        return None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, '_etag', None)
+        if request.method == 'GET' and response.status_code == status.HTTP_200_OK and etag:
+            response['ETag'] = etag
+        return response
+
+
+class BoardVersionMixin(ConditionalGetMixin):
+    etag_prefix = 'board'
+    version_model = Board
+    version_board_field = 'pk'
+
+
+class TaskVersionMixin(ConditionalGetMixin):
+    etag_prefix = 'task'
+    version_model = Task
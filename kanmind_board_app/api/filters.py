@@ -0,0 +1,55 @@
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Serverseitige Filter für Task-Listen.
+
+    Query-Parameter:
+    - board: Board-ID
+    - status, priority: exakter Wert
+    - due_date_after, due_date_before: Datumsbereich (inklusive, YYYY-MM-DD)
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        board = params.get('board')
+        if board:
+            if not board.isdigit():
+                raise ValidationError({'board': 'Board-ID muss eine Zahl sein.'})
+            queryset = queryset.filter(board_id=int(board))
+
+        for field in ('status', 'priority'):
+            value = params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+
+        for param, lookup in (('due_date_after', 'due_date__gte'), ('due_date_before', 'due_date__lte')):
+            value = params.get(param)
+            if value:
+                parsed = parse_date(value) if len(value) == 10 else None
+                if parsed is None:
+                    raise ValidationError({param: 'Datum muss im Format YYYY-MM-DD angegeben werden.'})
+                queryset = queryset.filter(**{lookup: parsed})
+
+        return queryset
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    Sortierung für Task-Listen nach `id` oder `due_date`.
+
+    Bei `due_date` wird `id` als eindeutiger Tiebreaker angehängt, damit
+    die Cursor-Pagination stabile Seiten liefert.
+    """
+    ordering_fields = ['id', 'due_date']
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and ordering[0].lstrip('-') == 'due_date':
+            tiebreaker = '-id' if ordering[0].startswith('-') else 'id'
+            return [ordering[0], tiebreaker]
+        return ordering
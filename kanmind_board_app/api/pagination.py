@@ -0,0 +1,29 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Keyset-Pagination für Task-Listen.
+
+    Standardmäßig wird nach `id` sortiert; über den Query-Parameter
+    `ordering` (siehe `TaskOrderingFilter`) kann auch nach `due_date`
+    paginiert werden. Die Seitengröße ist über `page_size` wählbar,
+    aber nach oben begrenzt.
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class CommentCursorPagination(CursorPagination):
+    """
+    Keyset-Pagination für Kommentare einer Task, neueste zuerst (wie
+    `Comment.Meta.ordering`). Die Seiten-Query läuft über den Index
+    `comment_task_created_idx`, ihre Dauer hängt also nicht von der Länge
+    des Threads ab.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
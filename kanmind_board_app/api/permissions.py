@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from .access import get_board_access
 
 class IsBoardMemberOrOwner(BasePermission):   
     """
@@ -12,7 +13,7 @@ class IsBoardMemberOrOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         user = request.user
-        return obj.owner == user or obj.members.filter(id=user.id).exists()
+        return obj.owner_id == user.id or get_board_access(request).can_access(obj.pk)
 
 
 class IsBoardOwner(BasePermission): 
@@ -24,7 +25,7 @@ class IsBoardOwner(BasePermission):
     """
         
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
+        return obj.owner_id == request.user.id
     
 
 class IsTaskBoardMember(BasePermission):
@@ -37,9 +38,7 @@ class IsTaskBoardMember(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        board = obj.board
-        return board.owner == user or board.members.filter(id=user.id).exists()    
+        return get_board_access(request).can_access(obj.board_id)    
     
 
 class CanDeleteTask(BasePermission):
@@ -53,9 +52,9 @@ class CanDeleteTask(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         user = request.user
-        if obj.board.owner == user:
+        if user.id in (obj.assignee_id_id, obj.reviewer_id_id):
             return True
-        return obj.assignee_id == user or obj.reviewer_id == user
+        return get_board_access(request).is_owner(obj.board_id)
     
 
 
@@ -69,9 +68,7 @@ class IsTaskBoardMemberForComment(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        board = obj.board
-        return board.owner == user or board.members.filter(id=user.id).exists()
+        return get_board_access(request).can_access(obj.board_id)
 
 
 class IsCommentAuthor(BasePermission):
@@ -83,4 +80,4 @@ class IsCommentAuthor(BasePermission):
     """
     
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user   
+        return obj.author_id == request.user.id
@@ -1,4 +1,6 @@
+from django.db import transaction
 from rest_framework import serializers
+from kanmind_board_app import counters, events
 from kanmind_board_app.models import Board, Task, Comment
 from django.contrib.auth.models import User
 
@@ -40,6 +42,7 @@ class BoardSerializer(serializers.ModelSerializer):
     - ticket_count: Anzahl der Aufgaben im Board
     - tasks_to_do_count: Anzahl der Aufgaben mit Status 'to-do'
     - tasks_high_prio_count: Anzahl der Aufgaben mit Priorität 'high'
+      (die Zähler sind denormalisierte Spalten, siehe kanmind_board_app.counters)
 
     Methoden:
     - create(): Fügt automatisch den aktuellen Benutzer zu den Board-Mitgliedern hinzu, falls nicht vorhanden
@@ -51,10 +54,10 @@ class BoardSerializer(serializers.ModelSerializer):
     )
 
     owner_id = serializers.ReadOnlyField(source='owner.id')
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
+    member_count = serializers.IntegerField(read_only=True)
+    ticket_count = serializers.IntegerField(read_only=True)
+    tasks_to_do_count = serializers.IntegerField(read_only=True)
+    tasks_high_prio_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Board
@@ -71,30 +74,42 @@ class BoardSerializer(serializers.ModelSerializer):
         members = validated_data.pop('members', [])
         user = self.context['request'].user
 
-        board = Board.objects.create(
-            owner=user,
-            **validated_data
-        )
+        with transaction.atomic():
+            board = Board.objects.create(
+                owner=user,
+                **validated_data
+            )
 
-        if user not in members:
-            members.append(user)
+            if user not in members:
+                members.append(user)
 
-        board.members.set(members)
+            board.members.set(members)
+            counters.members_changed(board)
         return board
     
 
-    def get_member_count(self, obj):
-        return obj.members.count()
-    
-    def get_ticket_count(self, obj):
-        return obj.tasks.count()
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField, das Objekte aus `context['preloaded'][Model]`
+    (Dict pk -> Objekt) auflöst, falls vorhanden. So kann ein Stapel von
+    Einträgen mit einer Query pro Modell validiert werden (siehe
+    `kanmind_board_app.api.bulk`). Ohne Kontext verhält es sich wie das
+    normale Feld.
+    """
 
-    def get_tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status="to-do").count()
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.get_queryset().model)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
 
-    def get_tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(priority="high").count()
-    
 
 class TaskSerializer(serializers.ModelSerializer):
     """
@@ -107,17 +122,17 @@ class TaskSerializer(serializers.ModelSerializer):
     - due_date
     """
 
-    assignee_id = serializers.PrimaryKeyRelatedField(
+    assignee_id = PreloadedPrimaryKeyRelatedField(
         queryset=User.objects.all(),
         required=False,
         allow_null=True
     )
-    reviewer_id = serializers.PrimaryKeyRelatedField(
+    reviewer_id = PreloadedPrimaryKeyRelatedField(
         queryset=User.objects.all(),
         required=False,
         allow_null=True
     )
-    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.all())
+    board = PreloadedPrimaryKeyRelatedField(queryset=Board.objects.all())
 
     class Meta:
         model = Task
@@ -161,6 +176,12 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_comments_count(self, obj):
+        """
+        Liest die Annotation aus `TaskQuerySet.with_details()`,
+        sonst wird eine COUNT-Query ausgeführt.
+        """
+        if hasattr(obj, 'comments_count'):
+            return obj.comments_count
         return obj.comments.count()
 
 
@@ -238,9 +259,18 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
         members = validated_data.pop('members', None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            # Nur geänderte Felder speichern, damit die Zählerspalten nicht
+            # mit veralteten Werten überschrieben werden.
+            if validated_data:
+                instance.save(update_fields=list(validated_data))
+            if members is not None:
+                instance.members.set(members)
+                counters.members_changed(instance)
+        if 'title' in validated_data:
+            events.publish(instance.pk, 'board.updated', {'id': instance.pk, 'title': instance.title})
         if members is not None:
-            instance.members.set(members)
+            events.publish(instance.pk, 'board.members', {'members': UserSerialiser(members, many=True).data})
         return instance
 
 
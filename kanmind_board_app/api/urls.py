@@ -1,18 +1,28 @@
 from django.urls import path
+from .async_views import BoardEventsView
 from .views import (
     BoardsView, BoardSingleView, TasksView, EmailCheckView, TaskSingleView, 
-    CommentsView, CommentsDeleteView, TasksAssignedToMeView, TasksReviewingView
+    CommentsView, CommentsDeleteView, TasksAssignedToMeView, TasksReviewingView,
+    EmailBatchCheckView, CacheMetricsView, TasksBulkView, BoardExportView, BoardImportView, BoardChangesView,
 )
 
 
 urlpatterns = [
     path('boards/', BoardsView.as_view()),
+    path('boards/export/', BoardExportView.as_view(), name='board-export-all'),
     path('boards/<int:pk>/', BoardSingleView.as_view(), name='board-detail'),
+    path('boards/<int:pk>/export/', BoardExportView.as_view(), name='board-export'),
+    path('boards/<int:pk>/changes/', BoardChangesView.as_view(), name='board-changes'),
+    path('boards/<int:pk>/events/', BoardEventsView.as_view(), name='board-events'),
+    path('boards/<int:pk>/import/', BoardImportView.as_view(), name='board-import'),
     path('tasks/', TasksView.as_view()),
     path('tasks/assigned-to-me/', TasksAssignedToMeView.as_view()),
     path('tasks/reviewing/', TasksReviewingView.as_view()),
+    path('tasks/bulk/', TasksBulkView.as_view(), name='task-bulk'),
     path('tasks/<int:pk>/', TaskSingleView.as_view(), name='task-detail'),
     path('tasks/<int:task_id>/comments/', CommentsView.as_view()),
     path('tasks/<int:task_id>/comments/<int:pk>/', CommentsDeleteView.as_view(), name='comment-detail'),
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('email-check/batch/', EmailBatchCheckView.as_view(), name='email-check-batch'),
+    path('metrics/cache/', CacheMetricsView.as_view(), name='cache-metrics'),
 ]
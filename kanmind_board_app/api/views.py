@@ -1,16 +1,33 @@
+import io
+
+from kanmind_board_app import access_cache, counters, events
+from kanmind_board_app.changes import CursorExpired, collect_changes, decode_cursor
+from kanmind_board_app.export import iter_board_records, iter_ndjson
+from kanmind_board_app.imports import TaskImporter, iter_rows
 from kanmind_board_app.models import Board, Task, Comment
-from django.db.models import Q
+from kanmind_board_app.render_cache import board_render_cache
+from user_auth_app.emails import lookup_emails, normalize_email
+from user_auth_app.token_cache import token_cache
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.response import Response
 from rest_framework import mixins, generics, status
 from rest_framework.generics import get_object_or_404
-from django.contrib.auth.models import User
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.parsers import MultiPartParser
+from .access import get_board_access
+from .bulk import BulkTaskOperation
+from .conditional import BoardVersionMixin, TaskVersionMixin
+from .filters import TaskFilterBackend, TaskOrderingFilter
+from .pagination import CommentCursorPagination, TaskCursorPagination
 from .permissions import IsBoardMemberOrOwner, IsBoardOwner, IsTaskBoardMember, CanDeleteTask, IsCommentAuthor, IsTaskBoardMemberForComment
 from .serializers import (
     BoardSerializer, TaskSerializer, TaskDetailSerializer, CommentSerializer, BoardDetailSerializer, BoardResponseSerializer,
-    BoardUpdateSerializer, TaskDetailWithOutBoard, TaskSerializerWithOutBoard, TaskSingleSerializerPut,
+    BoardUpdateSerializer, TaskDetailWithOutBoard, TaskSerializerWithOutBoard, TaskSingleSerializerPut, UserSerialiser,
 )
 
 
@@ -30,12 +47,12 @@ class BoardsView(
 
     def get_queryset(self):
         """
-        Filtert Boards für den aktuellen Benutzer.
+        Filtert Boards für den aktuellen Benutzer. Die Board-IDs kommen aus
+        dem Zugriffs-Cache; die Zähler sind Spalten auf Board, die Liste
+        liest daher keine Task-Zeilen.
         """
-        user = self.request.user
-        return Board.objects.filter(
-            Q(owner=user) | Q(members=user)
-        ).distinct()    
+        board_ids = get_board_access(self.request).board_ids()
+        return Board.objects.filter(pk__in=board_ids).select_related('owner')
     
 
     def get(self, request, *args, **kwargs):        
@@ -49,6 +66,7 @@ class BoardsView(
 
 
 class BoardSingleView(
+    BoardVersionMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -57,13 +75,22 @@ class BoardSingleView(
     """
     API-View für einzelne Boards.
 
-    GET: Gibt die Board-Details zurück.
+    GET: Gibt die Board-Details zurück (mit ETag, 304 bei passendem If-None-Match).
     PUT/PATCH: Aktualisiert das Board.
     DELETE: Löscht das Board (nur Eigentümer erlaubt).
     """
     queryset = Board.objects.all()
     permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
 
+    def get_queryset(self):
+        """
+        Für GET werden Mitglieder, Tasks und deren Benutzer vorab geladen,
+        damit `BoardDetailSerializer` mit einer festen Anzahl Queries rendert.
+        """
+        if self.request.method == 'GET':
+            return Board.objects.with_details()
+        return super().get_queryset()
+
     """Wählt den Serializer abhängig von der HTTP-Methode."""
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -71,8 +98,30 @@ class BoardSingleView(
         return BoardResponseSerializer
     
     def get(self, request, *args, **kwargs):
-        serializer = BoardDetailSerializer(self.get_object())
-        return Response(serializer.data)
+        """
+        Liefert die Board-Details. Die gerenderten Bytes werden je Board und
+        Version in `board_render_cache` gehalten; ein Treffer kostet nur die
+        Versionsabfrage.
+        """
+        not_modified = self.not_modified()
+        if not_modified is not None:
+            return not_modified
+
+        row = self.get_version()
+        cacheable = row is not None and get_board_access(request).can_access(row[1])
+        if cacheable:
+            version = row[0]
+            content = board_render_cache.get(row[1], version)
+            if content is not None:
+                self._etag = self.build_etag(version)
+                return HttpResponse(content, content_type='application/json')
+
+        board = self.get_object()
+        self.remember_version(board)
+        content = JSONRenderer().render(BoardDetailSerializer(board).data)
+        if cacheable:
+            board_render_cache.set(row[1], version, content)
+        return HttpResponse(content, content_type='application/json')
 
     def put(self, request, *args, **kwargs):
         board = self.get_object()
@@ -96,6 +145,126 @@ class BoardSingleView(
         return self.destroy(request, *args, **kwargs)
 
 
+class BoardChangesView(APIView):
+    """
+    API-View für den inkrementellen Abgleich eines Boards.
+
+    GET boards/<pk>/changes/?since=<cursor>: Geänderte Tasks, Kommentare und
+    Mitglieder sowie gelöschte IDs seit dem Cursor (siehe
+    `kanmind_board_app.changes`). Ohne `since` wird der vollständige Stand
+    geliefert; ist der Cursor abgelaufen, antwortet der View mit 410.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        board = get_object_or_404(Board, pk=pk)
+        if not get_board_access(request).can_access(pk):
+            return Response(
+                {"detail": "Benutzer muss Mitglied des Boards sein."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        since = request.query_params.get('since')
+        try:
+            since = decode_cursor(since) if since else None
+        except ValueError:
+            return Response({"since": ["Ungültiger Cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            changes = collect_changes(board, since)
+        except CursorExpired:
+            return Response(
+                {"detail": "Cursor abgelaufen, das Board muss neu geladen werden."},
+                status=status.HTTP_410_GONE
+            )
+        return Response(self.serialize(changes))
+
+    def serialize(self, changes):
+        board = changes['board']
+        return {
+            'cursor': changes['cursor'],
+            'board': None if board is None else {
+                'id': board.pk,
+                'title': board.title,
+                'owner_id': board.owner_id,
+                'members': UserSerialiser(board.members.all(), many=True).data,
+            },
+            'tasks': TaskDetailWithOutBoard(changes['tasks'], many=True).data,
+            'comments': [{'task': comment.task_id, **CommentSerializer(comment).data} for comment in changes['comments']],
+            'deleted': changes['deleted'],
+        }
+
+
+class BoardExportView(APIView):
+    """
+    API-View für den NDJSON-Export.
+
+    GET boards/export/: Streamt alle Boards des Benutzers mit Tasks und Kommentaren.
+    GET boards/<pk>/export/: Streamt ein einzelnes Board (nur Mitglieder/Eigentümer).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk=None):
+        access = get_board_access(request)
+        if pk is None:
+            board_ids = sorted(access.board_ids())
+            filename = 'kanmind-boards.ndjson'
+        else:
+            if not access.can_access(pk):
+                get_object_or_404(Board, pk=pk)
+                return Response(
+                    {"detail": "Benutzer muss Mitglied des Boards sein."},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            board_ids = [pk]
+            filename = f'kanmind-board-{pk}.ndjson'
+
+        response = StreamingHttpResponse(
+            iter_ndjson(iter_board_records(board_ids)),
+            content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BoardImportView(APIView):
+    """
+    API-View für den Task-Import.
+
+    POST boards/<pk>/import/: Importiert Tasks aus einer hochgeladenen Datei
+    (`file`, NDJSON oder CSV) in das Board. Das Format wird aus dem Parameter
+    `format` oder der Dateiendung bestimmt. Ungültige Zeilen werden
+    übersprungen und mit Zeilennummer zurückgegeben.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, pk):
+        board = get_object_or_404(Board, pk=pk)
+        if not get_board_access(request).can_access(pk):
+            return Response(
+                {"detail": "Benutzer muss Mitglied des Boards sein."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["Datei erforderlich."]}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get('format') or request.data.get('format')
+        if fmt is None:
+            fmt = 'csv' if upload.name.endswith('.csv') else 'ndjson'
+        if fmt not in ('csv', 'ndjson'):
+            return Response({"format": ["Erlaubt sind csv und ndjson."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        try:
+            result = TaskImporter(request.user, TaskSerializer, board=board).run(iter_rows(stream, fmt))
+        except UnicodeDecodeError:
+            return Response({"file": ["Datei muss UTF-8-kodiert sein."]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'imported': result.imported,
+            'failed': result.failed,
+            'errors': result.errors,
+        })
+
+
 class TasksView(
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -104,13 +273,19 @@ class TasksView(
     """
     API-View für Aufgaben.
 
-    GET: Listet alle Tasks (optional Filter in Subclasses).
+    GET: Listet die Tasks aller Boards des Benutzers (optional Filter in Subclasses).
+         Die Liste ist per Cursor paginiert und über `board`, `status`, `priority`,
+         `due_date_after` und `due_date_before` filterbar, sortierbar über
+         `ordering=id|due_date`.
     POST: Erstellt eine neue Task in einem Board, überprüft, dass der Benutzer Mitglied ist.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
 
     def get_queryset(self):
-        return Task.objects.all()
+        board_ids = get_board_access(self.request).board_ids()
+        return Task.objects.filter(board_id__in=board_ids).with_details()
 
     def get_serializer_class(self): 
         """Wählt Serializer abhängig von der HTTP-Methode."""       
@@ -129,10 +304,14 @@ class TasksView(
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        board = get_object_or_404(Board, id=board_id)
+        if not str(board_id).isdigit():
+            return Response(
+                {"detail": "Board-ID muss eine Zahl sein."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        user = request.user
-        if not (board.owner == user or board.members.filter(id=user.id).exists()):
+        if not get_board_access(request).can_access(board_id):
+            get_object_or_404(Board, id=board_id)
             return Response(
                 {"detail": "Benutzer muss Mitglied des Boards sein."},
                 status=status.HTTP_403_FORBIDDEN
@@ -143,15 +322,43 @@ class TasksView(
             context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        task = serializer.save()
-        
-        return Response(
-            TaskDetailSerializer(task).data,
-            status=status.HTTP_201_CREATED
-        )        
+        with transaction.atomic():
+            task = serializer.save()
+            counters.task_created(task)
+
+        data = TaskDetailSerializer(task).data
+        events.publish(task.board_id, 'task.created', data)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class TasksBulkView(APIView):
+    """
+    API-View für Stapelverarbeitung von Tasks.
+
+    POST: Nimmt `create`, `update` und `delete` als Listen entgegen (siehe
+    `BulkTaskOperation`). Antwortet mit einem Ergebnis pro Eintrag; ist ein
+    Eintrag ungültig, wird nichts geschrieben und mit 400 geantwortet.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response({"detail": "Objekt mit create/update/delete erwartet."}, status=status.HTTP_400_BAD_REQUEST)
+
+        operation = BulkTaskOperation(request, request.data)
+        error = operation.check_shape()
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not operation.validate():
+            return Response(operation.results, status=status.HTTP_400_BAD_REQUEST)
+
+        operation.execute()
+        return Response(operation.results, status=status.HTTP_200_OK)
 
 
 class TaskSingleView(
+    TaskVersionMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -160,7 +367,7 @@ class TaskSingleView(
     """
     API-View für einzelne Tasks.
 
-    GET: Gibt Task-Details zurück.
+    GET: Gibt Task-Details zurück (mit ETag, 304 bei passendem If-None-Match).
     PATCH/PUT: Aktualisiert die Task (Board-ID kann nicht geändert werden).
     DELETE: Löscht die Task (nur Assignee, Reviewer oder Board-Eigentümer).
     """
@@ -182,7 +389,12 @@ class TaskSingleView(
         return TaskDetailWithOutBoard
 
     def get(self, request, *args, **kwargs):
-        task = get_object_or_404(Task, id=kwargs.get('pk'))
+        not_modified = self.not_modified()
+        if not_modified is not None:
+            return not_modified
+        task = get_object_or_404(Task.objects.with_details(), id=kwargs.get('pk'))
+        self.check_object_permissions(request, task)
+        self.remember_version(task)
         serializer = self.get_serializer(task)
         return Response(serializer.data)   
 
@@ -210,10 +422,20 @@ class TaskSingleView(
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        task = serializer.save()
-
-        response_serializer = TaskSingleSerializerPut(task)
-        return Response(response_serializer.data, status=status.HTTP_200_OK)
+        with transaction.atomic():
+            # Alte Werte erst unter Zeilensperre lesen, sonst ziehen zwei
+            # parallele Updates denselben alten Zählerstand ab.
+            try:
+                serializer.instance = Task.objects.select_for_update().get(pk=task.pk)
+            except Task.DoesNotExist:
+                return Response({"detail": "Task nicht gefunden."}, status=status.HTTP_404_NOT_FOUND)
+            old_status, old_priority = serializer.instance.status, serializer.instance.priority
+            task = serializer.save()
+            counters.task_changed(task, old_status, old_priority)
+
+        data = TaskSingleSerializerPut(task).data
+        events.publish(task.board_id, 'task.updated', data)
+        return Response(data, status=status.HTTP_200_OK)
 
 
     def delete(self, request, *args, **kwargs):
@@ -226,11 +448,20 @@ class TaskSingleView(
         for permission in self.get_permissions():
             if not permission.has_object_permission(request, self, task):
                 return Response({"detail": "Nur der Ersteller der Task oder der Board-Eigentümer kann löschen."}, status=status.HTTP_403_FORBIDDEN)
-        task.delete()
+        task_id = task.id
+        with transaction.atomic():
+            try:
+                task = Task.objects.select_for_update().get(pk=task_id)
+            except Task.DoesNotExist:
+                return Response({"detail": "Task nicht gefunden."}, status=status.HTTP_404_NOT_FOUND)
+            task.delete()
+            counters.task_deleted(task)
+        events.publish(task.board_id, 'task.deleted', {'id': task_id})
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class CommentsView(
+    TaskVersionMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     generics.GenericAPIView
@@ -238,11 +469,17 @@ class CommentsView(
     """
     API-View für Kommentare zu einer Task.
 
-    GET: Listet alle Kommentare einer Task.
+    GET: Listet die Kommentare einer Task, neueste zuerst (Cursor-Pagination,
+    mit ETag, 304 bei passendem If-None-Match).
     POST: Erstellt einen Kommentar, der automatisch den aktuellen Benutzer als Author setzt.
     """
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
     permission_classes = [IsAuthenticated, IsTaskBoardMemberForComment]
+    lookup_url_kwarg = 'task_id'
+    etag_prefix = 'comments'
+    # Jede Cursor-Seite ist eine eigene Antwort.
+    etag_varies_on_query = True
 
     def get_task(self):
         """
@@ -256,11 +493,28 @@ class CommentsView(
         self.check_object_permissions(self.request, task)
         return task
 
+    def check_task_access(self):
+        """
+        Prüft Task und Zugriff für GET ohne die Task zu laden: `(version,
+        board_id)` kommt aus derselben Query wie die ETag-Prüfung, die
+        Mitgliedschaft aus `get_board_access()`.
+        """
+        row = self.get_version()
+        if row is None:
+            raise NotFound("Task nicht gefunden.")
+        version, board_id = row
+        if not get_board_access(self.request).can_access(board_id):
+            self.permission_denied(self.request)
+        self._etag = self.build_etag(version)
+
     def get_queryset(self):
-        task = self.get_task()
-        return Comment.objects.filter(task=task)
+        self.check_task_access()
+        return Comment.objects.filter(task_id=self.kwargs['task_id']).select_related('author')
 
     def get(self, request, *args, **kwargs):
+        not_modified = self.not_modified()
+        if not_modified is not None:
+            return not_modified
         return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
@@ -268,6 +522,7 @@ class CommentsView(
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save(author=request.user, task=task)
+        events.publish(task.board_id, 'comment.created', {'task': task.id, **serializer.data})
         return Response(serializer.data, status=201)
     
 
@@ -282,7 +537,7 @@ class CommentsDeleteView(APIView):
     def get_object(self, task_id, pk):
         task = get_object_or_404(Task, id=task_id)
 
-        comment = get_object_or_404(Comment, id=pk, task=task)
+        comment = get_object_or_404(Comment.objects.select_related('task'), id=pk, task=task)
 
         self.check_object_permissions(self.request, comment)
         return comment
@@ -290,6 +545,7 @@ class CommentsDeleteView(APIView):
     def delete(self, request, task_id, pk):
         comment = self.get_object(task_id, pk)
         comment.delete()
+        events.publish(comment.task.board_id, 'comment.deleted', {'task': task_id, 'id': pk})
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -299,9 +555,18 @@ class EmailCheckView(APIView):
     API-View zum Überprüfen, ob eine Email existiert.
 
     GET: query parameter 'email' -> Gibt User-Daten zurück, falls vorhanden.
+    Groß-/Kleinschreibung spielt keine Rolle (siehe `user_auth_app.emails`).
     """
     permission_classes = [IsAuthenticated]
 
+    @staticmethod
+    def user_data(user):
+        return {
+            "id": user.id,
+            "email": user.email,
+            "fullname": user.get_full_name() or user.username
+        }
+
     def get(self, request):
         email = request.query_params.get('email')
 
@@ -311,21 +576,64 @@ class EmailCheckView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            user = User.objects.get(email=email)
-            data = {
-                "id": user.id,
-                "email": user.email,
-                "fullname": user.get_full_name() or user.username
-            }
-            return Response(data, status=status.HTTP_200_OK) 
-
-        except User.DoesNotExist:
+        user = lookup_emails([email]).get(normalize_email(email))
+        if user is None:
             return Response(
                 {"detail": "Email not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
+        return Response(self.user_data(user), status=status.HTTP_200_OK)
+
+
+class EmailBatchCheckView(APIView):
+    """
+    API-View zum Prüfen vieler Emails auf einmal (z.B. beim Einladen eines Teams).
+
+    POST: `{"emails": [...]}` (höchstens `KANMIND_EMAIL_LOOKUP_LIMIT`) ->
+    `results` mit den Daten der gefundenen User (wie `EmailCheckView`, in
+    der Reihenfolge der Anfrage) und `missing` mit den nicht gefundenen
+    Emails. Alle Adressen werden mit einer Query aufgelöst.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        emails = request.data.get('emails') if isinstance(request.data, dict) else None
+        if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+            return Response(
+                {"detail": '"emails" muss eine Liste von Strings sein.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(emails) > settings.KANMIND_EMAIL_LOOKUP_LIMIT:
+            return Response(
+                {"detail": f'Maximal {settings.KANMIND_EMAIL_LOOKUP_LIMIT} Emails pro Anfrage.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        users = lookup_emails(emails)
+        results, missing = [], []
+        for email in dict.fromkeys(emails):
+            user = users.get(normalize_email(email))
+            if user is None:
+                missing.append(email)
+            else:
+                results.append(EmailCheckView.user_data(user))
+        return Response({'results': results, 'missing': missing}, status=status.HTTP_200_OK)
+
+
+class CacheMetricsView(APIView):
+    """
+    API-View für Cache-Kennzahlen (nur Admins).
+
+    GET: Hits, Misses und Invalidierungen der Caches dieses Worker-Prozesses.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'board_access': access_cache.stats(),
+            'board_render': board_render_cache.stats(),
+            'token_auth': token_cache.stats(),
+        })
 
 
 class TasksAssignedToMeView(TasksView):
@@ -337,7 +645,7 @@ class TasksAssignedToMeView(TasksView):
     def get_queryset(self):
         """Filtert Tasks, bei denen der aktuelle Benutzer Assignee ist."""
         user = self.request.user
-        return Task.objects.filter(assignee_id=user)
+        return Task.objects.filter(assignee_id=user).with_details()
 
 
 class TasksReviewingView(TasksView):
@@ -349,4 +657,4 @@ class TasksReviewingView(TasksView):
     def get_queryset(self):
         """Filtert Tasks, bei denen der aktuelle Benutzer Reviewer ist."""
         user = self.request.user
-        return Task.objects.filter(reviewer_id=user)
\ No newline at end of file
+        return Task.objects.filter(reviewer_id=user).with_details()
\ No newline at end of file
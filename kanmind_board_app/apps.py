@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class KanmindBoardAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanmind_board_app'
+
+    def ready(self):
+        from kanmind_board_app import signals  # noqa: F401
@@ -0,0 +1,74 @@
+"""
+Inkrementeller Abgleich eines Boards für `GET boards/<pk>/changes/`.
+
+Statt das ganze Board neu zu laden, schickt der Client den Cursor der
+letzten Antwort und erhält nur, was sich seitdem geändert hat:
+
+- board: Titel, Eigentümer und Mitglieder, falls geändert (sonst null)
+- tasks: geänderte oder neue Tasks (Format wie `TaskDetailWithOutBoard`)
+- comments: geänderte oder neue Kommentare (wie `CommentSerializer`, plus `task`)
+- deleted: IDs gelöschter Tasks und Kommentare (aus `DeletionLog`)
+
+Ohne Cursor wird der vollständige Stand geliefert. Der Cursor ist ein
+Zeitstempel in Mikrosekunden; er liegt `KANMIND_CHANGES_OVERLAP` Sekunden
+vor dem Abfragezeitpunkt, damit Transaktionen, die beim Lesen noch nicht
+committet waren, beim nächsten Abruf erfasst werden. Einträge aus diesem
+Fenster können daher doppelt kommen; Clients übernehmen sie per ID.
+
+Die Serialisierung der gesammelten Objekte übernimmt der View
+(`kanmind_board_app.api.views.BoardChangesView`).
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from kanmind_board_app.models import Comment, DeletionLog, Task
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class CursorExpired(Exception):
+    """Der Cursor ist älter als das Löschprotokoll; der Client muss neu laden."""
+
+
+def encode_cursor(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_cursor(value):
+    """Gibt den Zeitpunkt zum Cursor zurück; ValueError bei ungültigem Wert."""
+    if not value.isdigit():
+        raise ValueError(value)
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def collect_changes(board, since=None):
+    """
+    Sammelt die Änderungen am Board seit `since` (None = vollständiger Stand).
+
+    `board` ist das Board oder None (unverändert), `tasks` und `comments`
+    sind Querysets, `deleted` enthält die gelöschten IDs.
+    """
+    now = timezone.now()
+    if since is not None and since < now - timedelta(days=settings.KANMIND_DELETION_LOG_RETENTION_DAYS):
+        raise CursorExpired()
+
+    tasks = Task.objects.filter(board=board).with_details().order_by('pk')
+    comments = Comment.objects.filter(task__board=board).select_related('author').order_by('pk')
+    deleted = {'tasks': [], 'comments': []}
+    if since is not None:
+        tasks = tasks.filter(updated_at__gt=since)
+        comments = comments.filter(updated_at__gt=since)
+        rows = DeletionLog.objects.filter(board=board, deleted_at__gt=since).values_list('kind', 'object_id')
+        for kind, object_id in rows:
+            deleted[f'{kind}s'].append(object_id)
+
+    return {
+        'cursor': encode_cursor(now - timedelta(seconds=settings.KANMIND_CHANGES_OVERLAP)),
+        'board': board if since is None or board.updated_at > since else None,
+        'tasks': tasks,
+        'comments': comments,
+        'deleted': deleted,
+    }
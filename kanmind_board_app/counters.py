@@ -0,0 +1,115 @@
+"""
+Pflege der denormalisierten Zähler auf `Board`.
+
+Alle Änderungen laufen als UPDATE mit F-Ausdrücken, damit parallele
+Schreibzugriffe keine Inkremente verlieren. Die Funktionen sollten in
+derselben Transaktion aufgerufen werden wie der eigentliche Schreibzugriff.
+"""
+from django.db.models import F
+
+from kanmind_board_app.models import Board, Task
+
+
+def _task_deltas(status, priority, sign):
+    """
+    Liefert die Zähleränderungen, die eine Task mit `status`/`priority`
+    beim Hinzufügen (sign=1) oder Entfernen (sign=-1) verursacht.
+    """
+    return {
+        'ticket_count': sign,
+        'tasks_to_do_count': sign if status == Task.Status.TO_DO else 0,
+        'tasks_high_prio_count': sign if priority == Task.Priority.HIGH else 0,
+    }
+
+
+def _apply(board_id, deltas):
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if updates:
+        Board.objects.filter(pk=board_id).update(**updates)
+
+
+def task_created(task):
+    """Zählt eine neu angelegte Task."""
+    _apply(task.board_id, _task_deltas(task.status, task.priority, 1))
+
+
+def task_deleted(task):
+    """Entfernt eine gelöschte Task aus den Zählern."""
+    _apply(task.board_id, _task_deltas(task.status, task.priority, -1))
+
+
+def task_changed(task, old_status, old_priority):
+    """
+    Gleicht die Zähler ab, nachdem sich Status oder Priorität einer Task geändert haben.
+    """
+    removed = _task_deltas(old_status, old_priority, -1)
+    added = _task_deltas(task.status, task.priority, 1)
+    _apply(task.board_id, {field: removed[field] + added[field] for field in removed})
+
+
+def tasks_bulk_changed(created=(), deleted=(), changed=()):
+    """
+    Wendet die Zähleränderungen vieler Tasks mit einem UPDATE pro Board an.
+
+    `changed` enthält Tupel `(task, old_status, old_priority)`.
+    """
+    per_board = {}
+
+    def add(board_id, deltas):
+        totals = per_board.setdefault(board_id, dict.fromkeys(deltas, 0))
+        for field, delta in deltas.items():
+            totals[field] += delta
+
+    for task in created:
+        add(task.board_id, _task_deltas(task.status, task.priority, 1))
+    for task in deleted:
+        add(task.board_id, _task_deltas(task.status, task.priority, -1))
+    for task, old_status, old_priority in changed:
+        add(task.board_id, _task_deltas(old_status, old_priority, -1))
+        add(task.board_id, _task_deltas(task.status, task.priority, 1))
+
+    for board_id, deltas in per_board.items():
+        _apply(board_id, deltas)
+
+
+def members_changed(board):
+    """
+    Setzt member_count nach einem `board.members.set(...)`.
+
+    Da `set()` die Mitgliederliste vollständig ersetzt, wird der Wert aus
+    der Zwischentabelle übernommen statt eines Deltas.
+    """
+    count = Board.members.through.objects.filter(board_id=board.pk).count()
+    Board.objects.filter(pk=board.pk).update(member_count=count)
+    board.member_count = count
+
+
+def find_mismatches(queryset=None):
+    """
+    Vergleicht die gespeicherten Zähler mit den tatsächlichen Werten.
+
+    Gibt eine Liste von `(board, {feld: (gespeichert, tatsächlich)})` zurück.
+    """
+    queryset = Board.objects.all() if queryset is None else queryset
+    mismatches = []
+    for board in queryset.with_computed_counts().order_by('pk').iterator():
+        diff = {
+            field: (getattr(board, field), getattr(board, f'computed_{field}'))
+            for field in Board.COUNTER_FIELDS
+            if getattr(board, field) != getattr(board, f'computed_{field}')
+        }
+        if diff:
+            mismatches.append((board, diff))
+    return mismatches
+
+
+def rebuild(queryset=None):
+    """
+    Korrigiert alle abweichenden Zähler und gibt die gefundenen Abweichungen zurück.
+    """
+    mismatches = find_mismatches(queryset)
+    for board, diff in mismatches:
+        Board.objects.filter(pk=board.pk).update(
+            **{field: actual for field, (_, actual) in diff.items()}
+        )
+    return mismatches
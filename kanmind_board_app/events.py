@@ -0,0 +1,156 @@
+"""
+Ereignisse zu Board-Änderungen für den SSE-Stream `boards/<pk>/events/`.
+
+Die Schreibpfade (Views, `BoardUpdateSerializer`, Bulk-Endpunkt, Import)
+rufen `publish()` auf; das Ereignis wird erst nach dem Commit an den Broker
+übergeben, abgebrochene Transaktionen erzeugen also keine Ereignisse.
+
+Der Broker ist über `KANMIND_EVENT_BROKER` austauschbar (Import-Pfad einer
+`EventBroker`-Subclass). Der Standard `InProcessBroker` hält pro Board ein
+begrenztes Protokoll der letzten Ereignisse im Speicher und reicht daher
+nur für einen Worker-Prozess; bei mehreren Workern wird ein Broker mit
+gemeinsamem Speicher (z.B. Redis Streams) benötigt.
+
+Ereignis-IDs sind pro Board fortlaufend. Liegt die vom Client gemeldete
+`Last-Event-ID` nicht mehr im Protokoll, liefert `since()` None und der
+Client muss das Board neu laden.
+"""
+import asyncio
+import itertools
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    board_id: int
+    type: str
+    data: dict
+
+
+class EventBroker:
+    """
+    Schnittstelle für Broker. `publish()` wird synchron aus den Schreibpfaden
+    aufgerufen, `wait()` aus dem async SSE-View.
+    """
+
+    def publish(self, board_id, type, data):
+        """Speichert und verteilt ein Ereignis; gibt das `Event` zurück."""
+        raise NotImplementedError
+
+    def latest_id(self, board_id):
+        """ID des letzten Ereignisses des Boards (0, falls keines vorliegt)."""
+        raise NotImplementedError
+
+    def since(self, board_id, last_id):
+        """
+        Ereignisse des Boards mit ID > `last_id` (älteste zuerst), oder None,
+        falls Ereignisse dazwischen nicht mehr vorliegen.
+        """
+        raise NotImplementedError
+
+    async def wait(self, board_id, last_id, timeout):
+        """
+        Wartet höchstens `timeout` Sekunden auf Ereignisse nach `last_id` und
+        liefert sie wie `since()` (leere Liste bei Timeout).
+        """
+        raise NotImplementedError
+
+
+class InProcessBroker(EventBroker):
+    """
+    Broker im Prozessspeicher.
+
+    Pro Board werden die letzten `max_events` Ereignisse gehalten, insgesamt
+    höchstens `max_boards` Boards (die am längsten inaktiven fallen heraus).
+    Wartende SSE-Verbindungen werden über ihren Event-Loop geweckt, da
+    `publish()` aus beliebigen Threads aufgerufen wird.
+    """
+
+    def __init__(self, max_events=None, max_boards=None):
+        self.max_events = max_events or settings.KANMIND_EVENT_LOG_SIZE
+        self.max_boards = max_boards or settings.KANMIND_EVENT_LOG_BOARDS
+        self._logs = OrderedDict()
+        self._waiters = {}
+        self._lock = threading.Lock()
+
+    def publish(self, board_id, type, data):
+        with self._lock:
+            log = self._logs.get(board_id)
+            if log is None:
+                log = self._logs[board_id] = (itertools.count(1), deque(maxlen=self.max_events))
+                if len(self._logs) > self.max_boards:
+                    self._logs.popitem(last=False)
+            self._logs.move_to_end(board_id)
+            counter, events = log
+            event = Event(next(counter), board_id, type, data)
+            events.append(event)
+            waiters = self._waiters.pop(board_id, [])
+        for loop, wakeup in waiters:
+            loop.call_soon_threadsafe(wakeup.set)
+        return event
+
+    def latest_id(self, board_id):
+        with self._lock:
+            log = self._logs.get(board_id)
+            return log[1][-1].id if log and log[1] else 0
+
+    def since(self, board_id, last_id):
+        with self._lock:
+            log = self._logs.get(board_id)
+            events = list(log[1]) if log else []
+        latest = events[-1].id if events else 0
+        if last_id > latest or (events and events[0].id > last_id + 1):
+            return None
+        return [event for event in events if event.id > last_id]
+
+    async def wait(self, board_id, last_id, timeout):
+        wakeup = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wakeup)
+        with self._lock:
+            self._waiters.setdefault(board_id, []).append(waiter)
+        try:
+            events = self.since(board_id, last_id)
+            if events == []:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return []
+                events = self.since(board_id, last_id)
+            return events
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(board_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._waiters[board_id]
+
+    def clear(self):
+        with self._lock:
+            self._logs.clear()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Der konfigurierte Broker (einmal pro Prozess angelegt)."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.KANMIND_EVENT_BROKER)()
+    return _broker
+
+
+def publish(board_id, type, data):
+    """Veröffentlicht ein Ereignis, sobald die laufende Transaktion committet ist."""
+    transaction.on_commit(lambda: get_broker().publish(board_id, type, data))
@@ -0,0 +1,65 @@
+"""
+Streaming-Export von Boards, Tasks und Kommentaren als NDJSON.
+
+Jede Zeile ist ein JSON-Objekt mit einem `type`-Feld (`board`, `task`,
+`comment`). Alle Querysets werden per `iterator()` in Chunks gelesen, der
+Speicherbedarf bleibt daher unabhängig von der Größe der Boards konstant.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from kanmind_board_app.models import Board, Task, Comment
+
+
+CHUNK_SIZE = 2000
+
+TASK_FIELDS = [
+    'id', 'title', 'description', 'status', 'priority',
+    'assignee_id', 'reviewer_id', 'due_date',
+]
+
+
+def iter_board_records(board_ids, chunk_size=CHUNK_SIZE):
+    """
+    Liefert die Datensätze der Boards nacheinander: erst das Board selbst,
+    dann seine Tasks, dann die Kommentare dieser Tasks.
+    """
+    boards = (
+        Board.objects.filter(pk__in=board_ids)
+        .order_by('pk')
+        .prefetch_related('members')
+        .iterator(chunk_size=100)
+    )
+    for board in boards:
+        yield {
+            'type': 'board',
+            'id': board.pk,
+            'title': board.title,
+            'owner_id': board.owner_id,
+            'members': [member.pk for member in board.members.all()],
+        }
+
+        tasks = (
+            Task.objects.filter(board_id=board.pk)
+            .order_by('pk')
+            .values(*TASK_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+        for task in tasks:
+            yield {'type': 'task', 'board_id': board.pk, **task}
+
+        comments = (
+            Comment.objects.filter(task__board_id=board.pk)
+            .order_by('task_id', 'pk')
+            .values('id', 'task_id', 'author_id', 'content', 'created_at')
+            .iterator(chunk_size=chunk_size)
+        )
+        for comment in comments:
+            yield {'type': 'comment', **comment}
+
+
+def iter_ndjson(records):
+    """Kodiert Datensätze als NDJSON-Zeilen (UTF-8-Bytes)."""
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
@@ -0,0 +1,210 @@
+"""
+Import von Boards und Tasks aus NDJSON oder CSV.
+
+Zeilenformat (CSV-Spalten bzw. NDJSON-Schlüssel):
+- board: Board-ID (optional, wenn ein Ziel-Board vorgegeben ist oder vorher
+  ein Board-Datensatz importiert wurde)
+- title, description, status, priority, due_date (YYYY-MM-DD)
+- assignee_email, reviewer_email: werden chunkweise mit einer Query zu
+  Benutzern aufgelöst (Groß-/Kleinschreibung egal, siehe `user_auth_app.emails`)
+
+NDJSON darf zusätzlich Board-Datensätze enthalten:
+`{"type": "board", "title": "...", "members": ["a@example.com", ...]}`.
+Das Board wird mit dem importierenden Benutzer als Eigentümer angelegt,
+folgende Tasks ohne `board` landen darin.
+
+Die Zeilen werden gestreamt gelesen, in Chunks mit dem vom Aufrufer
+übergebenen Serializer (API und Commands: `TaskSerializer`) validiert und
+per bulk_create geschrieben, jeder Chunk in
+einer eigenen Transaktion. Nach jedem Chunk wird `progress` mit dem Stand
+aufgerufen; mit einem gespeicherten `ImportState` (siehe `checkpoint()`)
+kann ein abgebrochener Import ab der nächsten Zeile fortgesetzt werden.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from kanmind_board_app import counters, events
+from kanmind_board_app.access import BoardAccess
+from kanmind_board_app.models import Board, Task
+from kanmind_board_app.render_cache import board_render_cache
+from user_auth_app.emails import normalize_email
+
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+TASK_FIELDS = ['title', 'description', 'status', 'priority', 'due_date']
+
+
+def iter_rows(stream, fmt):
+    """
+    Liest Zeilen aus einem Text-Stream und liefert `(zeilennummer, dict)`.
+    Ungültige NDJSON-Zeilen werden als `(zeilennummer, None)` geliefert.
+    """
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, {key: value for key, value in row.items() if value not in (None, '')}
+        return
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+@dataclass
+class ImportState:
+    """Fortschritt eines Imports; wird als Checkpoint gespeichert."""
+    next_row: int = 1
+    board_id: int | None = None
+    imported: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def checkpoint(self):
+        return {'next_row': self.next_row, 'board_id': self.board_id}
+
+
+class TaskImporter:
+    """
+    Führt einen Import für einen Benutzer aus.
+
+    - user: importierender Benutzer; er muss Mitglied der Ziel-Boards sein
+    - serializer_class: validiert eine Task-Zeile (Felder wie `TaskSerializer`)
+    - board: festes Ziel-Board (Board-Datensätze und `board`-Spalten sind
+      dann nicht erlaubt)
+    - state: `ImportState` zum Fortsetzen eines abgebrochenen Imports
+    - progress: Callback, das nach jedem Chunk mit dem State aufgerufen wird
+    """
+
+    def __init__(self, user, serializer_class, board=None, chunk_size=CHUNK_SIZE, state=None, progress=None):
+        self.user = user
+        self.serializer_class = serializer_class
+        self.board = board
+        self.chunk_size = chunk_size
+        self.state = state or ImportState(board_id=board.pk if board else None)
+        self.progress = progress
+        self.access = BoardAccess(user)
+
+    def run(self, rows):
+        chunk = []
+        for number, record in rows:
+            if number < self.state.next_row:
+                continue
+            if record is not None and record.get('type') == 'board':
+                self._flush(chunk)
+                chunk = []
+                self._import_board(number, record)
+                continue
+            chunk.append((number, record))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        self._flush(chunk)
+        return self.state
+
+    def _import_board(self, number, record):
+        members = record.get('members', [])
+        if self.board is not None:
+            self.state.add_error(number, {'type': ['Board-Datensätze sind bei festem Ziel-Board nicht erlaubt.']})
+        elif not record.get('title'):
+            self.state.add_error(number, {'title': ['Dieses Feld ist erforderlich.']})
+        elif not isinstance(members, list) or not all(isinstance(email, str) for email in members):
+            self.state.add_error(number, {'members': ['Liste von E-Mail-Adressen erwartet.']})
+        else:
+            emails = {normalize_email(email) for email in members}
+            members = list(User.objects.filter(email__in=emails))
+            with transaction.atomic():
+                board = Board.objects.create(title=record['title'], owner=self.user)
+                board.members.set({*members, self.user})
+                counters.members_changed(board)
+            self.access = BoardAccess(self.user)
+            self.state.board_id = board.pk
+            missing = emails - {member.email for member in members}
+            if missing:
+                self.state.add_error(number, {'members': [f'Unbekannte E-Mail: {email}' for email in sorted(missing)]})
+        self.state.next_row = number + 1
+        self._report()
+
+    def _flush(self, chunk):
+        if not chunk:
+            return
+        records = [record for _, record in chunk if record is not None]
+        emails = {
+            normalize_email(str(record[key]))
+            for record in records
+            for key in ('assignee_email', 'reviewer_email')
+            if record.get(key)
+        }
+        users = {user.email: user for user in User.objects.filter(email__in=emails)}
+        board_ids = {str(self._board_id(record)) for record in records}
+        boards = Board.objects.in_bulk([int(pk) for pk in board_ids if pk.isdigit()])
+        context = {'preloaded': {Board: boards, User: {user.pk: user for user in users.values()}}}
+
+        tasks = []
+        for number, record in chunk:
+            if record is None:
+                self.state.add_error(number, {'non_field_errors': ['Ungültige Zeile.']})
+                continue
+            data, errors = self._task_data(record, users)
+            serializer = self.serializer_class(data=data, context=context)
+            if not serializer.is_valid():
+                errors.update(serializer.errors)
+            elif not self.access.can_access(serializer.validated_data['board'].pk):
+                errors['board'] = ['Benutzer muss Mitglied des Boards sein.']
+            if errors:
+                self.state.add_error(number, errors)
+                continue
+            tasks.append(Task(**serializer.validated_data))
+
+        with transaction.atomic():
+            created = Task.objects.bulk_create(tasks)
+            counters.tasks_bulk_changed(created=created)
+            touched = {task.board_id for task in created}
+            if touched:
+                Board.objects.filter(pk__in=touched).bump_version()
+        board_render_cache.evict(touched)
+        for board_id in touched:
+            events.publish(board_id, 'tasks.imported', {'ids': [task.pk for task in created if task.board_id == board_id]})
+
+        self.state.imported += len(created)
+        self.state.next_row = chunk[-1][0] + 1
+        self._report()
+
+    def _board_id(self, record):
+        if self.board is not None:
+            return self.board.pk
+        return record.get('board', self.state.board_id)
+
+    def _task_data(self, record, users):
+        errors = {}
+        data = {key: record[key] for key in TASK_FIELDS if key in record}
+        if self.board is not None and 'board' in record and str(record['board']) != str(self.board.pk):
+            errors['board'] = ['Zeile gehört zu einem anderen Board.']
+        data['board'] = self._board_id(record)
+        for key, target in (('assignee_email', 'assignee_id'), ('reviewer_email', 'reviewer_id')):
+            email = record.get(key)
+            if not email:
+                continue
+            user = users.get(normalize_email(str(email)))
+            if user is None:
+                errors[key] = [f'Unbekannte E-Mail: {email}']
+            else:
+                data[target] = user.pk
+        return data, errors
+
+    def _report(self):
+        if self.progress is not None:
+            self.progress(self.state)
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import AsyncClient, override_settings
+from rest_framework.authtoken.models import Token
+
+from kanmind_board_app.management.seeding import seed_dataset
+from kanmind_board_app.models import Board, Task
+
+
+class Rollback(Exception):
+    """Wird geworfen, um die Benchmark-Transaktion zurückzurollen."""
+
+
+class Command(BaseCommand):
+    """
+    Lastmessung der Lese-Endpunkte unter ASGI.
+
+    Schickt je Endpunkt `--requests` Anfragen mit `--concurrency` parallelen
+    Clients durch die ASGI-Request-Verarbeitung von Django (in-process, ohne
+    Netzwerk) und vergleicht die synchronen DRF-Views unter /api/ mit den
+    async Views unter /api/async/. Alles läuft in einer Transaktion, die am
+    Ende zurückgerollt wird; die Datenbank bleibt unverändert.
+    """
+    help = 'Vergleicht den Durchsatz der sync und async Lese-Endpunkte unter ASGI.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        users, boards = seed_dataset(users=50, boards=50, tasks=options['tasks'])
+        user = max(users, key=lambda u: Board.objects.for_user(u).count())
+        token = Token.objects.create(user=user)
+        board = Board.objects.for_user(user).first()
+        task = Task.objects.filter(board=board).first()
+
+        paths = [
+            'boards/', f'boards/{board.id}/', f'tasks/{task.id}/',
+            'tasks/assigned-to-me/', 'tasks/reviewing/', f'tasks/{task.id}/comments/',
+        ]
+        client = AsyncClient()
+        headers = {'Authorization': f'Token {token.key}'}
+        for path in paths:
+            sync_rate = async_to_sync(self.measure)(client, f'/api/{path}', headers, options)
+            async_rate = async_to_sync(self.measure)(client, f'/api/async/{path}', headers, options)
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: sync {sync_rate:.0f} req/s, async {async_rate:.0f} req/s '
+                f'({async_rate / sync_rate:.2f}x)'
+            ))
+
+    async def measure(self, client, path, headers, options):
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        async def fetch():
+            async with semaphore:
+                response = await client.get(path, headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f'{path}: HTTP {response.status_code}')
+
+        await fetch()
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(options['requests'])))
+        return options['requests'] / (time.perf_counter() - start)
@@ -0,0 +1,131 @@
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from core.databases import postgres_config, sqlite_config
+from kanmind_board_app.models import Board, Comment, Task
+
+
+class Command(BaseCommand):
+    """
+    Vergleicht die Datenbank-Profile aus `core.databases` unter parallelen
+    Schreibzugriffen.
+
+    Pro Profil wird eine eigene Datenbank (SQLite: temporäre Datei) migriert
+    und befüllt. Dann führen `--threads` Threads je `--ops` Operationen aus:
+    Task-Listen lesen oder in einer Transaktion eine Task lesen, einen
+    Kommentar anlegen und die Task-Version erhöhen. Nach jeder Operation
+    wird die Verbindung wie am Ende eines Requests behandelt
+    (`close_if_unusable_or_obsolete`). Gemeldet werden Operationen pro
+    Sekunde, p50/p99 und Fehler wie "database is locked".
+
+    PostgreSQL wird mit `--postgres` gemessen (Verbindungsdaten wie im
+    Profil `postgres`), einmal mit persistenten Verbindungen und einmal mit
+    Connection-Pool. Die Datenbank muss leer sein; sie wird befüllt.
+    """
+    help = 'Vergleicht SQLite (Standard vs. WAL/IMMEDIATE) und optional PostgreSQL unter Last.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--ops', type=int, default=300)
+        parser.add_argument('--write-ratio', type=float, default=0.3)
+        parser.add_argument('--tasks', type=int, default=2000)
+        parser.add_argument('--postgres', action='store_true')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            configs = {
+                'sqlite-basic': sqlite_config(Path(directory) / 'basic.sqlite3', tuned=False),
+                'sqlite': sqlite_config(Path(directory) / 'tuned.sqlite3', tuned=True),
+            }
+            if options['postgres']:
+                configs['postgres-persistent'] = postgres_config()
+                configs['postgres-pool'] = postgres_config({'KANMIND_DB_POOL_MAX_SIZE': str(options['threads'])})
+            for name, config in configs.items():
+                try:
+                    self.measure(name, config, options)
+                except Exception as exc:  # z.B. fehlender Treiber oder Server
+                    self.stdout.write(self.style.WARNING(f'{name}: übersprungen ({exc})'))
+
+    def measure(self, name, config, options):
+        alias = f'bench-{name}'
+        connections.settings[alias] = connections.configure_settings({'default': config})['default']
+        call_command('migrate', database=alias, verbosity=0)
+        board_ids, task_ids, user_id = self.seed(alias, options['tasks'])
+        connections[alias].close()
+
+        results = {'timings': [], 'errors': []}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self.work, args=(alias, seed, board_ids, task_ids, user_id, options, results, lock))
+            for seed in range(options['threads'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        timings = sorted(results['timings'])
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] if timings else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: {len(timings) / elapsed:.0f} ops/s, p50 {statistics.median(timings or [0]):.2f} ms, '
+            f'p99 {p99:.2f} ms, Fehler {len(results["errors"])}'
+        ))
+        if results['errors']:
+            self.stdout.write(f'  z.B. {results["errors"][0]}')
+
+    def seed(self, alias, tasks):
+        rng = random.Random(0)
+        users = User.objects.using(alias).bulk_create(
+            [User(username=f'db-bench-{i}', email=f'db-bench-{i}@example.com') for i in range(20)]
+        )
+        boards = Board.objects.using(alias).bulk_create(
+            [Board(title=f'Board {i}', owner=rng.choice(users)) for i in range(20)]
+        )
+        Membership = Board.members.through
+        Membership.objects.using(alias).bulk_create(
+            [Membership(board_id=board.pk, user_id=board.owner_id) for board in boards]
+        )
+        created = Task.objects.using(alias).bulk_create(
+            [Task(board=rng.choice(boards), title='Task', due_date=date(2030, 1, 1)) for _ in range(tasks)],
+            batch_size=1000,
+        )
+        return [board.pk for board in boards], [task.pk for task in created], users[0].pk
+
+    def work(self, alias, seed, board_ids, task_ids, user_id, options, results, lock):
+        rng = random.Random(seed)
+        connection = connections[alias]
+        timings, errors = [], []
+        for _ in range(options['ops']):
+            start = time.perf_counter()
+            try:
+                if rng.random() < options['write_ratio']:
+                    # Lesen und dann Schreiben in einer Transaktion, wie in den Views.
+                    with transaction.atomic(using=alias):
+                        task = Task.objects.using(alias).get(pk=rng.choice(task_ids))
+                        Comment.objects.using(alias).bulk_create(
+                            [Comment(task=task, author_id=user_id, content='Benchmark')]
+                        )
+                        Task.objects.using(alias).filter(pk=task.pk).bump_version()
+                else:
+                    list(Task.objects.using(alias).filter(board_id=rng.choice(board_ids)).with_details()[:50])
+            except OperationalError as exc:
+                errors.append(str(exc))
+            else:
+                timings.append((time.perf_counter() - start) * 1000)
+            connection.close_if_unusable_or_obsolete()
+        connection.close()
+        with lock:
+            results['timings'].extend(timings)
+            results['errors'].extend(errors)
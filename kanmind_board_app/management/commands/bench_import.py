@@ -0,0 +1,74 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kanmind_board_app.api.serializers import TaskSerializer
+from kanmind_board_app.imports import TaskImporter
+from kanmind_board_app.management.seeding import seed_dataset
+from kanmind_board_app.models import Task
+
+
+class Rollback(Exception):
+    """Wird geworfen, um die Benchmark-Transaktion zurückzurollen."""
+
+
+class Command(BaseCommand):
+    """
+    Benchmark für den Task-Import.
+
+    Erzeugt ein Board mit Mitgliedern und synthetische Importzeilen (mit
+    Assignee/Reviewer per E-Mail) und misst den Durchsatz von `TaskImporter`
+    für mehrere Chunk-Größen. Chunk-Größe 1 entspricht dem zeilenweisen
+    Schreiben. Alles läuft in einer Transaktion, die am Ende zurückgerollt
+    wird; die Datenbank bleibt unverändert.
+    """
+    help = 'Misst den Durchsatz des Task-Imports (Zeilen/s) für verschiedene Chunk-Größen.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20_000)
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[1, 100, 1000, 5000])
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        users, boards = seed_dataset(
+            users=options['users'], boards=1, tasks=0, members_per_board=options['users'],
+        )
+        board = boards[0]
+        owner = next(user for user in users if user.id == board.owner_id)
+        rows = list(self.generate_rows(users, options['rows']))
+
+        for chunk_size in options['chunk_sizes']:
+            sid = transaction.savepoint()
+            start = time.perf_counter()
+            result = TaskImporter(owner, TaskSerializer, board=board, chunk_size=chunk_size).run(rows)
+            elapsed = time.perf_counter() - start
+            transaction.savepoint_rollback(sid)
+            self.stdout.write(self.style.SUCCESS(
+                f'Chunk {chunk_size}: {result.imported} Zeilen in {elapsed:.2f} s '
+                f'({result.imported / elapsed:.0f} Zeilen/s, {result.failed} Fehler)'
+            ))
+
+    def generate_rows(self, users, count, seed=42):
+        rng = random.Random(seed)
+        today = date.today()
+        for number in range(1, count + 1):
+            yield number, {
+                'title': f'Import-Task {number}',
+                'description': 'Importiert für den Benchmark.',
+                'status': rng.choice(Task.Status.values),
+                'priority': rng.choice(Task.Priority.values),
+                'due_date': (today + timedelta(days=rng.randint(0, 365))).isoformat(),
+                'assignee_email': rng.choice(users).email,
+                'reviewer_email': rng.choice(users).email,
+            }
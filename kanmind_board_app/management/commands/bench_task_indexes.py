@@ -0,0 +1,96 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+from kanmind_board_app.management.seeding import seed_dataset
+from kanmind_board_app.models import Board, Task, Comment
+
+
+class Rollback(Exception):
+    """Wird geworfen, um die Benchmark-Transaktion zurückzurollen."""
+
+
+class Command(BaseCommand):
+    """
+    Benchmark für die Task- und Comment-Indizes.
+
+    Erzeugt einen großen Datenbestand, misst die Queries der API-Views mit
+    allen Indizes, entfernt anschließend die Indizes aus `Task.Meta` und
+    `Comment.Meta` und misst erneut. Zu jeder Query wird der EXPLAIN-Plan
+    ausgegeben. Alles läuft in einer Transaktion, die am Ende zurückgerollt
+    wird; die Datenbank bleibt unverändert.
+    """
+    help = 'Misst Task/Comment-Queries mit und ohne Indizes (EXPLAIN + Laufzeiten).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100_000)
+        parser.add_argument('--boards', type=int, default=500)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        self.stdout.write(f"Erzeuge {options['tasks']} Tasks ...")
+        users, boards = seed_dataset(users=options['users'], boards=options['boards'], tasks=options['tasks'])
+        self.analyze()
+
+        user = max(users, key=lambda u: Board.objects.for_user(u).count())
+        board = Board.objects.annotate(task_total=Count('tasks')).order_by('-task_total').first()
+        task = Task.objects.filter(board=board).first()
+        queries = self.build_queries(user, board, task)
+
+        self.report('Mit Indizes', queries, options['repeat'])
+        self.drop_indexes()
+        self.analyze()
+        self.report('Ohne Indizes', queries, options['repeat'])
+
+    def build_queries(self, user, board, task):
+        """Die Queries entsprechen denen in kanmind_board_app/api/views.py."""
+        return {
+            'boards: Liste': lambda: Board.objects.for_user(user),
+            'tasks: erste Seite': lambda: Task.objects.for_user(user).with_details().order_by('id')[:50],
+            'tasks: assigned-to-me': lambda: Task.objects.filter(assignee_id=user).with_details().order_by('id')[:50],
+            'tasks: reviewing': lambda: Task.objects.filter(reviewer_id=user).with_details().order_by('id')[:50],
+            'tasks: board + status': lambda: Task.objects.filter(board=board, status=Task.Status.TO_DO).order_by('id')[:50],
+            'tasks: board + priority': lambda: Task.objects.filter(board=board, priority=Task.Priority.HIGH).order_by('id')[:50],
+            'tasks: due_date-Bereich': lambda: Task.objects.filter(due_date__gte=task.due_date).order_by('due_date', 'id')[:50],
+            'comments: einer Task': lambda: Comment.objects.filter(task=task)[:50],
+        }
+
+    def report(self, title, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n== {title} =='))
+        for name, build in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(self.style.SUCCESS(
+                f'{name}: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms'
+            ))
+            self.stdout.write(build().explain())
+
+    def drop_indexes(self):
+        """Entfernt die in den Meta-Klassen deklarierten Indizes."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in (Task, Comment):
+                for index in model._meta.indexes:
+                    cursor.execute(editor.sql_delete_index % {
+                        'table': editor.quote_name(model._meta.db_table),
+                        'name': editor.quote_name(index.name),
+                    })
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
@@ -0,0 +1,47 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from kanmind_board_app.export import iter_board_records, iter_ndjson
+from kanmind_board_app.models import Board
+
+
+class Command(BaseCommand):
+    """
+    Exportiert Boards mit Tasks und Kommentaren als NDJSON.
+
+    Ohne Optionen werden alle Boards exportiert. Mit --board nur die
+    angegebenen Boards, mit --user alle Boards, bei denen der Benutzer
+    (ID oder E-Mail) Eigentümer oder Mitglied ist.
+    """
+    help = 'Exportiert Boards, Tasks und Kommentare als NDJSON (Standard: stdout).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='Board-ID (mehrfach möglich)')
+        parser.add_argument('--user', help='Benutzer-ID oder E-Mail')
+        parser.add_argument('--output', '-o', help='Zieldatei statt stdout')
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['boards']:
+            boards = boards.filter(pk__in=options['boards'])
+        if options['user']:
+            boards = boards.for_user(self.get_user(options['user']))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for line in iter_ndjson(iter_board_records(boards.values('pk'))):
+                output.write(line)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+
+    def get_user(self, value):
+        lookup = {'pk': int(value)} if value.isdigit() else {'email': value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f'Benutzer {value} nicht gefunden.')
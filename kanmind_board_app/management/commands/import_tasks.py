@@ -0,0 +1,85 @@
+import json
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from kanmind_board_app.api.serializers import TaskSerializer
+from kanmind_board_app.imports import ImportState, TaskImporter, iter_rows
+from kanmind_board_app.models import Board
+
+
+class Command(BaseCommand):
+    """
+    Importiert Boards und Tasks aus einer NDJSON- oder CSV-Datei.
+
+    Das Format wird aus der Dateiendung abgeleitet (oder per --format
+    gesetzt). Mit --checkpoint wird der Fortschritt nach jedem Chunk in
+    eine JSON-Datei geschrieben; ein erneuter Aufruf mit derselben Datei
+    setzt den Import nach der letzten vollständig geschriebenen Zeile fort.
+    """
+    help = 'Importiert Boards und Tasks aus NDJSON/CSV (chunkweise per bulk_create).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='Importierender Benutzer (ID oder E-Mail)')
+        parser.add_argument('--board', type=int, help='Festes Ziel-Board')
+        parser.add_argument('--format', choices=['ndjson', 'csv'])
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help='Datei für Fortschritt/Fortsetzung')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        board = None
+        if options['board']:
+            board = Board.objects.filter(pk=options['board']).first()
+            if board is None:
+                raise CommandError(f"Board {options['board']} nicht gefunden.")
+
+        fmt = options['format'] or ('csv' if options['path'].endswith('.csv') else 'ndjson')
+        state = self.load_checkpoint(options['checkpoint'])
+        started = time.perf_counter()
+        start_row = state.next_row if state else 1
+
+        def progress(current):
+            elapsed = time.perf_counter() - started
+            rate = current.imported / elapsed if elapsed else 0
+            self.stdout.write(
+                f'Zeile {current.next_row - 1}: {current.imported} importiert, '
+                f'{current.failed} Fehler, {rate:.0f} Zeilen/s'
+            )
+            if options['checkpoint']:
+                with open(options['checkpoint'], 'w') as checkpoint:
+                    json.dump(current.checkpoint(), checkpoint)
+
+        if start_row > 1:
+            self.stdout.write(f'Setze Import ab Zeile {start_row} fort.')
+
+        importer = TaskImporter(user, TaskSerializer, board=board, chunk_size=options['chunk_size'], state=state, progress=progress)
+        with open(options['path'], newline='', encoding='utf-8') as stream:
+            result = importer.run(iter_rows(stream, fmt))
+
+        for error in result.errors:
+            self.stderr.write(f"Zeile {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.imported} Tasks importiert, {result.failed} Fehler in {elapsed:.1f} s '
+            f'({result.imported / elapsed if elapsed else 0:.0f} Zeilen/s).'
+        ))
+        if options['checkpoint'] and os.path.exists(options['checkpoint']):
+            os.remove(options['checkpoint'])
+
+    def load_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return None
+        with open(path) as checkpoint:
+            data = json.load(checkpoint)
+        return ImportState(next_row=data['next_row'], board_id=data.get('board_id'))
+
+    def get_user(self, value):
+        lookup = {'pk': int(value)} if value.isdigit() else {'email': value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f'Benutzer {value} nicht gefunden.')
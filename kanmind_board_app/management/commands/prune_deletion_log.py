@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kanmind_board_app.models import DeletionLog
+
+
+class Command(BaseCommand):
+    """
+    Entfernt Grabsteine, die älter als `KANMIND_DELETION_LOG_RETENTION_DAYS`
+    sind. Cursor aus dieser Zeit beantwortet `boards/<pk>/changes/` ohnehin
+    mit 410, die Einträge werden also nicht mehr gebraucht.
+    """
+    help = 'Löscht abgelaufene Einträge aus dem Löschprotokoll des Änderungs-Feeds.'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.KANMIND_DELETION_LOG_RETENTION_DAYS)
+        deleted, _ = DeletionLog.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} Einträge entfernt.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from kanmind_board_app import counters
+
+
+class Command(BaseCommand):
+    """
+    Baut die denormalisierten Board-Zähler neu auf oder prüft sie nur.
+
+    Mit --check werden Abweichungen lediglich gemeldet; der Command endet
+    dann mit einem Fehler, falls Zähler nicht stimmen.
+    """
+    help = 'Prüft und korrigiert member_count, ticket_count, tasks_to_do_count und tasks_high_prio_count.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Nur prüfen, nichts ändern.')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = counters.find_mismatches()
+        else:
+            with transaction.atomic():
+                mismatches = counters.rebuild()
+
+        for board, diff in mismatches:
+            details = ', '.join(f'{field}: {stored} -> {actual}' for field, (stored, actual) in diff.items())
+            self.stdout.write(f'Board {board.pk} ({board.title}): {details}')
+
+        if options['check'] and mismatches:
+            raise CommandError(f'{len(mismatches)} Board(s) mit abweichenden Zählern.')
+        action = 'gefunden' if options['check'] else 'korrigiert'
+        self.stdout.write(self.style.SUCCESS(f'{len(mismatches)} Abweichung(en) {action}.'))
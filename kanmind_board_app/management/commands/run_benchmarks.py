@@ -0,0 +1,89 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+
+from benchmarks import data, runner
+from benchmarks.scenarios import SCENARIOS, build_context
+
+
+class Rollback(Exception):
+    """Wird geworfen, um die Benchmark-Transaktion zurückzurollen."""
+
+
+class Command(BaseCommand):
+    """
+    Lasttest der API mit der Benchmark-Suite (`benchmarks`).
+
+    Erzeugt einen Datenbestand der Größe `--scale` (optional mit eigener
+    Task-Anzahl), führt die Szenarien gegen die echte URLconf aus und
+    schreibt das Ergebnis als JSON (`--output`, Standard: stdout). Mit
+    `--compare` wird die relative Änderung gegenüber einem früheren
+    Ergebnis ausgegeben. Alles läuft in einer Transaktion, die am Ende
+    zurückgerollt wird; die Datenbank bleibt unverändert.
+    """
+    help = 'Lasttest: p50/p95/p99, Requests/s und Queries pro Szenario als JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(data.SCALES), default='small')
+        parser.add_argument('--tasks', type=int, help='Anzahl Tasks (überschreibt --scale)')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+        parser.add_argument('--requests', type=int, default=500, help='Requests pro Szenario')
+        parser.add_argument('--login-requests', type=int, default=50, help='Requests für login_storm (Passwort-Hashing)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='-')
+        parser.add_argument('--compare', help='JSON-Ergebnis eines früheren Laufs')
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unbekannte Szenarien: {", ".join(sorted(unknown))}')
+
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+                result = self.run(names, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+        output = runner.dumps(result)
+        if options['output'] == '-':
+            self.stdout.write(output)
+        else:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+            self.stderr.write(f"Ergebnis in {options['output']}")
+
+        if options['compare']:
+            with open(options['compare']) as file:
+                changes = runner.compare(json.load(file), result)
+            for name, change in changes.items():
+                self.stderr.write(
+                    f"{name}: p50 {change['p50']:+.1f} %, p99 {change['p99']:+.1f} %, rps {change['rps']:+.1f} %"
+                )
+
+    def run(self, names, options):
+        scale = dict(data.SCALES[options['scale']])
+        if options['tasks']:
+            scale['tasks'] = options['tasks']
+        self.stderr.write(f"Erzeuge Datenbestand {scale} ...")
+        start = time.perf_counter()
+        summary = data.generate(seed=options['seed'], **scale)
+        self.stderr.write(f'... fertig in {time.perf_counter() - start:.1f} s')
+        context = build_context()
+
+        scenarios = {}
+        for name in names:
+            requests = options['login_requests'] if name == 'login_storm' else options['requests']
+            self.stderr.write(f'Szenario {name} ({requests} Requests) ...')
+            scenarios[name] = runner.run_scenario(SCENARIOS[name], context, requests, seed=options['seed'])
+            sys.stderr.flush()
+
+        return {
+            'meta': runner.metadata(scale=options['scale'], seed=options['seed'], dataset=summary.as_dict()),
+            'scenarios': scenarios,
+        }
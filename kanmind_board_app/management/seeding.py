@@ -0,0 +1,76 @@
+"""
+Hilfsfunktionen zum Erzeugen großer Testdatenmengen für Benchmark-Commands.
+
+Alle Objekte werden per bulk_create in Chunks geschrieben. Die Daten sind
+über `seed` reproduzierbar.
+"""
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
+
+from kanmind_board_app import counters
+from kanmind_board_app.models import Board, Task, Comment
+
+
+CHUNK_SIZE = 5000
+
+
+def seed_dataset(users=100, boards=500, tasks=100_000, comments_per_task=2, members_per_board=5, seed=42):
+    """
+    Erzeugt Benutzer, Boards (mit Mitgliedern), Tasks und Kommentare.
+
+    Gibt die erzeugten Benutzer und Boards zurück, damit Benchmarks
+    realistische Parameter (z.B. einen Benutzer mit vielen Boards) wählen können.
+    """
+    rng = random.Random(seed)
+    password = make_password('benchmark')
+
+    created_users = User.objects.bulk_create(
+        [
+            User(username=f'bench-user-{i}', email=f'bench-user-{i}@example.com', password=password)
+            for i in range(users)
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+
+    created_boards = Board.objects.bulk_create(
+        [Board(title=f'Board {i}', owner=rng.choice(created_users)) for i in range(boards)],
+        batch_size=CHUNK_SIZE,
+    )
+
+    Membership = Board.members.through
+    memberships = []
+    for board in created_boards:
+        members = {board.owner_id, *(user.id for user in rng.sample(created_users, min(members_per_board, users)))}
+        memberships.extend(Membership(board_id=board.id, user_id=user_id) for user_id in members)
+    Membership.objects.bulk_create(memberships, batch_size=CHUNK_SIZE)
+
+    statuses = Task.Status.values
+    priorities = Task.Priority.values
+    start = date.today()
+    for offset in range(0, tasks, CHUNK_SIZE):
+        chunk = []
+        for _ in range(min(CHUNK_SIZE, tasks - offset)):
+            chunk.append(Task(
+                board=rng.choice(created_boards),
+                title='Benchmark-Task',
+                status=rng.choice(statuses),
+                priority=rng.choice(priorities),
+                assignee_id=rng.choice(created_users),
+                reviewer_id=rng.choice(created_users),
+                due_date=start + timedelta(days=rng.randint(0, 365)),
+            ))
+        created_tasks = Task.objects.bulk_create(chunk)
+        Comment.objects.bulk_create(
+            [
+                Comment(task=task, author=rng.choice(created_users), content='Benchmark-Kommentar')
+                for task in created_tasks
+                for _ in range(comments_per_task)
+            ],
+            batch_size=CHUNK_SIZE,
+        )
+
+    counters.rebuild(Board.objects.filter(pk__range=(created_boards[0].pk, created_boards[-1].pk)))
+    return created_users, created_boards
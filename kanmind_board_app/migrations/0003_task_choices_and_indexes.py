@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+PRIORITIES = ['low', 'medium', 'high']
+
+
+def _canonical(value, allowed):
+    """Bekannte Schreibweisen ('To Do', 'todo', 'in_progress', ' High') auf den Choice-Wert abbilden."""
+    spelled = value.strip().lower().replace('_', '-').replace(' ', '-')
+    spelled = {'todo': 'to-do', 'inprogress': 'in-progress'}.get(spelled, spelled)
+    return spelled if spelled in allowed else None
+
+
+def normalize_choices(apps, schema_editor):
+    """
+    Bildet abweichende Schreibweisen von `status` und `priority` auf die neuen
+    Choices ab. Bricht ab, falls Werte übrig bleiben, die keiner Choice
+    entsprechen; sie müssen vor der Migration von Hand bereinigt werden.
+    """
+    Task = apps.get_model('kanmind_board_app', 'Task')
+    unknown = []
+    for field, allowed in (('status', STATUSES), ('priority', PRIORITIES + [''])):
+        values = Task.objects.exclude(**{f'{field}__in': allowed}).values_list(field, flat=True).distinct()
+        for value in list(values):
+            canonical = _canonical(value, allowed)
+            if canonical is None:
+                ids = Task.objects.filter(**{field: value}).values_list('id', flat=True)
+                unknown.append(f'{field}={value!r} (Tasks {", ".join(map(str, ids))})')
+            else:
+                Task.objects.filter(**{field: value}).update(**{field: canonical})
+    if unknown:
+        raise RuntimeError(
+            'Tasks mit unbekanntem Status bzw. unbekannter Priorität, bitte vor der Migration bereinigen: '
+            + '; '.join(unknown)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanmind_board_app', '0002_task_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_choices, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=models.CharField(blank=True, choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=8),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=models.CharField(choices=[('to-do', 'To do'), ('in-progress', 'In progress'), ('review', 'Review'), ('done', 'Done')], default='to-do', max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', '-created_at'], name='comment_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+        ),
+    ]
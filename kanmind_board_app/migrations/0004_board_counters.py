@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:05
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    """
+    Füllt die neuen Zählerspalten aus den bestehenden Tasks und Mitgliedern.
+    """
+    Board = apps.get_model('kanmind_board_app', 'Board')
+    boards = Board.objects.annotate(
+        computed_member_count=Count('members', distinct=True),
+        computed_ticket_count=Count('tasks', distinct=True),
+        computed_tasks_to_do_count=Count('tasks', filter=Q(tasks__status='to-do'), distinct=True),
+        computed_tasks_high_prio_count=Count('tasks', filter=Q(tasks__priority='high'), distinct=True),
+    )
+    for board in boards.iterator():
+        Board.objects.filter(pk=board.pk).update(
+            member_count=board.computed_member_count,
+            ticket_count=board.computed_ticket_count,
+            tasks_to_do_count=board.computed_tasks_to_do_count,
+            tasks_high_prio_count=board.computed_tasks_high_prio_count,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanmind_board_app', '0003_task_choices_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='ticket_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:15
+
+import kanmind_board_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanmind_board_app', '0004_board_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveBigIntegerField(default=kanmind_board_app.models.new_version, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveBigIntegerField(default=kanmind_board_app.models.new_version, editable=False),
+        ),
+    ]
@@ -1,30 +1,219 @@
+import secrets
+
 from django.db import models
+from django.utils import timezone
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
-class Board(models.Model):
+
+def new_version():
+    """
+    Erzeugt einen neuen Versionsstempel für Board und Task.
+
+    Zufallswerte statt eines Zählers, damit ein vollständiges save() mit
+    einem veralteten In-Memory-Wert nie eine bereits vergebene Version
+    wiederherstellen kann.
+    """
+    return secrets.randbits(62)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    Basis für QuerySets von Modellen mit `version`-Feld.
+    """
+
+    def bump_version(self, **fields):
+        """
+        Vergibt allen Zeilen des QuerySets eine neue Version; weitere
+        Felder (z.B. `updated_at`) werden im selben UPDATE gesetzt.
+        """
+        return self.update(version=new_version(), **fields)
+
+
+class VersionedModel(models.Model):
+    """
+    Abstraktes Modell mit einem Versionsstempel, der bei jedem save() neu
+    vergeben wird. Dient als ETag für bedingte GET-Requests.
+
+    Bei save(update_fields=...) werden `version` und alle `auto_now`-Felder
+    immer mitgeschrieben.
+    """
+    version = models.PositiveBigIntegerField(default=new_version, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.version = new_version()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            touched = {field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)}
+            kwargs['update_fields'] = {*update_fields, 'version', *touched}
+        super().save(*args, **kwargs)
+
+
+class BoardQuerySet(VersionedQuerySet):
+    """
+    QuerySet für Boards mit wiederverwendbaren Filtern und Annotationen.
+    """
+
+    def for_user(self, user):
+        """
+        Boards, bei denen der Benutzer Eigentümer oder Mitglied ist.
+
+        Die Filterung läuft über eine Subquery auf die IDs, damit keine
+        JOIN-bedingten Duplikate entstehen und weitere Annotationen
+        nicht verfälscht werden.
+        """
+        accessible = Board.objects.filter(
+            Q(owner=user) | Q(members=user)
+        ).values('pk')
+        return self.filter(pk__in=accessible)
+
+    def with_computed_counts(self):
+        """
+        Berechnet die Werte der Zählerspalten (siehe `Board.COUNTER_FIELDS`)
+        aus den Tasks und Mitgliedern und annotiert sie mit dem Präfix
+        `computed_`. Wird zum Neuaufbau und zur Prüfung der Zähler verwendet.
+
+        Mitglieder werden über eine korrelierte Subquery gezählt, damit der
+        JOIN auf die Tasks nicht mit der Mitgliederzahl multipliziert wird.
+        """
+        member_count = (
+            Board.members.through.objects
+            .filter(board=OuterRef('pk'))
+            .order_by()
+            .values('board')
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        return self.annotate(
+            computed_member_count=Coalesce(Subquery(member_count, output_field=IntegerField()), 0),
+            computed_ticket_count=Count('tasks'),
+            computed_tasks_to_do_count=Count('tasks', filter=Q(tasks__status=Task.Status.TO_DO)),
+            computed_tasks_high_prio_count=Count('tasks', filter=Q(tasks__priority=Task.Priority.HIGH)),
+        )
+
+    def with_details(self):
+        """
+        Lädt alles, was `BoardDetailSerializer` benötigt, vorab:
+        Owner, Mitglieder und Tasks inklusive Assignee, Reviewer und
+        Kommentaranzahl. Die Anzahl der Queries ist damit unabhängig von
+        der Anzahl der Tasks und Mitglieder.
+        """
+        return self.select_related('owner').prefetch_related(
+            'members',
+            Prefetch('tasks', queryset=Task.objects.with_details().order_by('pk')),
+        )
+
+
+class Board(VersionedModel):
     title = models.TextField(max_length=255)
     members = models.ManyToManyField(User, related_name='boards')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_boards')
+    # Titel, Eigentümer oder Mitglieder zuletzt geändert (siehe kanmind_board_app.changes).
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Denormalisierte Zähler, gepflegt über kanmind_board_app.counters.
+    member_count = models.PositiveIntegerField(default=0)
+    ticket_count = models.PositiveIntegerField(default=0)
+    tasks_to_do_count = models.PositiveIntegerField(default=0)
+    tasks_high_prio_count = models.PositiveIntegerField(default=0)
+
+    COUNTER_FIELDS = ['member_count', 'ticket_count', 'tasks_to_do_count', 'tasks_high_prio_count']
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Merkt sich den geladenen Eigentümer, damit Signal-Handler einen
+        Eigentümerwechsel erkennen können (siehe kanmind_board_app.signals).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
+
+class TaskQuerySet(VersionedQuerySet):
+    """
+    QuerySet für Tasks mit den Joins und Annotationen der Detail-Serializer.
+    """
+
+    def with_details(self):
+        """
+        Lädt Assignee und Reviewer per JOIN und annotiert comments_count,
+        damit `TaskDetailSerializer` pro Task keine weiteren Queries auslöst.
+
+        Die Kommentaranzahl wird als korrelierte Subquery berechnet statt
+        per GROUP BY, damit paginierte Listen nur die Zeilen der aktuellen
+        Seite aggregieren.
+        """
+        comments_count = (
+            Comment.objects
+            .filter(task=OuterRef('pk'))
+            .order_by()
+            .values('task')
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        return self.select_related('assignee_id', 'reviewer_id').annotate(
+            comments_count=Coalesce(Subquery(comments_count, output_field=IntegerField()), 0)
+        )
+
+    def for_user(self, user):
+        """
+        Tasks aus Boards, bei denen der Benutzer Eigentümer oder Mitglied ist.
+        """
+        return self.filter(board__in=Board.objects.for_user(user).values('pk'))
+
+
+class Task(VersionedModel):
+
+    class Status(models.TextChoices):
+        TO_DO = 'to-do', 'To do'
+        IN_PROGRESS = 'in-progress', 'In progress'
+        REVIEW = 'review', 'Review'
+        DONE = 'done', 'Done'
+
+    class Priority(models.TextChoices):
+        LOW = 'low', 'Low'
+        MEDIUM = 'medium', 'Medium'
+        HIGH = 'high', 'High'
 
-class Task(models.Model):
     title = models.TextField(max_length=255)
     description = models.TextField(max_length=100, blank=True)
-    status = models.TextField(max_length=20, default='to-do')
-    priority = models.TextField(max_length=20, blank=True)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.TO_DO)
+    priority = models.CharField(max_length=8, choices=Priority.choices, blank=True)
     reviewer_id = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="review_tasks")
     assignee_id = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="assigned_tasks")
     due_date = models.DateField()
     board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tasks')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta(VersionedModel.Meta):
+        indexes = [
+            models.Index(fields=['assignee_id', 'id'], name='task_assignee_id_idx'),
+            models.Index(fields=['reviewer_id', 'id'], name='task_reviewer_id_idx'),
+            models.Index(fields=['board', 'due_date', 'id'], name='task_board_due_date_idx'),
+            models.Index(fields=['due_date', 'id'], name='task_due_date_idx'),
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['board', 'updated_at'], name='task_board_updated_idx'),
+        ]
 
 
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True, related_name="comments")
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
 
     def __str__(self):
@@ -37,4 +226,32 @@ class Comment(models.Model):
         return f"{author_name}: {self.content[:20]}"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['task', '-created_at', '-id'], name='comment_task_created_idx'),
+            models.Index(fields=['task', 'updated_at'], name='comment_task_updated_idx'),
+        ]
+
+
+class DeletionLog(models.Model):
+    """
+    Grabsteine gelöschter Tasks und Kommentare für `boards/<pk>/changes/`.
+
+    Einträge werden von den Signal-Handlern geschrieben und nach
+    `KANMIND_DELETION_LOG_RETENTION_DAYS` per `prune_deletion_log` entfernt.
+    """
+
+    class Kind(models.TextChoices):
+        TASK = 'task', 'Task'
+        COMMENT = 'comment', 'Comment'
+
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='deletions')
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'deleted_at'], name='deletion_board_time_idx'),
+            models.Index(fields=['deleted_at'], name='deletion_time_idx'),
+        ]
\ No newline at end of file
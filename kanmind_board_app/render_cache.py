@@ -0,0 +1,84 @@
+"""
+Prozesslokaler Cache für die gerenderte JSON-Antwort der Board-Detailansicht.
+
+Die Antwort von `BoardSingleView.get` hängt nicht vom anfragenden Benutzer
+ab, sondern nur vom Board und seiner Version. Gespeichert werden daher die
+fertig gerenderten Bytes je Board zusammen mit der Version, aus der sie
+erzeugt wurden. Ein Eintrag wird nur ausgeliefert, wenn die Version noch
+stimmt; die Signal-Handler entfernen veraltete Einträge zusätzlich sofort.
+
+Der Cache ist nach Gesamtgröße (`KANMIND_BOARD_RENDER_CACHE_MAX_BYTES`)
+begrenzt und verdrängt die am längsten nicht gelesenen Boards zuerst.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class BoardRenderCache:
+    """
+    LRU-Cache `board_id -> (version, bytes)` mit Obergrenze in Bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, board_id, version):
+        with self._lock:
+            entry = self._entries.get(board_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(board_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, board_id, version, content):
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(board_id)
+            self._entries[board_id] = (version, content)
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def evict(self, board_ids):
+        with self._lock:
+            for board_id in board_ids:
+                self._discard(board_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, board_id):
+        entry = self._entries.pop(board_id, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+board_render_cache = BoardRenderCache(settings.KANMIND_BOARD_RENDER_CACHE_MAX_BYTES)
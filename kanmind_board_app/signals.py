@@ -0,0 +1,198 @@
+"""
+Signal-Handler, die abgeleitete Daten (Caches, Versionsstempel) aktuell halten.
+
+Die Handler werden in `KanmindBoardAppConfig.ready()` registriert.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db.models import Q, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from kanmind_board_app import access_cache, counters
+from kanmind_board_app.render_cache import board_render_cache
+from kanmind_board_app.models import Board, Task, Comment, DeletionLog
+
+
+# Felder, die `UserSerialiser` bzw. die Kommentar-Autoren ausliefern.
+SERIALIZED_USER_FIELDS = {'username', 'email', 'first_name', 'last_name'}
+
+_bulk_task_deletion = ContextVar('kanmind_bulk_task_deletion', default=False)
+
+
+@contextmanager
+def bulk_task_deletion():
+    """
+    Schaltet die Handler pro gelöschter Task (Board-Version, Grabstein) im
+    Block ab. Der Aufrufer schreibt beides gesammelt, siehe `api.bulk`.
+    """
+    token = _bulk_task_deletion.set(True)
+    try:
+        yield
+    finally:
+        _bulk_task_deletion.reset(token)
+
+
+def _origin_model(origin):
+    """Modellklasse, deren delete() eine (kaskadierende) Löschung ausgelöst hat."""
+    if isinstance(origin, QuerySet):
+        return origin.model
+    return type(origin) if origin is not None else None
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def invalidate_access_on_member_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Mitglieder hinzugefügt, entfernt oder geleert.
+
+    Bei `board.members` sind die betroffenen Benutzer in `pk_set`, bei der
+    Rückrichtung (`user.boards`) ist `instance` der Benutzer.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        access_cache.invalidate([instance.pk])
+    elif action == 'pre_clear':
+        access_cache.invalidate(instance.members.values_list('pk', flat=True))
+    else:
+        access_cache.invalidate(pk_set)
+
+
+@receiver(post_save, sender=Board)
+def invalidate_access_on_owner_change(sender, instance, created, **kwargs):
+    """Neues Board oder geänderter Eigentümer."""
+    previous_owner_id = getattr(instance, '_loaded_owner_id', None)
+    if created or previous_owner_id != instance.owner_id:
+        access_cache.invalidate([instance.owner_id, previous_owner_id])
+        instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(pre_delete, sender=Board)
+def invalidate_access_on_board_delete(sender, instance, **kwargs):
+    """Board gelöscht: Eigentümer und alle Mitglieder verlieren den Zugriff."""
+    access_cache.invalidate([instance.owner_id, *instance.members.values_list('pk', flat=True)])
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def bump_version_on_member_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Geänderte Mitglieder ändern die Board-Detailansicht und den Änderungs-Feed."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    board_ids = pk_set if reverse else [instance.pk]
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).bump_version(updated_at=timezone.now())
+        board_render_cache.evict(board_ids)
+
+
+@receiver(post_save, sender=User)
+def bump_versions_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Name oder E-Mail eines Benutzers stehen verschachtelt in Board-, Task-
+    und Kommentaransichten; deren Versionen (ETag, Render-Cache,
+    Änderungs-Feed) müssen sich mit ändern. Andere Felder (z.B.
+    `last_login`) kosten keine Query.
+    """
+    if created or (update_fields is not None and not SERIALIZED_USER_FIELDS & set(update_fields)):
+        return
+    task_ids = set(
+        Task.objects.filter(
+            Q(assignee_id=instance) | Q(reviewer_id=instance) | Q(comments__author=instance)
+        ).values_list('pk', flat=True)
+    )
+    board_ids = set(
+        Board.objects.filter(Q(owner=instance) | Q(members=instance) | Q(tasks__pk__in=task_ids))
+        .values_list('pk', flat=True)
+    )
+    now = timezone.now()
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).bump_version(updated_at=now)
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).bump_version(updated_at=now)
+        board_render_cache.evict(board_ids)
+
+
+@receiver(pre_delete, sender=User)
+def remember_memberships(sender, instance, **kwargs):
+    """
+    Beim Löschen eines Benutzers entfernt die Kaskade seine Mitgliedschaften
+    ohne `m2m_changed`; die Boards werden für `update_member_counts` gemerkt.
+    """
+    instance._member_board_ids = list(
+        Board.members.through.objects.filter(user_id=instance.pk).values_list('board_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def update_member_counts(sender, instance, **kwargs):
+    """`member_count`, Version und gerenderte Ansicht der Boards des gelöschten Benutzers."""
+    board_ids = getattr(instance, '_member_board_ids', None)
+    if not board_ids:
+        return
+    for board in Board.objects.filter(pk__in=board_ids).only('pk'):
+        counters.members_changed(board)
+    Board.objects.filter(pk__in=board_ids).bump_version(updated_at=timezone.now())
+    board_render_cache.evict(board_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_version_on_task_change(sender, instance, origin=None, **kwargs):
+    """
+    Jede Task-Änderung ändert die Detailansicht ihres Boards.
+
+    Beim kaskadierenden Löschen eines Boards (`origin` ist dann das Board)
+    gibt es nichts mehr zu versionieren.
+    """
+    if _origin_model(origin) is Board or _bulk_task_deletion.get():
+        return
+    Board.objects.filter(pk=instance.board_id).bump_version()
+    board_render_cache.evict([instance.board_id])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_version_on_comment_change(sender, instance, origin=None, **kwargs):
+    """
+    Kommentare ändern die Kommentaranzahl von Task und Board-Ansicht; die
+    Task gilt damit auch im Änderungs-Feed als geändert.
+
+    Kaskadierende Löschungen (Task oder Board gelöscht) werden übersprungen,
+    die Versionen setzt dann der Handler der auslösenden Löschung.
+    """
+    if instance.task_id is None or _origin_model(origin) in (Task, Board):
+        return
+    board_id = instance.task.board_id
+    Task.objects.filter(pk=instance.task_id).bump_version(updated_at=timezone.now())
+    Board.objects.filter(pk=board_id).bump_version()
+    board_render_cache.evict([board_id])
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def evict_rendered_board(sender, instance, **kwargs):
+    """Titel- oder Eigentümeränderung bzw. gelöschtes Board."""
+    board_render_cache.evict([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def log_task_deletion(sender, instance, origin=None, **kwargs):
+    """Grabstein für `boards/<pk>/changes/` (nicht bei gelöschtem Board)."""
+    if _origin_model(origin) is Board or _bulk_task_deletion.get():
+        return
+    DeletionLog.objects.create(board_id=instance.board_id, kind=DeletionLog.Kind.TASK, object_id=instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def log_comment_deletion(sender, instance, origin=None, **kwargs):
+    """
+    Grabstein für einzeln gelöschte Kommentare. Kommentare einer gelöschten
+    Task entfernen Clients zusammen mit der Task.
+    """
+    if instance.task_id is None or _origin_model(origin) in (Task, Board):
+        return
+    DeletionLog.objects.create(
+        board_id=instance.task.board_id, kind=DeletionLog.Kind.COMMENT, object_id=instance.pk,
+    )
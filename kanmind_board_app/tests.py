@@ -1,3 +1,1178 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import time
+from datetime import date
+from importlib import import_module
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.template.response import SimpleTemplateResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from benchmarks import data, runner
+from benchmarks.scenarios import SCENARIOS, build_context
+from core.databases import database_config, sqlite_config
+from core.middleware import QueryBudgetMiddleware
+from core.routers import ReplicaRouter
+from core.testing import QueryBudgetMixin, api_routes
+from . import counters, events
+from .access import BoardAccess
+from .api.serializers import TaskSerializer, TaskSerializerWithOutBoard
+from .imports import ImportState, TaskImporter, iter_rows
+from .models import Board, Comment, DeletionLog, Task
+from .render_cache import board_render_cache
+from user_auth_app.token_cache import token_cache
+
+
+class KanMindTestCase(APITestCase):
+    """
+    Basisklasse, die die prozesslokalen Caches vor jedem Test leert.
+    """
+
+    def setUp(self):
+        cache.clear()
+        board_render_cache.clear()
+        events.get_broker().clear()
+        token_cache.clear()
+        super().setUp()
+
+
+class BoardListQueryTests(KanMindTestCase):
+    """
+    Die Board-Liste muss unabhängig von der Anzahl der Boards mit einer
+    konstanten Anzahl an Queries auskommen.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.other = User.objects.create_user(username='member', email='member@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def create_board(self, title, members=()):
+        board = Board.objects.create(title=title, owner=self.user)
+        board.members.set([self.user, *members])
+        Task.objects.create(board=board, title='a', status='to-do', priority='high', due_date=date.today())
+        Task.objects.create(board=board, title='b', status='done', priority='low', due_date=date.today())
+        counters.rebuild(Board.objects.filter(pk=board.pk))
+        return board
+
+    def test_board_list_counts(self):
+        self.create_board('Board', members=[self.other])
+
+        response = self.client.get('/api/boards/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{
+            'id': response.json()[0]['id'],
+            'title': 'Board',
+            'member_count': 2,
+            'ticket_count': 2,
+            'tasks_to_do_count': 1,
+            'tasks_high_prio_count': 1,
+            'owner_id': self.user.id,
+        }])
+
+    def test_board_counters_follow_api_writes(self):
+        board_id = self.client.post('/api/boards/', {'title': 'API', 'members': [self.other.id]}).json()['id']
+        task_id = self.client.post('/api/tasks/', {
+            'board': board_id, 'title': 'a', 'status': 'to-do', 'priority': 'high', 'due_date': '2030-01-01',
+        }).json()['id']
+        self.client.post('/api/tasks/', {
+            'board': board_id, 'title': 'b', 'status': 'to-do', 'priority': 'low', 'due_date': '2030-01-01',
+        })
+        self.client.patch(f'/api/tasks/{task_id}/', {'status': 'done'})
+        self.client.patch(f'/api/boards/{board_id}/', {'members': [self.user.id]})
+
+        board = Board.objects.get(pk=board_id)
+        self.assertEqual(
+            [board.member_count, board.ticket_count, board.tasks_to_do_count, board.tasks_high_prio_count],
+            [1, 2, 1, 1],
+        )
+
+        self.client.delete(f'/api/tasks/{task_id}/')
+        board.refresh_from_db()
+        self.assertEqual([board.ticket_count, board.tasks_high_prio_count], [1, 0])
+        self.assertEqual(counters.find_mismatches(), [])
+
+    def test_counters_survive_a_concurrent_task_update(self):
+        board = self.create_board('Board')
+        task = Task.objects.get(board=board, title='a')
+        is_valid = TaskSerializerWithOutBoard.is_valid
+
+        def concurrent_update(serializer, *args, **kwargs):
+            # Ein anderer Request ändert die Task, nachdem dieser sie gelesen hat.
+            Task.objects.filter(pk=task.pk).update(status='done')
+            counters.task_changed(Task(board=board, status='done', priority='high'), 'to-do', 'high')
+            return is_valid(serializer, *args, **kwargs)
+
+        with mock.patch.object(TaskSerializerWithOutBoard, 'is_valid', concurrent_update):
+            response = self.client.patch(f'/api/tasks/{task.id}/', {'status': 'review'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(counters.find_mismatches(), [])
+
+    def test_deleting_a_user_updates_member_counts(self):
+        board = self.create_board('Board', members=[self.other])
+        board.refresh_from_db()
+        version = board.version
+
+        self.other.delete()
+
+        board.refresh_from_db()
+        self.assertEqual(board.member_count, 1)
+        self.assertNotEqual(board.version, version)
+        self.assertEqual(counters.find_mismatches(), [])
+
+    def test_board_list_query_count_is_constant(self):
+        self.create_board('Erstes Board')
+        with self.assertNumQueries(3):
+            self.client.get('/api/boards/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/boards/')
+
+        for i in range(10):
+            self.create_board(f'Board {i}', members=[self.other])
+        self.client.get('/api/boards/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/boards/')
+        self.assertEqual(len(response.json()), 11)
+
+
+class BoardDetailQueryTests(KanMindTestCase):
+    """
+    Die Board-Detailansicht muss unabhängig von der Anzahl der Tasks,
+    Mitglieder und Kommentare mit einer festen Anzahl an Queries rendern.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.members = [
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', password='pw')
+            for i in range(3)
+        ]
+        token = Token.objects.create(user=self.members[0])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user, *self.members])
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                board=self.board, title=f'Task {i}', due_date=date.today(),
+                assignee_id=self.members[i % 3], reviewer_id=self.user,
+            )
+            Comment.objects.create(task=task, author=self.user, content='Kommentar')
+
+    def test_board_detail_payload(self):
+        self.create_tasks(1)
+
+        response = self.client.get(f'/api/boards/{self.board.id}/')
+
+        task = response.json()['tasks'][0]
+        self.assertEqual(task['assignee']['id'], self.members[0].id)
+        self.assertEqual(task['reviewer']['email'], 'owner@example.com')
+        self.assertEqual(task['comments_count'], 1)
+        self.assertEqual(len(response.json()['members']), 4)
+
+    def test_board_detail_query_count_is_constant(self):
+        self.create_tasks(1)
+        self.client.get(f'/api/boards/{self.board.id}/')
+        board_render_cache.clear()
+        with self.assertNumQueries(4):
+            self.client.get(f'/api/boards/{self.board.id}/')
+
+        self.create_tasks(20)
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(len(response.json()['tasks']), 21)
+
+    def test_board_detail_is_served_from_render_cache(self):
+        self.create_tasks(2)
+        first = self.client.get(f'/api/boards/{self.board.id}/')
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual(cached['ETag'], first['ETag'])
+
+        self.create_tasks(1)
+        response = self.client.get(f'/api/boards/{self.board.id}/')
+        self.assertEqual(len(response.json()['tasks']), 3)
+
+    def test_renamed_user_invalidates_board_and_task_views(self):
+        self.create_tasks(1)
+        task = Task.objects.get(board=self.board)
+        first = self.client.get(f'/api/boards/{self.board.id}/')
+        task_etag = self.client.get(f'/api/tasks/{task.id}/')['ETag']
+
+        self.user.email = 'neu@example.com'
+        self.user.save(update_fields=['email'])
+
+        response = self.client.get(f'/api/boards/{self.board.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tasks'][0]['reviewer']['email'], 'neu@example.com')
+        self.assertNotEqual(self.client.get(f'/api/tasks/{task.id}/')['ETag'], task_etag)
+
+        # Nur das UPDATE selbst.
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['last_login'])
+
+
+class TaskListTests(KanMindTestCase):
+    """
+    Task-Listen sind paginiert, filterbar und auf die Boards des Benutzers beschränkt.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        foreign_board = Board.objects.create(title='Fremd', owner=self.stranger)
+        Task.objects.create(board=foreign_board, title='fremd', due_date=date(2030, 1, 1))
+
+    def create_tasks(self, count, **kwargs):
+        for i in range(count):
+            Task.objects.create(board=self.board, title=f'Task {i}', due_date=date(2030, 1, 1 + i % 28), **kwargs)
+
+    def test_task_list_is_paginated_and_scoped_to_user(self):
+        self.create_tasks(5)
+
+        response = self.client.get('/api/tasks/?page_size=2')
+        titles = [task['title'] for task in response.json()['results']]
+        next_page = self.client.get(response.json()['next'])
+
+        self.assertEqual(titles, ['Task 0', 'Task 1'])
+        self.assertEqual(next_page.json()['results'][0]['title'], 'Task 2')
+        self.assertNotIn('fremd', [task['title'] for task in next_page.json()['results']])
+
+    def test_task_list_filters(self):
+        self.create_tasks(3, status='done', priority='high')
+        self.create_tasks(2, status='to-do', priority='low')
+
+        response = self.client.get('/api/tasks/', {
+            'board': self.board.id, 'status': 'to-do', 'due_date_before': '2030-01-01',
+        })
+
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(self.client.get('/api/tasks/', {'due_date_after': 'gestern'}).status_code, 400)
+
+    def test_unknown_status_and_priority_are_rejected(self):
+        self.create_tasks(1)
+        task = Task.objects.get(board=self.board)
+
+        for payload in ({'status': 'archived'}, {'priority': 'urgent'}):
+            response = self.client.post('/api/tasks/', {
+                'board': self.board.id, 'title': 'x', 'due_date': '2030-01-01', **payload,
+            }, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(next(iter(payload)), response.json())
+            self.assertEqual(self.client.patch(f'/api/tasks/{task.id}/', payload, format='json').status_code, 400)
+
+    def test_choice_migration_maps_legacy_spellings_and_aborts_on_unknown(self):
+        migration = import_module('kanmind_board_app.migrations.0003_task_choices_and_indexes')
+        self.create_tasks(3)
+        first, second, third = Task.objects.filter(board=self.board).order_by('id')
+        Task.objects.filter(pk=first.pk).update(status='In Progress', priority=' High')
+        Task.objects.filter(pk=second.pk).update(status='todo')
+
+        migration.normalize_choices(apps, None)
+
+        self.assertEqual(
+            list(Task.objects.filter(board=self.board).order_by('id').values_list('status', 'priority')),
+            [('in-progress', 'high'), ('to-do', ''), ('to-do', '')],
+        )
+        Task.objects.filter(pk=third.pk).update(status='archived')
+        with self.assertRaisesMessage(RuntimeError, f"status='archived' (Tasks {third.pk})"):
+            migration.normalize_choices(apps, None)
+        self.assertEqual(Task.objects.get(pk=third.pk).status, 'archived')
+
+    def test_task_list_query_count_is_constant(self):
+        self.create_tasks(3, assignee_id=self.user)
+        with self.assertNumQueries(2):
+            self.client.get('/api/tasks/assigned-to-me/')
+
+        self.create_tasks(30, assignee_id=self.user, reviewer_id=self.stranger)
+        with self.assertNumQueries(1):
+            self.client.get('/api/tasks/assigned-to-me/?ordering=-due_date')
+
+
+class BoardAccessTests(KanMindTestCase):
+    """
+    Mitgliedschaften werden pro Request nur einmal abgefragt.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(board=self.board, title='Task', due_date=date.today())
+
+    def authenticate(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_board_access_is_memoized(self):
+        access = BoardAccess(self.user, preload=True)
+        with self.assertNumQueries(1):
+            self.assertTrue(access.can_access(self.board.id))
+            self.assertTrue(access.is_owner(self.board.id))
+            self.assertFalse(access.can_access(self.board.id + 1))
+
+    def test_task_detail_requires_membership(self):
+        self.authenticate(self.stranger)
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task.id}/').status_code, 403)
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task.id}/comments/').status_code, 403)
+        response = self.client.post('/api/tasks/', {'board': self.board.id, 'title': 'x', 'due_date': '2030-01-01'})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post('/api/tasks/', {'board': 9999, 'title': 'x', 'due_date': '2030-01-01'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_comment_list_checks_membership_once(self):
+        self.authenticate(self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_cached_access_costs_no_queries(self):
+        BoardAccess(self.user).board_ids()
+        with self.assertNumQueries(0):
+            self.assertTrue(BoardAccess(self.user).can_access(self.board.id))
+
+    def test_cached_access_is_invalidated_on_member_change(self):
+        self.assertFalse(BoardAccess(self.stranger).can_access(self.board.id))
+        self.board.members.add(self.stranger)
+        self.assertTrue(BoardAccess(self.stranger).can_access(self.board.id))
+        self.board.members.clear()
+        self.assertFalse(BoardAccess(self.stranger).can_access(self.board.id))
+        self.assertTrue(BoardAccess(self.user).is_owner(self.board.id))
+
+        self.board.owner = self.stranger
+        self.board.save()
+        self.assertFalse(BoardAccess(self.user).is_owner(self.board.id))
+        self.assertTrue(BoardAccess(self.stranger).is_owner(self.board.id))
+
+    def test_process_local_cache_limits_stale_access_on_other_workers(self):
+        # Zwei Worker mit je eigenem LocMemCache: die Invalidierung erreicht
+        # nur den Worker, der die Änderung verarbeitet.
+        workers = {
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+            for alias in ('worker-a', 'worker-b')
+        }
+        self.board.members.add(self.stranger)
+        with self.settings(CACHES={**settings.CACHES, **workers}, KANMIND_BOARD_ACCESS_CACHE='worker-b'):
+            self.assertTrue(BoardAccess(self.stranger).can_access(self.board.id))
+            with self.settings(KANMIND_BOARD_ACCESS_CACHE='worker-a'):
+                self.board.members.remove(self.stranger)
+            self.assertTrue(BoardAccess(self.stranger).can_access(self.board.id))
+
+            expired = time.time() + settings.KANMIND_BOARD_ACCESS_CACHE_LOCAL_TIMEOUT + 1
+            with mock.patch('time.time', return_value=expired):
+                self.assertFalse(BoardAccess(self.stranger).can_access(self.board.id))
+
+        self.board.delete()
+        self.assertEqual(BoardAccess(self.stranger).board_ids(), frozenset())
+
+
+class ConditionalGetTests(KanMindTestCase):
+    """
+    Board-, Task- und Kommentaransichten beantworten If-None-Match mit 304.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(board=self.board, title='Task', due_date=date.today())
+
+    def test_not_modified_until_board_content_changes(self):
+        url = f'/api/boards/{self.board.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        Comment.objects.create(task=self.task, author=self.user, content='Neu')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_task_and_comments_etags(self):
+        for url in (f'/api/tasks/{self.task.id}/', f'/api/tasks/{self.task.id}/comments/'):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            self.client.patch(f'/api/tasks/{self.task.id}/', {'title': f'Neu {url}'})
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class TaskBulkTests(KanMindTestCase):
+    """
+    tasks/bulk/ schreibt einen Stapel in einer Transaktion oder gar nicht.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.foreign_board = Board.objects.create(title='Fremd', owner=self.stranger)
+        self.task = Task.objects.create(board=self.board, title='Alt', status='to-do', due_date=date.today())
+        self.doomed = Task.objects.create(board=self.board, title='Weg', due_date=date.today())
+        counters.rebuild()
+
+    def new_task(self, **kwargs):
+        return {'board': self.board.id, 'title': 'Neu', 'due_date': '2030-01-01', 'assignee_id': self.user.id, **kwargs}
+
+    def test_bulk_create_update_delete(self):
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [self.new_task(priority='high') for _ in range(5)],
+            'update': [{'id': self.task.id, 'status': 'done'}],
+            'delete': [self.doomed.id],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.json()['create']], [201] * 5)
+        self.assertEqual(response.json()['update'][0]['task']['status'], 'done')
+        self.assertFalse(Task.objects.filter(pk=self.doomed.pk).exists())
+        self.assertEqual(counters.find_mismatches(), [])
+
+    def test_invalid_item_rolls_back_batch(self):
+        response = self.client.post('/api/tasks/bulk/', {
+            'create': [self.new_task(), self.new_task(board=self.foreign_board.id), self.new_task(status='nope')],
+            'delete': [999999],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([item['status'] for item in response.json()['create']], [424, 403, 400])
+        self.assertEqual(response.json()['delete'][0]['status'], 404)
+        self.assertEqual(Task.objects.filter(board=self.board).count(), 2)
+
+    def batch(self, size):
+        tasks = Task.objects.bulk_create(
+            Task(board=self.board, title='Alt', due_date=date.today()) for _ in range(2 * size)
+        )
+        Comment.objects.bulk_create(Comment(task=task, author=self.user, content='Hallo') for task in tasks)
+        counters.rebuild()
+        return {
+            'create': [self.new_task() for _ in range(size)],
+            'update': [{'id': task.pk, 'status': 'done'} for task in tasks[:size]],
+            'delete': [task.pk for task in tasks[size:]],
+        }
+
+    def test_bulk_query_count_does_not_grow_with_batch(self):
+        self.client.post('/api/tasks/bulk/', self.batch(3), format='json')
+        payload = self.batch(3)
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.client.post('/api/tasks/bulk/', payload, format='json').status_code, 200)
+        payload = self.batch(30)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self.client.post('/api/tasks/bulk/', payload, format='json').status_code, 200)
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(DeletionLog.objects.filter(board=self.board, kind=DeletionLog.Kind.TASK).count(), 36)
+
+
+class BoardExportTests(KanMindTestCase):
+    """
+    Der NDJSON-Export streamt Boards, Tasks und Kommentare zeilenweise.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        task = Task.objects.create(board=self.board, title='Task', due_date=date(2030, 1, 1))
+        Comment.objects.create(task=task, author=self.user, content='Hallo')
+
+    def read_records(self, response):
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_export_board(self):
+        response = self.client.get(f'/api/boards/{self.board.id}/export/')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = self.read_records(response)
+        self.assertEqual([record['type'] for record in records], ['board', 'task', 'comment'])
+        self.assertEqual(records[0]['members'], [self.user.id])
+        self.assertEqual(records[1]['due_date'], '2030-01-01')
+
+    def test_export_is_limited_to_own_boards(self):
+        foreign = Board.objects.create(title='Fremd', owner=self.stranger)
+
+        self.assertEqual(self.client.get(f'/api/boards/{foreign.id}/export/').status_code, 403)
+        records = self.read_records(self.client.get('/api/boards/export/'))
+        self.assertEqual({record['id'] for record in records if record['type'] == 'board'}, {self.board.id})
+
+
+class TaskImportTests(KanMindTestCase):
+    """
+    Der Import validiert Zeilen einzeln, schreibt gültige Zeilen chunkweise
+    und lässt sich nach einem Abbruch fortsetzen.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.member = User.objects.create_user(username='member', email='member@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user, self.member])
+
+    def test_import_csv_upload(self):
+        content = (
+            'title,status,priority,due_date,assignee_email\n'
+            'Eins,to-do,high,2030-01-01,member@example.com\n'
+            'Zwei,unbekannt,low,2030-01-02,\n'
+            'Drei,done,low,2030-01-03,niemand@example.com\n'
+        )
+        upload = SimpleUploadedFile('tasks.csv', content.encode())
+
+        response = self.client.post(f'/api/boards/{self.board.id}/import/', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['imported'], 1)
+        self.assertEqual([error['row'] for error in response.json()['errors']], [2, 3])
+        task = Task.objects.get(board=self.board)
+        self.assertEqual(task.assignee_id, self.member)
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.ticket_count, self.board.tasks_high_prio_count), (1, 1))
+
+    def test_import_requires_membership(self):
+        foreign = Board.objects.create(title='Fremd', owner=self.member)
+        upload = SimpleUploadedFile('tasks.ndjson', b'{"title": "x", "status": "to-do", "due_date": "2030-01-01"}\n')
+
+        response = self.client.post(f'/api/boards/{foreign.id}/import/', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_import_board_records_and_resume(self):
+        lines = [
+            {'type': 'board', 'title': 'Neu', 'members': ['member@example.com']},
+            *({'title': f'T{i}', 'status': 'to-do', 'due_date': '2030-01-01'} for i in range(5)),
+        ]
+        rows = list(iter_rows(io.StringIO('\n'.join(json.dumps(line) for line in lines)), 'ndjson'))
+        checkpoints = []
+        TaskImporter(self.user, TaskSerializer, chunk_size=2, progress=lambda state: checkpoints.append(state.checkpoint())).run(rows[:3])
+
+        state = ImportState(**checkpoints[-1])
+        result = TaskImporter(self.user, TaskSerializer, chunk_size=2, state=state).run(rows)
+
+        board = Board.objects.get(title='Neu')
+        self.assertEqual(state.next_row, 7)
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(Task.objects.filter(board=board).count(), 5)
+        self.assertEqual(set(board.members.all()), {self.user, self.member})
+
+    def test_board_record_members_must_be_a_list_of_emails(self):
+        lines = [
+            {'type': 'board', 'title': 'Text', 'members': 'member@example.com'},
+            {'type': 'board', 'title': 'Zahl', 'members': 5},
+            {'type': 'board', 'title': 'Gemischt', 'members': ['member@example.com', 5]},
+        ]
+        rows = iter_rows(io.StringIO('\n'.join(json.dumps(line) for line in lines)), 'ndjson')
+
+        state = TaskImporter(self.user, TaskSerializer).run(rows)
+
+        self.assertEqual([error['row'] for error in state.errors], [1, 2, 3])
+        self.assertEqual({tuple(error['errors']) for error in state.errors}, {('members',)})
+        self.assertFalse(Board.objects.filter(title__in=['Text', 'Zahl', 'Gemischt']).exists())
+
+
+class AsyncReadViewTests(KanMindTestCase):
+    """
+    Die async Lese-Endpunkte unter api/async/ liefern dieselben Daten und
+    Statuscodes wie die synchronen Views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(
+            board=self.board, title='Task', assignee_id=self.user, due_date=date(2030, 1, 1)
+        )
+        Comment.objects.create(task=self.task, author=self.user, content='Hallo')
+        counters.rebuild(Board.objects.filter(pk=self.board.pk))
+
+    async def async_get(self, path, **headers):
+        return await self.async_client.get(path, headers={'Authorization': f'Token {self.token.key}', **headers})
+
+    async def test_same_payload_as_sync_views(self):
+        for path in (
+            'boards/', f'boards/{self.board.id}/', f'tasks/{self.task.id}/',
+            'tasks/assigned-to-me/', 'tasks/reviewing/', f'tasks/{self.task.id}/comments/',
+        ):
+            expected = await sync_to_async(self.client.get)(f'/api/{path}')
+            response = await self.async_get(f'/api/async/{path}')
+
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(json.loads(response.content), expected.json(), path)
+            self.assertEqual(response.get('ETag'), expected.get('ETag'), path)
+
+    async def test_conditional_get(self):
+        response = await self.async_get(f'/api/async/tasks/{self.task.id}/')
+
+        again = await self.async_get(f'/api/async/tasks/{self.task.id}/', if_none_match=response['ETag'])
+
+        self.assertEqual(again.status_code, 304)
+
+    async def test_authentication_and_access(self):
+        foreign = await Board.objects.acreate(title='Fremd', owner=self.stranger)
+
+        self.assertEqual((await self.async_client.get('/api/async/boards/')).status_code, 401)
+        self.assertEqual((await self.async_get(f'/api/async/boards/{foreign.id}/')).status_code, 403)
+        self.assertEqual((await self.async_get('/api/async/tasks/999999/')).status_code, 404)
+
+
+class BoardEventTests(KanMindTestCase):
+    """
+    Schreibzugriffe erzeugen nach dem Commit Ereignisse, die der SSE-Stream
+    ausliefert und nach `Last-Event-ID` nachliefert.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+
+    async def read_stream(self, headers, until):
+        response = await self.async_client.get(
+            f'/api/boards/{self.board.id}/events/',
+            headers={'Authorization': f'Token {self.token.key}', **headers},
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        received = b''
+        async for chunk in response.streaming_content:
+            received += chunk
+            if until in received:
+                break
+        return received.decode()
+
+    def test_write_paths_publish_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task_id = self.client.post('/api/tasks/', {
+                'board': self.board.id, 'title': 'Task', 'status': 'to-do', 'due_date': '2030-01-01',
+            }, format='json').json()['id']
+            self.client.patch(f'/api/tasks/{task_id}/', {'status': 'done'}, format='json')
+            self.client.post(f'/api/tasks/{task_id}/comments/', {'content': 'Hallo'}, format='json')
+            self.client.patch(f'/api/boards/{self.board.id}/', {'title': 'Neu'}, format='json')
+            self.client.delete(f'/api/tasks/{task_id}/')
+
+        published = events.get_broker().since(self.board.id, 0)
+        self.assertEqual(
+            [event.type for event in published],
+            ['task.created', 'task.updated', 'comment.created', 'board.updated', 'task.deleted'],
+        )
+        self.assertEqual(published[1].data['status'], 'done')
+        self.assertEqual([event.id for event in published], [1, 2, 3, 4, 5])
+
+    async def test_stream_resumes_after_last_event_id(self):
+        broker = events.get_broker()
+        broker.publish(self.board.id, 'task.created', {'id': 1})
+        broker.publish(self.board.id, 'task.deleted', {'id': 1})
+
+        received = await self.read_stream({'Last-Event-ID': '1'}, until=b'task.deleted')
+
+        self.assertNotIn('task.created', received)
+        self.assertIn('id: 2\nevent: task.deleted\ndata: {"id":1}\n\n', received)
+
+    async def test_stream_resets_when_events_are_gone(self):
+        received = await self.read_stream({'Last-Event-ID': '7'}, until=b'reset')
+
+        self.assertIn('id: 0\nevent: reset\n', received)
+
+
+class BoardChangesTests(KanMindTestCase):
+    """
+    `boards/<pk>/changes/` liefert nur Änderungen seit dem Cursor inklusive
+    Grabsteinen für gelöschte Tasks und Kommentare.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.member = User.objects.create_user(username='member', email='member@example.com', password='pw')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(board=self.board, title='Alt', due_date=date(2030, 1, 1))
+        self.other = Task.objects.create(board=self.board, title='Bleibt', due_date=date(2030, 1, 1))
+        self.comment = Comment.objects.create(task=self.other, author=self.user, content='Hallo')
+        counters.rebuild(Board.objects.filter(pk=self.board.pk))
+
+    def changes(self, since=None):
+        params = {'since': since} if since else {}
+        response = self.client.get(f'/api/boards/{self.board.id}/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_state_without_cursor(self):
+        data = self.changes()
+
+        self.assertEqual(data['board']['title'], 'Board')
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.id, self.other.id])
+        self.assertEqual(data['comments'][0]['task'], self.other.id)
+
+    def test_only_changes_since_cursor(self):
+        with self.settings(KANMIND_CHANGES_OVERLAP=0):
+            cursor = self.changes()['cursor']
+            self.client.patch(f'/api/tasks/{self.other.id}/', {'status': 'done'}, format='json')
+            self.client.delete(f'/api/tasks/{self.task.id}/')
+            self.client.delete(f'/api/tasks/{self.other.id}/comments/{self.comment.id}/')
+            self.client.patch(f'/api/boards/{self.board.id}/', {'members': [self.user.id, self.member.id]}, format='json')
+
+            data = self.changes(cursor)
+
+        self.assertEqual([task['id'] for task in data['tasks']], [self.other.id])
+        self.assertEqual(data['tasks'][0]['status'], 'done')
+        self.assertEqual(data['comments'], [])
+        self.assertEqual(data['deleted'], {'tasks': [self.task.id], 'comments': [self.comment.id]})
+        self.assertEqual({member['id'] for member in data['board']['members']}, {self.user.id, self.member.id})
+
+    def test_invalid_and_expired_cursor(self):
+        url = f'/api/boards/{self.board.id}/changes/'
+
+        self.assertEqual(self.client.get(url, {'since': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': '1'}).status_code, 410)
+
+
+class EmailCheckTests(KanMindTestCase):
+    """
+    Die Batch-Prüfung löst viele Emails mit einer Query auf; Fehlschläge
+    werden kurz gecacht, bis ein Benutzer mit der Email angelegt wird.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.team = [
+            User.objects.create_user(username=f'member{i}', email=f'Member{i}@Example.com', password='pw')
+            for i in range(5)
+        ]
+        self.client.force_authenticate(self.user)
+
+    def check(self, emails):
+        response = self.client.post('/api/email-check/batch/', {'emails': emails}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_batch_lookup_costs_one_query(self):
+        emails = [f'MEMBER{i}@example.com' for i in range(5)] + ['unknown@example.com']
+
+        with self.assertNumQueries(1):
+            data = self.check(emails)
+
+        self.assertEqual([user['id'] for user in data['results']], [user.id for user in self.team])
+        self.assertEqual(data['results'][0], {'id': self.team[0].id, 'email': 'member0@example.com', 'fullname': 'member0'})
+        self.assertEqual(data['missing'], ['unknown@example.com'])
+
+    def test_misses_are_cached_until_user_exists(self):
+        self.check(['new@example.com'])
+
+        with self.assertNumQueries(0):
+            data = self.check(['new@example.com'])
+        self.assertEqual(data['missing'], ['new@example.com'])
+
+        User.objects.create_user(username='new', email='New@example.com', password='pw')
+        self.assertEqual(self.check(['new@example.com'])['results'][0]['fullname'], 'new')
+        self.assertEqual(self.client.get('/api/email-check/', {'email': 'NEW@example.com'}).status_code, 200)
+
+    def test_limit_and_invalid_body(self):
+        with self.settings(KANMIND_EMAIL_LOOKUP_LIMIT=2):
+            response = self.client.post('/api/email-check/batch/', {'emails': ['a@x.de'] * 3}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post('/api/email-check/batch/', {'emails': 'a@x.de'}, format='json').status_code, 400)
+
+
+class CommentPaginationTests(KanMindTestCase):
+    """
+    Kommentare werden neueste zuerst per Cursor paginiert; die Seite kostet
+    unabhängig von der Länge des Threads gleich viele Queries.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.client.force_authenticate(self.user)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.set([self.user])
+        self.task = Task.objects.create(board=self.board, title='Task', due_date=date.today())
+        authors = [User.objects.create_user(username=f'author{i}', email=f'author{i}@example.com') for i in range(5)]
+        self.comments = Comment.objects.bulk_create([
+            Comment(task=self.task, author=authors[i % 5], content=f'Kommentar {i}') for i in range(25)
+        ])
+        # Gleiche Zeitstempel: die Reihenfolge entscheidet dann die ID.
+        Comment.objects.filter(pk__in=[comment.pk for comment in self.comments[:10]]).update(
+            created_at=self.comments[0].created_at
+        )
+
+    def test_pages_follow_created_at_and_id(self):
+        url = f'/api/tasks/{self.task.id}/comments/?page_size=10'
+        self.client.get(url)
+        seen = []
+        while url:
+            with self.assertNumQueries(2):
+                data = self.client.get(url).json()
+            seen.extend(comment['id'] for comment in data['results'])
+            url = data['next']
+
+        expected = Comment.objects.filter(task=self.task).order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(seen, list(expected))
+        self.assertEqual(data['results'][-1]['author'], 'author0')
+
+    def test_each_page_has_its_own_etag(self):
+        # Die async Views authentifizieren nur per Token.
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        for prefix in ('/api', '/api/async'):
+            url = f'{prefix}/tasks/{self.task.id}/comments/?page_size=10'
+            first = self.client.get(url)
+            second_url = first.json()['next']
+            second = self.client.get(second_url)
+
+            self.assertNotEqual(first['ETag'], second['ETag'])
+            self.assertEqual(self.client.get(second_url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+            self.assertEqual(self.client.get(second_url, HTTP_IF_NONE_MATCH=second['ETag']).status_code, 304)
+
+    def test_stranger_and_missing_task(self):
+        self.client.force_authenticate(User.objects.create_user(username='fremd', email='fremd@example.com'))
+
+        self.assertEqual(self.client.get(f'/api/tasks/{self.task.id}/comments/').status_code, 403)
+        self.assertEqual(self.client.get('/api/tasks/999999/comments/').status_code, 404)
+
+
+class QueryBudgetTests(QueryBudgetMixin, KanMindTestCase):
+    """
+    Jeder Endpunkt hält das Query-Budget seiner Route ein (siehe
+    `KANMIND_QUERY_BUDGETS`); gemessen wird mit leeren Caches.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw', is_staff=True)
+        self.members = [User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com') for i in range(3)]
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.boards = []
+        for b in range(3):
+            board = Board.objects.create(title=f'Board {b}', owner=self.user)
+            board.members.set([self.user, *self.members])
+            for t in range(3):
+                task = Task.objects.create(
+                    board=board, title=f'Task {t}', due_date=date(2030, 1, 1),
+                    assignee_id=self.user, reviewer_id=self.members[t],
+                )
+                for c in range(3):
+                    Comment.objects.create(task=task, author=self.members[c], content='Hallo')
+            self.boards.append(board)
+        counters.rebuild(Board.objects.all())
+        self.board = self.boards[0]
+        self.task = self.board.tasks.first()
+        self.routes = set()
+
+    def request(self, method, path, data=None, **kwargs):
+        cache.clear()
+        board_render_cache.clear()
+        token_cache.clear()
+        if method != 'get':
+            kwargs.setdefault('format', 'json')
+        response = getattr(self.client, method)(path, data, **kwargs)
+        self.routes.add(response.query_profile.route)
+        return self.assertWithinQueryBudget(response)
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(set(api_routes()) - set(settings.KANMIND_QUERY_BUDGETS), set())
+
+    def test_board_endpoints(self):
+        board, other = self.boards[0], self.boards[1]
+        self.request('get', '/api/boards/')
+        self.request('post', '/api/boards/', {'title': 'Neu', 'members': [member.id for member in self.members]})
+        self.request('get', '/api/boards/export/')
+        self.request('get', f'/api/boards/{board.id}/')
+        self.request('patch', f'/api/boards/{board.id}/', {'title': 'Umbenannt', 'members': [self.user.id, self.members[0].id]})
+        self.request('get', f'/api/boards/{board.id}/export/')
+        self.request('get', f'/api/boards/{board.id}/changes/')
+        upload = SimpleUploadedFile('tasks.csv', b'title,due_date\nImportiert,2030-01-01\n', content_type='text/csv')
+        self.request('post', f'/api/boards/{board.id}/import/', {'file': upload, 'format': 'csv'}, format='multipart')
+        self.request('delete', f'/api/boards/{other.id}/')
+
+        self.assertEqual(self.routes, {
+            'api/boards/', 'api/boards/export/', 'api/boards/<int:pk>/',
+            'api/boards/<int:pk>/export/', 'api/boards/<int:pk>/changes/', 'api/boards/<int:pk>/import/',
+        })
+
+    def test_task_and_comment_endpoints(self):
+        task = self.task
+        comment = task.comments.filter(author=self.members[0]).first()
+        comment.author = self.user
+        comment.save()
+        self.request('get', '/api/tasks/')
+        self.request('post', '/api/tasks/', {
+            'board': self.board.id, 'title': 'Neu', 'due_date': '2030-01-01',
+            'assignee_id': self.members[0].id, 'reviewer_id': self.members[1].id,
+        })
+        self.request('get', '/api/tasks/assigned-to-me/')
+        self.request('get', '/api/tasks/reviewing/')
+        self.request('post', '/api/tasks/bulk/', {
+            'create': [{'board': self.board.id, 'title': f'Bulk {i}', 'due_date': '2030-01-01'} for i in range(5)],
+            'update': [{'id': task.id, 'status': 'done'}],
+        })
+        self.request('get', f'/api/tasks/{task.id}/')
+        self.request('patch', f'/api/tasks/{task.id}/', {'title': 'Geändert'})
+        self.request('get', f'/api/tasks/{task.id}/comments/')
+        self.request('post', f'/api/tasks/{task.id}/comments/', {'content': 'Neu'})
+        self.request('delete', f'/api/tasks/{task.id}/comments/{comment.id}/')
+        self.request('delete', f'/api/tasks/{self.boards[1].tasks.first().id}/')
+
+        self.assertEqual(self.routes, {
+            'api/tasks/', 'api/tasks/assigned-to-me/', 'api/tasks/reviewing/', 'api/tasks/bulk/',
+            'api/tasks/<int:pk>/', 'api/tasks/<int:task_id>/comments/', 'api/tasks/<int:task_id>/comments/<int:pk>/',
+        })
+
+    def test_other_and_async_endpoints(self):
+        self.request('get', '/api/email-check/', {'email': 'member0@example.com'})
+        self.request('post', '/api/email-check/batch/', {'emails': [member.email for member in self.members]})
+        self.request('get', '/api/metrics/cache/')
+        for path in (
+            'boards/', f'boards/{self.board.id}/', 'tasks/assigned-to-me/', 'tasks/reviewing/',
+            f'tasks/{self.task.id}/', f'tasks/{self.task.id}/comments/',
+        ):
+            self.request('get', f'/api/async/{path}')
+
+        # boards/<pk>/events/ ist ein unendlicher Stream und wird hier ausgelassen.
+        self.assertEqual(len(self.routes), 9)
+
+    def test_headers_and_exceeded_budget(self):
+        with self.settings(KANMIND_QUERY_BUDGETS={'api/boards/': 0}, KANMIND_SERVER_TIMING=True), \
+                self.assertLogs('kanmind.requests', 'WARNING') as logs:
+            response = self.client.get('/api/boards/')
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('serializer;dur=', response['Server-Timing'])
+        self.assertIn('render;dur=', response['Server-Timing'])
+        self.assertTrue(response.query_profile.budget_exceeded)
+        self.assertEqual(json.loads(logs.records[0].getMessage())['route'], 'api/boards/')
+
+        with self.settings(KANMIND_SERVER_TIMING=False):
+            self.assertNotIn('Server-Timing', self.client.get('/api/boards/'))
+
+    def test_serializer_time_is_part_of_view_time(self):
+        response = self.client.get(f'/api/tasks/{self.task.id}/')
+        profile = response.query_profile
+
+        self.assertGreater(profile.serializer_ms, 0)
+        self.assertLessEqual(profile.serializer_ms, profile.view_ms)
+        # 304 ohne Serialisierung.
+        response = self.client.get(f'/api/tasks/{self.task.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIsNone(response.query_profile.serializer_ms)
+
+    def test_template_response_without_process_view(self):
+        request = RequestFactory().get('/api/boards/')
+        middleware = QueryBudgetMiddleware(lambda request: SimpleTemplateResponse('unused.html'))
+        middleware.start(request)
+
+        response = middleware.process_template_response(request, SimpleTemplateResponse('unused.html'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(request.query_profile.view_ms)
+
+
+class BenchmarkSuiteTests(KanMindTestCase):
+    """
+    Die Szenarien der Benchmark-Suite laufen fehlerfrei gegen einen kleinen
+    Datenbestand und liefern vergleichbare Kennzahlen.
+    """
+
+    def test_scenarios_run_without_errors(self):
+        summary = data.generate(users=20, boards=5, tasks=200)
+        context = build_context()
+
+        self.assertEqual((summary.users, summary.tasks), (20, 200))
+        for name, scenario in SCENARIOS.items():
+            result = runner.run_scenario(scenario, context, requests=2 if name == 'login_storm' else 20, warmup=2)
+            self.assertEqual(result['errors'], 0, result['error_samples'])
+            self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['p99'])
+            self.assertGreater(result['queries']['mean'], 0)
+
+        baseline = {'scenarios': {'login_storm': result}}
+        self.assertEqual(runner.compare(baseline, baseline)['login_storm']['rps'], 0.0)
+
+
+class DatabaseProfileTests(KanMindTestCase):
+    """
+    `core.databases` baut die Konfiguration aus Umgebungsvariablen; das
+    Standardprofil setzt die SQLite-PRAGMAs bei jeder Verbindung.
+    """
+
+    def test_default_sqlite_profile_is_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_postgres_pool_or_persistent_connections(self):
+        persistent = database_config(Path('.'), {'KANMIND_DB_PROFILE': 'postgres', 'KANMIND_DB_CONN_MAX_AGE': '120'})
+        pooled = database_config(Path('.'), {'KANMIND_DB_PROFILE': 'postgres', 'KANMIND_DB_POOL_MAX_SIZE': '20'})
+
+        self.assertEqual((persistent['CONN_MAX_AGE'], persistent['CONN_HEALTH_CHECKS']), (120, True))
+        self.assertNotIn('pool', persistent['OPTIONS'])
+        self.assertEqual(pooled['CONN_MAX_AGE'], 0)
+        self.assertEqual(pooled['OPTIONS']['pool']['max_size'], 20)
+        self.assertNotIn('OPTIONS', database_config(Path('.'), {'KANMIND_DB_PROFILE': 'sqlite-basic'}))
+        with self.assertRaises(ValueError):
+            database_config(Path('.'), {'KANMIND_DB_PROFILE': 'oracle'})
+
+
+class ReplicaRoutingTests(KanMindTestCase):
+    """
+    `core.routers`: lesende Requests gehen an ein Replikat, Schreibzugriffe
+    an `default`, danach liest derselbe Client eine Weile vom Primärsystem.
+
+    Die Replikate sind zwei eigene SQLite-Dateien, in denen das Board einen
+    anderen Titel hat; am Titel ist ablesbar, woher gelesen wurde.
+    """
+    replicas = ['replica-a', 'replica-b']
+    # '__all__' wird erst in setUpClass aufgelöst, also nach dem Anlegen der
+    # Replikat-Aliase; der Test-Runner legt für sie keine Test-Datenbanken an.
+    # override_settings(DATABASES=...) erreicht `connections` nicht von
+    # selbst, deshalb wird deren Konfiguration beim Ein- und Ausschalten
+    # neu aus den Settings gelesen.
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.databases_override = override_settings(DATABASES={
+            **settings.DATABASES,
+            **{
+                alias: sqlite_config(Path(cls.directory.name) / f'{alias}.sqlite3', tuned=False)
+                for alias in cls.replicas
+            },
+        })
+        cls.databases_override.enable()
+        connections.settings = connections.configure_settings(settings.DATABASES)
+        for alias in cls.replicas:
+            call_command('migrate', database=alias, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in cls.replicas:
+            connections[alias].close()
+            del connections[alias]
+        cls.databases_override.disable()
+        connections.settings = connections.configure_settings(settings.DATABASES)
+        cls.directory.cleanup()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.token = Token.objects.create(user=cls.user)
+        cls.board = Board.objects.create(title='Primär', owner=cls.user)
+        cls.board.members.set([cls.user])
+        for alias in cls.replicas:
+            User.objects.using(alias).create(pk=cls.user.pk, username='owner', email='owner@example.com')
+            Board.objects.using(alias).create(pk=cls.board.pk, title=alias, owner_id=cls.user.pk)
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def titles(self, path='/api/boards/'):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return sorted(board['title'] for board in response.json())
+
+    def test_safe_requests_read_from_a_replica(self):
+        with self.settings(KANMIND_DB_REPLICAS=['replica-a']):
+            with CaptureQueriesContext(connections['replica-a']) as replica_queries:
+                self.assertEqual(self.titles(), ['replica-a'])
+            self.assertGreater(len(replica_queries), 0)
+            self.assertEqual(self.titles('/api/async/boards/'), ['replica-a'])
+        self.assertEqual(self.titles(), ['Primär'])
+
+    def test_reads_are_spread_over_replicas(self):
+        with self.settings(KANMIND_DB_REPLICAS=self.replicas):
+            with mock.patch('core.routers.random.choice', side_effect=lambda aliases: aliases[-1]):
+                self.assertEqual(self.titles(), ['replica-b'])
+            with mock.patch('core.routers.random.choice', side_effect=lambda aliases: aliases[0]):
+                self.assertEqual(self.titles(), ['replica-a'])
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        with self.settings(KANMIND_DB_REPLICAS=['replica-a']):
+            response = self.client.post('/api/boards/', {'title': 'Neu', 'members': [self.user.pk]}, format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertFalse(Board.objects.using('replica-a').filter(title='Neu').exists())
+            self.assertEqual(response.cookies['kanmind_primary']['max-age'], settings.KANMIND_REPLICA_STICKY_SECONDS)
+
+            self.assertEqual(self.titles(), ['Neu', 'Primär'])
+            # Ohne Cookie greift der Marker zum Token.
+            self.client.cookies.clear()
+            self.assertEqual(self.titles(), ['Neu', 'Primär'])
+            # Nach Ablauf des Markers wieder vom Replikat.
+            cache.clear()
+            self.assertEqual(self.titles(), ['replica-a'])
+
+    def test_excluded_routes_and_disabled_replicas_use_primary(self):
+        with self.settings(KANMIND_DB_REPLICAS=['replica-a']):
+            with CaptureQueriesContext(connections['replica-a']) as replica_queries:
+                response = self.client.get(f'/api/boards/{self.board.pk}/changes/')
+        self.assertEqual(response.json()['board']['title'], 'Primär')
+        self.assertEqual(len(replica_queries), 0)
+
+        response = self.client.post('/api/boards/', {'title': 'Neu', 'members': [self.user.pk]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('kanmind_primary', response.cookies)
+
+    def test_router_writes_and_tokens_go_to_primary(self):
+        router = ReplicaRouter()
+        replica_board = Board.objects.using('replica-a').get(pk=self.board.pk)
+        with self.settings(KANMIND_DB_REPLICAS=['replica-a']):
+            self.assertEqual(router.db_for_write(Board, instance=replica_board), 'default')
+            self.assertTrue(router.allow_relation(replica_board, self.user))
+        self.assertEqual(router.db_for_read(Token), 'default')
+        self.assertEqual(router.db_for_read(Board, primary=True), 'default')
+        self.assertIsNone(router.db_for_read(Board))
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserProfileCursorPagination(CursorPagination):
+    """
+    Keyset-Pagination für die Profilliste, sortiert nach `id`.
+    Die Seitengröße ist über `page_size` wählbar, aber nach oben begrenzt.
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
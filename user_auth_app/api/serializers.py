@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from user_auth_app.models import UserProfile
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from user_auth_app.emails import normalize_email
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """
@@ -48,8 +51,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         """
-        Validiert, dass die Email-Adresse noch nicht verwendet wird.
+        Normalisiert die Email-Adresse und validiert, dass sie noch nicht verwendet wird.
         """
+        value = normalize_email(value)
         if User.objects.filter(email=value).exists():
             raise serializers.ValidationError("Diese E-Mail wird bereits verwendet.")
         return value
@@ -69,8 +73,14 @@ class RegistrationSerializer(serializers.ModelSerializer):
             email=self.validated_data['email'],
         )
         user.set_password(pw)
-        user.save()
-        
-        UserProfile.objects.create(user=user)
+        try:
+            with transaction.atomic():
+                user.save()
+                UserProfile.objects.create(user=user)
+        except IntegrityError:
+            # Paralleler Request mit derselben E-Mail (eindeutiger Index).
+            if User.objects.filter(email=user.email).exists():
+                raise serializers.ValidationError({'email': ['Diese E-Mail wird bereits verwendet.']})
+            raise
 
         return user
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import UserProfileList, UserProfileDetail, RegistrationView, LoginView
+from .views import UserProfileList, UserProfileDetail, RegistrationView, BulkRegistrationView, LoginView
 
 urlpatterns = [
     path('profiles/', UserProfileList.as_view(), name='userprofile-list'),
     path('profiles/<int:pk>/', UserProfileDetail.as_view(), name='userprofile-detail'),
     path('registration/', RegistrationView.as_view(), name='registration'),
+    path('registration/bulk/', BulkRegistrationView.as_view(), name='registration-bulk'),
     path('login/', LoginView.as_view(), name='login')
 ]
\ No newline at end of file
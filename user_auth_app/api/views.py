@@ -1,8 +1,13 @@
+from django.conf import settings
 from rest_framework import generics
+from user_auth_app.emails import normalize_email
 from user_auth_app.models import UserProfile
+from user_auth_app.provisioning import provision_accounts
+from user_auth_app.search import search_user_ids
+from .pagination import UserProfileCursorPagination
 from .serializers import UserProfileSerializer, RegistrationSerializer
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from django.contrib.auth.models import User
@@ -12,11 +17,28 @@ class UserProfileList(generics.ListCreateAPIView):
     """
     API-View zum Auflisten und Erstellen von UserProfiles.
 
-    GET: Gibt alle UserProfiles zurück.
+    GET: Gibt die UserProfiles paginiert zurück (Cursor, sortiert nach ID).
+    Mit `?search=...` (Mitgliedersuche) stattdessen die ersten `page_size`
+    Profile, deren Name oder E-Mail alle Suchwörter als Teilstring enthält,
+    sortiert nach dem Treffer; `next` ist dann immer null.
     POST: Erstellt ein neues UserProfile (über Serializer).
     """
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related('user')
     serializer_class = UserProfileSerializer
+    pagination_class = UserProfileCursorPagination
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('search', '').strip()
+        if not query:
+            return super().list(request, *args, **kwargs)
+        user_ids = search_user_ids(query, self.paginator.get_page_size(request))
+        profiles = {profile.user_id: profile for profile in self.get_queryset().filter(user_id__in=user_ids)}
+        results = [profiles[pk] for pk in user_ids if pk in profiles]
+        return Response({
+            'next': None,
+            'previous': None,
+            'results': self.get_serializer(results, many=True).data,
+        })
 
 class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
     """
@@ -26,7 +48,7 @@ class UserProfileDetail(generics.RetrieveUpdateDestroyAPIView):
     PUT/PATCH: Aktualisiert das UserProfile.
     DELETE: Löscht das UserProfile.
     """
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related('user')
     serializer_class = UserProfileSerializer
 
 
@@ -62,6 +84,37 @@ class RegistrationView(APIView):
             return Response(serializer.errors, status=400)
     
 
+class BulkRegistrationView(APIView):
+    """
+    API-View für das Anlegen vieler Konten (nur Admins).
+
+    POST: `{"accounts": [{"fullname", "email", "password"}, ...]}`. Legt für
+    jeden gültigen Eintrag User, UserProfile und Token an (siehe
+    `user_auth_app.provisioning`) und antwortet mit einem Ergebnis pro
+    Eintrag. Ungültige Einträge werden übersprungen; der Status ist 201,
+    sobald mindestens ein Konto angelegt wurde, sonst 400.
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        accounts = request.data.get('accounts') if isinstance(request.data, dict) else None
+        if not isinstance(accounts, list) or not accounts:
+            return Response({'detail': '"accounts" muss eine nicht-leere Liste sein.'}, status=400)
+        if len(accounts) > settings.KANMIND_PROVISIONING_LIMIT:
+            return Response(
+                {'detail': f'Maximal {settings.KANMIND_PROVISIONING_LIMIT} Konten pro Anfrage.'},
+                status=400
+            )
+
+        results = provision_accounts(accounts)
+        created = sum(1 for result in results if result['status'] == 201)
+        return Response({
+            'created': created,
+            'failed': len(results) - created,
+            'results': results,
+        }, status=201 if created else 400)
+
+
 class LoginView(APIView):
     """
     API-View für Benutzer-Login.
@@ -73,10 +126,11 @@ class LoginView(APIView):
     Authentifiziert Benutzer und erstellt einen Token.
 
     Schritte:
-    1. User anhand der Email suchen.
-    2. Passwort prüfen mit authenticate().
-    3. Token erstellen oder abrufen.
-    4. Erfolgs- oder Fehlerantwort zurückgeben.
+    1. authenticate() mit E-Mail und Passwort (`EmailBackend`: eine Query
+       für Benutzer und Token).
+    2. Token übernehmen oder beim ersten Login erstellen.
+    3. Nur bei Fehlschlag wird geprüft, ob die E-Mail existiert, um die
+       passende Fehlermeldung zu liefern.
     """
     permission_classes = [AllowAny]
 
@@ -84,20 +138,20 @@ class LoginView(APIView):
         email = request.data.get('email')
         password = request.data.get('password')
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            return Response({'ok': False, 'error': 'E-Mail nicht gefunden'}, status=400)
-
-        user = authenticate(username=user.username, password=password)
-        if user is not None:
-            token, _ = Token.objects.get_or_create(user=user)
-
-            return Response({
-                'token': token.key,
-                'user_id': user.id,
-                'email': user.email,
-                'fullname': user.username
-            }, status=200)
+        user = authenticate(request, email=email, password=password)
+        if user is None:
+            if not User.objects.filter(email=normalize_email(email)).exists():
+                return Response({'ok': False, 'error': 'E-Mail nicht gefunden'}, status=400)
+            return Response({'ok': False, 'error': 'Falsches Passwort'}, status=400)
 
-        return Response({'ok': False, 'error': 'Falsches Passwort'}, status=400)
\ No newline at end of file
+        try:
+            token = user.auth_token
+        except Token.DoesNotExist:
+            token = Token.objects.create(user=user)
+
+        return Response({
+            'token': token.key,
+            'user_id': user.id,
+            'email': user.email,
+            'fullname': user.username
+        }, status=200)
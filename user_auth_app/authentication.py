@@ -0,0 +1,54 @@
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from user_auth_app.token_cache import token_cache
+
+
+class CachingTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` mit Cache (siehe `user_auth_app.token_cache`).
+
+    Ein Cache-Treffer kostet keine Query. Gecacht werden nur Tokens aktiver
+    Benutzer; ungültige Tokens gehen immer an die Datenbank.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user, token)
+        return user, token
+
+
+class AsyncTokenAuthentication(CachingTokenAuthentication):
+    """
+    Token-Authentifizierung für async Django-Views.
+
+    Liest den `Authorization: Token <key>`-Header wie DRFs
+    `TokenAuthentication`, nutzt denselben Cache und lädt Token und Benutzer
+    bei einem Fehltreffer mit einer einzigen async Query (`select_related`).
+    Fehler werden als DRF-Exceptions mit denselben Meldungen geworfen.
+    """
+
+    async def aauthenticate(self, request):
+        """Gibt `(user, token)` oder None zurück, falls kein Token-Header gesetzt ist."""
+        auth = request.headers.get('Authorization', '').split()
+        if not auth or auth[0].lower() != self.keyword.lower():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Invalid token header. Token string should not contain spaces.')
+
+        key = auth[1]
+        cached = await token_cache.aget(key)
+        if cached is not None:
+            return cached
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        await token_cache.aset(key, token.user, token)
+        return token.user, token
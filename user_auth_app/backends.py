@@ -0,0 +1,29 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+from user_auth_app.emails import normalize_email
+
+
+class EmailBackend(ModelBackend):
+    """
+    Authentifiziert per E-Mail und Passwort mit einer einzigen Query.
+
+    Der Benutzer wird zusammen mit seinem Token (`auth_token`, per
+    `select_related`) geladen, sodass der Login-View ohne weitere Query
+    antworten kann. Die E-Mail wird wie beim Speichern normalisiert.
+
+    Ist das Passwort mit einem veralteten Hasher oder zu wenigen
+    Iterationen gespeichert, rechnet `check_password()` es mit dem
+    aktuellen Hasher neu (siehe `PASSWORD_HASHERS`).
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        try:
+            user = User.objects.select_related('auth_token').get(email=normalize_email(email))
+        except User.DoesNotExist:
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,68 @@
+"""
+Normalisierte E-Mail-Adressen und gebündelte Suche nach Benutzern per E-Mail.
+
+E-Mails werden beim Speichern (Signal in `user_auth_app.signals`), bei der
+Registrierung, beim Provisionieren und beim Login mit `normalize_email()`
+auf Kleinbuchstaben gebracht. Die Spalte `auth_user.email` ist damit ohne
+`iexact` über ihren Index durchsuchbar (Migration `0004_normalize_user_email`).
+
+`lookup_emails()` löst beliebig viele Adressen mit einer `email__in`-Query
+auf. Nicht gefundene Adressen werden kurz im Django-Cache vermerkt
+(`KANMIND_EMAIL_MISS_CACHE`, `KANMIND_EMAIL_MISS_TIMEOUT`), damit wiederholte
+Prüfungen beim Tippen keine Query kosten. Wird ein Benutzer mit einer
+solchen Adresse angelegt, entfernt `forget_misses()` den Vermerk.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+
+
+KEY_PREFIX = 'kanmind:email-miss:'
+
+
+def normalize_email(value):
+    """E-Mail ohne umgebende Leerzeichen, in Kleinbuchstaben."""
+    return value.strip().lower() if isinstance(value, str) else ''
+
+
+def _cache():
+    alias = settings.KANMIND_EMAIL_MISS_CACHE
+    return caches[alias] if alias else None
+
+
+def _key(email):
+    return KEY_PREFIX + hashlib.sha256(email.encode()).hexdigest()
+
+
+def lookup_emails(emails):
+    """
+    Gibt `{normalisierte E-Mail: User}` für die gefundenen Adressen zurück
+    (eine Query; bekannte Fehlschläge kosten keine).
+    """
+    wanted = {email for email in map(normalize_email, emails) if email}
+    cache = _cache()
+    if cache is not None and wanted:
+        known_misses = cache.get_many([_key(email) for email in wanted])
+        wanted = {email for email in wanted if _key(email) not in known_misses}
+    if not wanted:
+        return {}
+
+    users = {user.email: user for user in User.objects.filter(email__in=wanted)}
+    if cache is not None:
+        misses = wanted - users.keys()
+        if misses:
+            cache.set_many({_key(email): True for email in misses}, settings.KANMIND_EMAIL_MISS_TIMEOUT)
+    return users
+
+
+def forget_misses(emails):
+    """Entfernt Fehlschlag-Vermerke sofort und erneut nach dem Commit."""
+    cache = _cache()
+    keys = [_key(email) for email in map(normalize_email, emails) if email]
+    if cache is None or not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
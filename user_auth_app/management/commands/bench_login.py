@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+
+
+class Rollback(Exception):
+    """Wird geworfen, um die Benchmark-Transaktion zurückzurollen."""
+
+
+class Command(BaseCommand):
+    """
+    Login-Benchmark für `POST /api/login/`.
+
+    Legt `--users` Benutzer mit Passwort-Hashes des konfigurierten Hashers
+    an und misst anschließend `--logins` Logins (reihum über die Benutzer):
+    Logins pro Sekunde und Queries pro Login. Die Hälfte der Benutzer hat
+    vorab keinen Token, damit auch der erste Login gemessen wird. Alles
+    läuft in einer Transaktion, die am Ende zurückgerollt wird.
+    """
+    help = 'Misst Logins pro Sekunde und Queries pro Login.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--logins', type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        password = make_password('benchmark-pw')
+        users = User.objects.bulk_create([
+            User(username=f'login-bench-{i}', email=f'login-bench-{i}@example.com', password=password)
+            for i in range(options['users'])
+        ])
+        Token.objects.bulk_create([
+            Token(key=Token.generate_key(), user=user) for user in users[::2]
+        ])
+
+        client = Client()
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            for i in range(options['logins']):
+                response = client.post('/api/login/', {
+                    'email': f'login-bench-{i % len(users)}@example.com', 'password': 'benchmark-pw',
+                }, content_type='application/json')
+                if response.status_code != 200:
+                    raise RuntimeError(f'Login fehlgeschlagen: {response.content!r}')
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['logins']} Logins in {elapsed:.2f} s ({options['logins'] / elapsed:.1f} Logins/s), "
+            f"{len(queries) / options['logins']:.2f} Queries pro Login"
+        ))
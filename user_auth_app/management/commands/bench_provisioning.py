@@ -0,0 +1,38 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from user_auth_app.provisioning import provision_accounts
+
+
+class Command(BaseCommand):
+    """
+    Benchmark für die Konten-Provisionierung.
+
+    Legt `--accounts` Konten einmal mit einem Prozess und einmal mit
+    `--workers` Prozessen für das Hashen an und meldet Konten pro Sekunde.
+    Jeder Durchlauf wird zurückgerollt; die Datenbank bleibt unverändert.
+    """
+    help = 'Misst Konten pro Sekunde beim Provisionieren (seriell vs. Prozess-Pool).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        entries = [
+            {'fullname': f'prov-bench-{i}', 'email': f'prov-bench-{i}@example.com', 'password': f'pw-{i}'}
+            for i in range(options['accounts'])
+        ]
+        for workers in sorted({1, options['workers']}):
+            with transaction.atomic():
+                start = time.perf_counter()
+                results = provision_accounts(entries, workers=workers)
+                elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            created = sum(1 for result in results if result['status'] == 201)
+            self.stdout.write(self.style.SUCCESS(
+                f'{workers} Prozess(e): {created} Konten in {elapsed:.2f} s ({created / elapsed:.1f} Konten/s)'
+            ))
@@ -0,0 +1,76 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.models import UserProfile
+from user_auth_app.search import index_users
+
+
+SYLLABLES = ['an', 'ber', 'chri', 'da', 'el', 'fa', 'ge', 'han', 'is', 'jo', 'ka', 'lu', 'ma', 'ni', 'ol', 'pe', 'ra', 'si', 'to', 'ul']
+DOMAINS = ['example.com', 'firma.de', 'mail.org', 'team.io']
+QUERIES = ['a', 'ma', 'han', 'lu ka', 'firma', 'ertom', 'zzz']
+
+
+class Command(BaseCommand):
+    """
+    Benchmark für die Mitgliedersuche (`GET profiles/?search=...`).
+
+    Legt schrittweise Benutzer bis zu den Größen aus `--sizes` an und misst
+    pro Größe p50/p99 der Suchanfragen (Tippen einzelner Buchstaben bis zu
+    längeren Teilstrings). Am Ende wird zurückgerollt; die Datenbank bleibt
+    unverändert.
+    """
+    help = 'Misst p50/p99 der Mitgliedersuche bei wachsender Benutzerzahl.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000')
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        rng = random.Random(0)
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver']):
+            viewer = User.objects.create_user(username='search-bench', email='search-bench@example.com')
+            client = Client(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=viewer).key}')
+            count = 0
+            for size in sizes:
+                while count < size:
+                    batch = min(5000, size - count)
+                    users = User.objects.bulk_create([
+                        self.make_user(rng, count + i) for i in range(batch)
+                    ])
+                    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+                    index_users(users, replace=False)
+                    count += batch
+                self.report(client, size, options['requests'])
+            transaction.set_rollback(True)
+
+    def make_user(self, rng, number):
+        first = ''.join(rng.choices(SYLLABLES, k=2)).capitalize()
+        last = ''.join(rng.choices(SYLLABLES, k=3)).capitalize()
+        return User(
+            username=f'{first} {last} {number}',
+            email=f'{first.lower()}.{last.lower()}{number}@{rng.choice(DOMAINS)}',
+            password='!',
+        )
+
+    def report(self, client, size, requests):
+        timings = []
+        for i in range(requests):
+            query = QUERIES[i % len(QUERIES)]
+            start = time.perf_counter()
+            response = client.get('/api/profiles/', {'search': query, 'page_size': 20})
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f'Unerwarteter Status {response.status_code} für "{query}"')
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(self.style.SUCCESS(
+            f'{size:>7} Benutzer: p50 {statistics.median(timings):.2f} ms, p99 {p99:.2f} ms'
+        ))
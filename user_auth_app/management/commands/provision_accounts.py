@@ -0,0 +1,49 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user_auth_app.provisioning import CHUNK_SIZE, default_workers, provision_accounts
+
+
+class Command(BaseCommand):
+    """
+    Legt Konten aus einer CSV- oder NDJSON-Datei an (Spalten bzw. Schlüssel
+    fullname, email, password), siehe `user_auth_app.provisioning`.
+    """
+    help = 'Legt Benutzerkonten (User, UserProfile, Token) aus CSV/NDJSON an.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'])
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, help='Prozesse für das Hashen der Passwörter')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('csv' if options['path'].endswith('.csv') else 'ndjson')
+        with open(options['path'], newline='', encoding='utf-8') as stream:
+            if fmt == 'csv':
+                entries = list(csv.DictReader(stream))
+            else:
+                try:
+                    entries = [json.loads(line) for line in stream if line.strip()]
+                except ValueError as exc:
+                    raise CommandError(f'Ungültiges NDJSON: {exc}')
+
+        start = time.perf_counter()
+        results = provision_accounts(
+            entries, chunk_size=options['chunk_size'], workers=options['workers'] or default_workers(),
+        )
+        elapsed = time.perf_counter() - start
+
+        created = 0
+        for result in results:
+            if result['status'] == 201:
+                created += 1
+            else:
+                self.stderr.write(f"Eintrag {result['index'] + 1}: {json.dumps(result['errors'], ensure_ascii=False)}")
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} Konten angelegt, {len(results) - created} Fehler in {elapsed:.1f} s '
+            f'({created / elapsed if elapsed else 0:.0f} Konten/s).'
+        ))
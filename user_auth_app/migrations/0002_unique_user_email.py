@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """Bricht mit einer verständlichen Meldung ab, falls E-Mails doppelt vergeben sind."""
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.exclude(email='')
+        .values('email')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('email', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'E-Mail-Adressen mehrfach vergeben, bitte vor der Migration bereinigen: '
+            + ', '.join(sorted(duplicates))
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Eindeutiger Index auf `auth_user.email` (leere E-Mails ausgenommen).
+
+    `User` gehört zu django.contrib.auth, daher wird der Index per SQL
+    angelegt. Partielle Indizes unterstützen SQLite und PostgreSQL.
+    """
+
+    dependencies = [
+        ('user_auth_app', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX auth_user_email_uniq ON auth_user (email) WHERE email <> ''",
+            "DROP INDEX auth_user_email_uniq",
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:42
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def index_existing_users(apps, schema_editor):
+    """Befüllt den Suchindex für bestehende Benutzer (wie `user_auth_app.search.terms_for`)."""
+    User = apps.get_model('auth', 'User')
+    UserSearchTerm = apps.get_model('user_auth_app', 'UserSearchTerm')
+    words = re.compile(r'[^\W_]+')
+    terms = []
+    for pk, username, email in User.objects.values_list('pk', 'username', 'email').iterator():
+        suffixes = {
+            word[start:start + 32]
+            for word in words.findall(f'{username} {email}'.lower())
+            for start in range(len(word))
+        }
+        terms.extend(UserSearchTerm(user_id=pk, term=term) for term in suffixes)
+        if len(terms) >= 5000:
+            UserSearchTerm.objects.bulk_create(terms)
+            terms = []
+    UserSearchTerm.objects.bulk_create(terms)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0002_unique_user_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=32)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'user'], name='user_search_term_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    """
+    Bringt alle E-Mails auf Kleinbuchstaben (wie `user_auth_app.emails.normalize_email`).
+    Bricht ab, falls Adressen sich nur in der Schreibweise unterscheiden.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = (
+        User.objects.exclude(email='')
+        .annotate(normalized=Lower(Trim('email')))
+        .values('normalized')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('normalized', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'E-Mail-Adressen unterscheiden sich nur in der Schreibweise, bitte vor der Migration bereinigen: '
+            + ', '.join(sorted(duplicates))
+        )
+    User.objects.exclude(email=Lower(Trim('email'))).update(email=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+    """
+    Normalisiert `auth_user.email` und legt einen Index für Lookups an.
+
+    Der eindeutige Index aus 0002 ist partiell (`WHERE email <> ''`); SQLite
+    nutzt ihn für `email = %s` bzw. `email IN (...)` nicht, da die Bedingung
+    der Query nicht wörtlich enthalten ist. Der zusätzliche, vollständige
+    Index deckt Login, E-Mail-Prüfung und Importe ab.
+    """
+
+    dependencies = [
+        ('user_auth_app', '0003_user_search_terms'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE INDEX auth_user_email_idx ON auth_user (email)",
+            "DROP INDEX auth_user_email_idx",
+        ),
+    ]
@@ -18,3 +18,20 @@ class UserProfile(models.Model):
         Rückgabe des Usernamens des zugehörigen Users.
         """
         return self.user.username
+
+
+class UserSearchTerm(models.Model):
+    """
+    Suchindex für die Mitgliedersuche (siehe `user_auth_app.search`).
+
+    Enthält pro Benutzer alle Suffixe der Wörter aus Benutzername und
+    E-Mail in Kleinbuchstaben. Eine Teilstring-Suche wird so zu einer
+    Präfix-Suche über `term`, die als Bereichsabfrage auf dem Index läuft.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=32)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'user'], name='user_search_term_idx'),
+        ]
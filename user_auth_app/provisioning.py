@@ -0,0 +1,180 @@
+"""
+Anlegen vieler Benutzerkonten in einem Durchgang (Onboarding ganzer Teams).
+
+Ein Konto entspricht einer Registrierung über `RegistrationView`: `User`
+(Benutzername = fullname), `UserProfile` und `Token`. Statt pro Konto
+mehrere Queries und einen Passwort-Hash im Request-Thread zu kosten,
+
+- werden E-Mails und Benutzernamen aller Einträge mit je einer Query auf
+  Eindeutigkeit geprüft (plus Dubletten innerhalb des Stapels),
+- die Passwörter gehasht: im Request im selben Prozess, in den
+  Management-Commands parallel in einem Prozess-Pool
+  (`KANMIND_PROVISIONING_WORKERS`, Standard: Anzahl CPUs),
+- Benutzer, Profile, Tokens und Suchbegriffe (`user_auth_app.search`)
+  per bulk_create in Chunks geschrieben,
+  jeder Chunk in einer eigenen Transaktion.
+
+E-Mails werden normalisiert (`user_auth_app.emails`). Ungültige Einträge
+werden übersprungen und mit Index und Fehlern gemeldet. Legt ein paralleler
+Request dieselbe E-Mail oder denselben Namen an, scheitert der Chunk an der
+Datenbank; die betroffenen Einträge werden dann gemeldet und der Rest des
+Chunks erneut geschrieben.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.emails import forget_misses, normalize_email
+from user_auth_app.models import UserProfile
+from user_auth_app.search import index_users
+
+
+CHUNK_SIZE = 1000
+REQUIRED_FIELDS = ('fullname', 'email', 'password')
+
+
+def _init_worker():
+    """Initialisiert Django in Worker-Prozessen, die per spawn gestartet wurden."""
+    django.setup()
+
+
+def default_workers():
+    """Prozesse für das Hashen in den Management-Commands."""
+    return settings.KANMIND_PROVISIONING_WORKERS or os.cpu_count() or 1
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    Hasht die Passwörter mit dem konfigurierten Hasher; bei mehr als einem
+    Worker parallel in einem Prozess-Pool. Die Reihenfolge bleibt erhalten.
+
+    Der Pool ist für Management-Commands gedacht; in einem Web-Worker (und
+    damit in Requests) sollte mit `workers=1` gehasht werden.
+    """
+    if workers <= 1 or len(passwords) <= 1:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def _validate_entry(entry):
+    if not isinstance(entry, dict):
+        return {'non_field_errors': ['Objekt erwartet.']}
+    errors = {
+        field: ['Dieses Feld ist erforderlich.']
+        for field in REQUIRED_FIELDS
+        if not isinstance(entry.get(field), str) or not entry[field].strip()
+    }
+    if 'email' not in errors:
+        try:
+            validate_email(entry['email'])
+        except ValidationError:
+            errors['email'] = ['Ungültige E-Mail-Adresse.']
+    return errors
+
+
+def _taken(pairs):
+    """Fehler pro Index, dessen E-Mail oder Name inzwischen vergeben ist."""
+    users = [user for _, user in pairs]
+    emails = set(User.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True))
+    usernames = set(User.objects.filter(username__in=[user.username for user in users]).values_list('username', flat=True))
+    conflicts = {}
+    for index, user in pairs:
+        errors = {}
+        if user.email in emails:
+            errors['email'] = ['Diese E-Mail wird bereits verwendet.']
+        if user.username in usernames:
+            errors['fullname'] = ['Dieser Name wird bereits verwendet.']
+        if errors:
+            conflicts[index] = errors
+    return conflicts
+
+
+def _write_chunk(pairs):
+    """
+    Schreibt die Benutzer aus `pairs` (Index, User) samt Profil, Token und
+    Suchbegriffen. Gibt die geschriebenen Paare und die Fehler der wegen
+    paralleler Anlage übersprungenen Einträge (Index -> Fehler) zurück.
+    """
+    conflicts = {}
+    while pairs:
+        users = [user for _, user in pairs]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+                Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+                index_users(users, replace=False)
+            return pairs, conflicts
+        except IntegrityError:
+            # Ein paralleler Request war schneller; ohne erkennbare Dublette
+            # ist es ein anderer Fehler.
+            taken = _taken(pairs)
+            if not taken:
+                raise
+            conflicts.update(taken)
+            pairs = [(index, user) for index, user in pairs if index not in taken]
+            for _, user in pairs:
+                user.pk = None
+                user._state.adding = True
+    return pairs, conflicts
+
+
+def provision_accounts(entries, chunk_size=CHUNK_SIZE, workers=1):
+    """
+    Legt Konten für `entries` (Dicts mit fullname, email, password) an.
+
+    Gibt eine Liste mit einem Ergebnis pro Eintrag zurück:
+    `{'index', 'status': 201, 'user_id', 'email'}` oder
+    `{'index', 'status': 400, 'errors'}`.
+    """
+    results = [None] * len(entries)
+    errors = {index: _validate_entry(entry) for index, entry in enumerate(entries)}
+
+    candidates = [index for index, entry_errors in errors.items() if not entry_errors]
+    normalized = {index: normalize_email(entries[index]['email']) for index in candidates}
+    emails = set(normalized.values())
+    usernames = {entries[index]['fullname'] for index in candidates}
+    taken_emails = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+    seen_emails, seen_usernames, valid = set(), set(), []
+    for index in candidates:
+        email, username = normalized[index], entries[index]['fullname']
+        if email in taken_emails or email in seen_emails:
+            errors[index]['email'] = ['Diese E-Mail wird bereits verwendet.']
+        if username in taken_usernames or username in seen_usernames:
+            errors[index]['fullname'] = ['Dieser Name wird bereits verwendet.']
+        seen_emails.add(email)
+        seen_usernames.add(username)
+        if not errors[index]:
+            valid.append(index)
+
+    for index, entry_errors in errors.items():
+        if entry_errors:
+            results[index] = {'index': index, 'status': 400, 'errors': entry_errors}
+
+    hashes = hash_passwords([entries[index]['password'] for index in valid], workers)
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        pairs = [
+            (index, User(username=entries[index]['fullname'], email=normalized[index], password=password))
+            for index, password in zip(chunk, hashes[start:start + chunk_size])
+        ]
+        pairs, conflicts = _write_chunk(pairs)
+        forget_misses([user.email for _, user in pairs])
+        for index, user in pairs:
+            results[index] = {'index': index, 'status': 201, 'user_id': user.pk, 'email': user.email}
+        for index, entry_errors in conflicts.items():
+            results[index] = {'index': index, 'status': 400, 'errors': entry_errors}
+
+    return results
@@ -0,0 +1,84 @@
+"""
+Schnelle Teilstring-Suche über Benutzername und E-Mail für die Mitgliedersuche.
+
+Der Index (`UserSearchTerm`) enthält pro Benutzer alle Suffixe der Wörter
+aus Benutzername und E-Mail, z.B. für "anna@example.com" u.a. "anna",
+"nna", "example", "ample". Eine Suche nach "amp" ist damit eine
+Bereichsabfrage `term >= 'amp' AND term < 'amp\\U0010ffff'` auf dem Index,
+sortiert nach `term`. Mit LIMIT hängt die Laufzeit nur von der Anzahl der
+gewünschten Treffer ab, nicht von der Anzahl der Benutzer.
+
+Bei mehreren Suchwörtern läuft die Bereichsabfrage über das längste; die
+übrigen schränken sie per Semi-Join (`user_id IN (...)`) auf derselben
+Tabelle ein. Da ein Benutzer mehrere passende Suffixe haben kann, wird in
+Blöcken weitergelesen, bis `limit` verschiedene Benutzer gefunden sind.
+
+Gepflegt wird der Index über die Signal-Handler in `user_auth_app.signals`
+und beim Provisionieren (`index_users`).
+"""
+import re
+
+from django.db.models import Q
+
+from user_auth_app.models import UserSearchTerm
+
+
+MAX_TERM_LENGTH = UserSearchTerm._meta.get_field('term').max_length
+WORD_RE = re.compile(r'[^\W_]+')
+CANDIDATE_FACTOR = 8
+
+
+def _words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def terms_for(username, email):
+    """Alle Suffixe der Wörter aus Benutzername und E-Mail (gekürzt auf MAX_TERM_LENGTH)."""
+    terms = set()
+    for word in _words(f'{username} {email}'):
+        for start in range(len(word)):
+            terms.add(word[start:start + MAX_TERM_LENGTH])
+    return terms
+
+
+def index_users(users, replace=True):
+    """Schreibt die Suchbegriffe der Benutzer neu (mit einem bulk_create)."""
+    users = list(users)
+    if replace:
+        UserSearchTerm.objects.filter(user__in=users).delete()
+    UserSearchTerm.objects.bulk_create(
+        [UserSearchTerm(user=user, term=term) for user in users for term in terms_for(user.username, user.email)],
+        batch_size=5000,
+    )
+
+
+def _prefix(word):
+    word = word[:MAX_TERM_LENGTH]
+    return Q(term__gte=word, term__lt=word + '\U0010ffff')
+
+
+def search_user_ids(query, limit):
+    """
+    IDs von höchstens `limit` Benutzern, deren Benutzername oder E-Mail alle
+    Wörter der Suche als Teilstring enthält, sortiert nach dem Treffer.
+    """
+    words = _words(query)
+    if not words:
+        return []
+    longest = max(words, key=len)
+    rows = UserSearchTerm.objects.filter(_prefix(longest))
+    for word in words:
+        if word != longest:
+            rows = rows.filter(user_id__in=UserSearchTerm.objects.filter(_prefix(word)).values('user_id'))
+    rows = rows.order_by('term', 'user_id').values_list('term', 'user_id')
+
+    found, after = {}, None
+    while len(found) < limit:
+        chunk = rows if after is None else rows.filter(Q(term__gt=after[0]) | Q(term=after[0], user_id__gt=after[1]))
+        chunk = list(chunk[:limit * CANDIDATE_FACTOR])
+        for _, user_id in chunk:
+            found.setdefault(user_id, None)
+        if len(chunk) < limit * CANDIDATE_FACTOR:
+            break
+        after = chunk[-1]
+    return list(found)[:limit]
@@ -0,0 +1,64 @@
+"""
+Signal-Handler, die den Token-Cache (`user_auth_app.token_cache`), den
+Suchindex der Mitgliedersuche (`user_auth_app.search`) und die
+Fehlschlag-Vermerke der E-Mail-Prüfung (`user_auth_app.emails`) aktuell
+halten sowie E-Mails beim Speichern normalisieren.
+
+Die Handler werden in `UserAuthAppConfig.ready()` registriert.
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user_auth_app.emails import forget_misses, normalize_email
+from user_auth_app.search import index_users
+from user_auth_app.token_cache import token_cache
+
+
+SEARCH_FIELDS = {'username', 'email'}
+# Felder des gecachten Benutzers, auf die sich die Authentifizierung stützt.
+TOKEN_CACHE_FIELDS = {'is_active', 'username', 'email', 'password'}
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    """Token gelöscht oder neu erzeugt (auch beim Löschen des Benutzers)."""
+    token_cache.invalidate([instance.key])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Geänderter Benutzer (z.B. deaktiviert oder umbenannt): gecachte Tokens
+    enthalten den alten Stand und werden verworfen. Speichern anderer
+    Felder (z.B. `last_login` beim Login) kostet keine Query.
+    """
+    if created or (update_fields is not None and not TOKEN_CACHE_FIELDS & set(update_fields)):
+        return
+    token_cache.invalidate(Token.objects.filter(user=instance).values_list('key', flat=True))
+
+
+@receiver(post_save, sender=User)
+def index_user(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Suchbegriffe neu schreiben; Speichern einzelner anderer Felder (z.B.
+    `last_login` beim Login) lässt den Index unverändert.
+    """
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    index_users([instance], replace=not created)
+
+
+@receiver(pre_save, sender=User)
+def normalize_user_email(sender, instance, **kwargs):
+    """E-Mails werden immer in Kleinbuchstaben gespeichert (auch über Admin und createsuperuser)."""
+    instance.email = normalize_email(instance.email)
+
+
+@receiver(post_save, sender=User)
+def forget_email_miss(sender, instance, update_fields=None, **kwargs):
+    """Eine neu vergebene E-Mail darf nicht mehr als 'nicht gefunden' gecacht sein."""
+    if update_fields is None or 'email' in update_fields:
+        forget_misses([instance.email])
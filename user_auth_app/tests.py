@@ -1,3 +1,295 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from core.testing import QueryBudgetMixin
+
+from user_auth_app.models import UserProfile, UserSearchTerm
+from user_auth_app import provisioning
+from user_auth_app.provisioning import provision_accounts
+from user_auth_app.search import CANDIDATE_FACTOR, index_users, search_user_ids
+from user_auth_app.token_cache import LOCAL_ONLY_TIMEOUT, TokenCache, token_cache
+
+
+class TokenCacheTests(APITestCase):
+    """
+    Gecachte Tokens kosten keine Query und werden bei Änderungen verworfen.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_costs_no_query(self):
+        self.client.get('/api/profiles/')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profiles/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_regenerated_token_is_rejected(self):
+        self.client.get('/api/profiles/')
+        self.token.delete()
+        Token.objects.create(user=self.user)
+
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get('/api/profiles/')
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get('/api/profiles/').status_code, 401)
+
+    def test_invalidation_reaches_other_workers(self):
+        # Zwei Worker-Prozesse mit demselben geteilten Cache.
+        worker, other = TokenCache(100, 300, 'default'), TokenCache(100, 300, 'default')
+        cache.clear()
+        worker.set(self.token.key, self.user, self.token)
+        self.assertIsNotNone(other.get(self.token.key))
+
+        worker.invalidate([self.token.key])
+
+        self.assertIsNone(other.get(self.token.key))
+
+    def test_local_only_cache_expires_quickly_on_other_workers(self):
+        # Zwei Worker ohne geteilten Cache: die Invalidierung erreicht nur einen.
+        worker, other = TokenCache(100, 300), TokenCache(100, 300)
+        worker.set(self.token.key, self.user, self.token)
+        other.set(self.token.key, self.user, self.token)
+
+        worker.invalidate([self.token.key])
+
+        self.assertIsNone(worker.get(self.token.key))
+        self.assertIsNotNone(other.get(self.token.key))
+        expired = time.monotonic() + LOCAL_ONLY_TIMEOUT + 1
+        with mock.patch('user_auth_app.token_cache.time.monotonic', return_value=expired):
+            self.assertIsNone(other.get(self.token.key))
+
+    def test_last_login_update_keeps_cached_token(self):
+        token_cache.set(self.token.key, self.user, self.token)
+
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(token_cache.get(self.token.key))
+
+
+class LoginTests(APITestCase):
+    """
+    Der Login lädt Benutzer und Token mit einer Query und rechnet veraltete
+    Passwort-Hashes beim Login neu.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='geheim123')
+
+    def login(self, email, password):
+        return self.client.post('/api/login/', {'email': email, 'password': password}, format='json')
+
+    def test_login_with_existing_token_costs_one_query(self):
+        token = Token.objects.create(user=self.user)
+
+        with self.assertNumQueries(1):
+            response = self.login('owner@example.com', 'geheim123')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['token'], token.key)
+
+    def test_first_login_creates_token(self):
+        response = self.login('owner@example.com', 'geheim123')
+
+        self.assertEqual(response.json()['token'], Token.objects.get(user=self.user).key)
+
+    def test_email_is_case_insensitive(self):
+        response = self.login(' Owner@Example.COM', 'geheim123')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['email'], 'owner@example.com')
+
+    def test_error_messages(self):
+        self.assertEqual(self.login('owner@example.com', 'falsch').json()['error'], 'Falsches Passwort')
+        self.assertEqual(self.login('niemand@example.com', 'x').json()['error'], 'E-Mail nicht gefunden')
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.user.password = make_password('geheim123', hasher='pbkdf2_sha1')
+        self.user.save()
+
+        self.assertEqual(self.login('owner@example.com', 'geheim123').status_code, 200)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(f'{get_hasher().algorithm}$'))
+
+    def test_email_is_unique(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='copy', email='OWNER@example.com')
+        User.objects.create_user(username='ohne-mail-1')
+        User.objects.create_user(username='ohne-mail-2')
+
+
+class BulkRegistrationTests(APITestCase):
+    """
+    Admins legen viele Konten mit einer Anfrage an; Dubletten werden gemeldet.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def test_accounts_are_created_in_bulk(self):
+        accounts = [
+            {'fullname': 'anna', 'email': 'anna@example.com', 'password': 'pw-anna'},
+            {'fullname': 'ben', 'email': 'ben@example.com', 'password': 'pw-ben'},
+            {'fullname': 'copy', 'email': 'ben@example.com', 'password': 'pw'},
+            {'fullname': 'admin', 'email': 'admin@example.com', 'password': 'pw'},
+            {'fullname': 'ohne-passwort', 'email': 'x@example.com'},
+        ]
+
+        with mock.patch('user_auth_app.provisioning.ProcessPoolExecutor') as pool:
+            response = self.client.post('/api/registration/bulk/', {'accounts': accounts}, format='json')
+        pool.assert_not_called()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['created'], response.json()['failed']), (2, 3))
+        self.assertEqual([result['status'] for result in response.json()['results']], [201, 201, 400, 400, 400])
+        anna = User.objects.get(email='anna@example.com')
+        self.assertTrue(anna.check_password('pw-anna'))
+        self.assertTrue(Token.objects.filter(user=anna).exists())
+        self.assertTrue(UserProfile.objects.filter(user=anna).exists())
+
+    def test_concurrently_created_accounts_are_reported(self):
+        accounts = [
+            {'fullname': 'anna', 'email': 'anna@example.com', 'password': 'pw'},
+            {'fullname': 'ben', 'email': 'ben@example.com', 'password': 'pw'},
+        ]
+        make_password = provisioning.make_password
+
+        def register_concurrently(password):
+            # Ein paralleler Request legt 'ben' nach der Eindeutigkeitsprüfung an.
+            if not User.objects.filter(username='ben').exists():
+                User.objects.create_user(username='ben', email='other@example.com')
+            return make_password(password)
+
+        # Der erneute Versuch kostet zusätzliche Queries über dem Budget der Route.
+        with mock.patch('user_auth_app.provisioning.make_password', register_concurrently), \
+                self.assertLogs('kanmind.requests', 'WARNING'):
+            response = self.client.post('/api/registration/bulk/', {'accounts': accounts}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([result['status'] for result in response.json()['results']], [201, 400])
+        self.assertEqual(response.json()['results'][1]['errors'], {'fullname': ['Dieser Name wird bereits verwendet.']})
+        self.assertTrue(Token.objects.filter(user__username='anna').exists())
+
+    def test_only_admins(self):
+        self.client.force_authenticate(User.objects.create_user(username='user', email='user@example.com'))
+
+        response = self.client.post('/api/registration/bulk/', {'accounts': []}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ProfileSearchTests(APITestCase):
+    """
+    Die Profilliste ist paginiert und ohne N+1; die Mitgliedersuche findet
+    Präfixe und Teilstrings in Name und E-Mail über den Suchindex.
+    """
+
+    def setUp(self):
+        for username, email in [
+            ('Anna Schmidt', 'anna.schmidt@example.com'),
+            ('Bernd Maier', 'bm@firma.de'),
+            ('Hannah Schulz', 'hannah@example.com'),
+        ]:
+            UserProfile.objects.create(user=User.objects.create_user(username=username, email=email))
+        self.client.force_authenticate(User.objects.get(username='Anna Schmidt'))
+
+    def search(self, query):
+        response = self.client.get('/api/profiles/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return [profile['fullname'] for profile in response.json()['results']]
+
+    def test_list_is_paginated_without_n_plus_one(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profiles/', {'page_size': 2})
+
+        self.assertEqual([profile['fullname'] for profile in response.json()['results']], ['Anna Schmidt', 'Bernd Maier'])
+        self.assertIsNotNone(response.json()['next'])
+
+    def test_prefix_and_substring_search(self):
+        self.assertEqual(self.search('ann'), ['Anna Schmidt', 'Hannah Schulz'])
+        self.assertEqual(self.search('MAI'), ['Bernd Maier'])
+        self.assertEqual(self.search('firma'), ['Bernd Maier'])
+        self.assertEqual(self.search('ann sch'), ['Anna Schmidt', 'Hannah Schulz'])
+        self.assertEqual(self.search('ann schm'), ['Anna Schmidt'])
+        self.assertEqual(self.search('xyz'), [])
+
+    def test_multi_word_hit_behind_many_prefix_matches(self):
+        limit = 5
+        users = User.objects.bulk_create(
+            [User(username=f'Muster {i:03}', email=f'muster{i:03}@example.com') for i in range(limit * CANDIDATE_FACTOR + 10)]
+        )
+        index_users(users, replace=False)
+        target = User.objects.create_user(username='Zyx Muster', email='zz@example.com')
+
+        self.assertEqual(search_user_ids('muster zyx', limit), [target.pk])
+        self.assertEqual(len(search_user_ids('muster', limit)), limit)
+
+    def test_index_follows_renames(self):
+        user = User.objects.get(username='Bernd Maier')
+        user.username = 'Bernd Huber'
+        user.save()
+
+        self.assertEqual(self.search('maier'), [])
+        self.assertEqual(self.search('huber'), ['Bernd Huber'])
+
+    def test_provisioned_accounts_are_indexed(self):
+        provision_accounts([{'fullname': 'Zoe Quast', 'email': 'zq@example.com', 'password': 'pw'}], workers=1)
+
+        self.assertEqual(self.search('quast'), ['Zoe Quast'])
+        self.assertTrue(UserSearchTerm.objects.filter(user__username='Zoe Quast', term='oe').exists())
+
+
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    Die Endpunkte der Benutzerverwaltung halten ihr Query-Budget ein
+    (siehe `KANMIND_QUERY_BUDGETS`); gemessen wird mit leeren Caches.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='geheim123', is_staff=True)
+        for i in range(5):
+            UserProfile.objects.create(user=User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com'))
+        self.token = Token.objects.create(user=self.admin)
+        self.routes = set()
+
+    def request(self, method, path, data=None, authenticated=True):
+        cache.clear()
+        token_cache.clear()
+        self.client.credentials(**({'HTTP_AUTHORIZATION': f'Token {self.token.key}'} if authenticated else {}))
+        response = getattr(self.client, method)(path, data, **({} if method == 'get' else {'format': 'json'}))
+        self.routes.add(response.query_profile.route)
+        return self.assertWithinQueryBudget(response)
+
+    def test_user_endpoints(self):
+        profile = UserProfile.objects.first()
+        self.request('get', '/api/profiles/')
+        self.request('get', '/api/profiles/', {'search': 'user'})
+        self.request('get', f'/api/profiles/{profile.pk}/')
+        self.request('post', '/api/registration/', {
+            'fullname': 'Neu', 'email': 'neu@example.com', 'password': 'geheim123', 'repeated_password': 'geheim123',
+        }, authenticated=False)
+        self.request('post', '/api/registration/bulk/', {
+            'accounts': [{'fullname': f'bulk{i}', 'email': f'bulk{i}@example.com', 'password': 'pw'} for i in range(5)],
+        })
+        self.request('post', '/api/login/', {'email': 'admin@example.com', 'password': 'geheim123'}, authenticated=False)
+
+        self.assertEqual(self.routes, {
+            'api/profiles/', 'api/profiles/<int:pk>/', 'api/registration/', 'api/registration/bulk/', 'api/login/',
+        })
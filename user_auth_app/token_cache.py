@@ -0,0 +1,162 @@
+"""
+Cache für die Token-Authentifizierung.
+
+Ohne Cache kostet jeder authentifizierte Request eine Query (Token JOIN
+User). `token_cache` hält `Token-Key -> (User, Token)` in einem begrenzten
+LRU-Speicher mit Ablaufzeit pro Worker-Prozess
+(`KANMIND_TOKEN_CACHE_MAX_ENTRIES`, `KANMIND_TOKEN_CACHE_TIMEOUT`).
+
+Optional liegt dahinter ein Django-Cache (`KANMIND_TOKEN_CACHE`, Alias
+oder None), damit neue Worker nicht jeden Token erst aus der Datenbank
+laden müssen. Die Keys dort sind gehasht, Tokens stehen also nicht im
+Klartext im Cache.
+
+Invalidiert wird über die Signal-Handler in `user_auth_app.signals`, wenn
+ein Token gelöscht bzw. neu erzeugt oder ein Benutzer geändert wird. Andere
+Worker-Prozesse sehen die Invalidierung nur im geteilten Cache, nicht in
+ihrem lokalen Speicher. Der lokale Speicher hält Einträge daher nur
+`KANMIND_TOKEN_CACHE_LOCAL_TIMEOUT` Sekunden (Standard: 5 ohne geteilten
+Cache, 0 mit, d.h. dann kein lokaler Speicher); so lange bleibt ein
+widerrufenes Token auf anderen Workern höchstens gültig.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+KEY_PREFIX = 'kanmind:token:'
+LOCAL_ONLY_TIMEOUT = 5
+
+
+class TokenCache:
+    """
+    LRU-Cache `key -> (User, Token)` mit Ablaufzeit, optional mit Django-Cache dahinter.
+    """
+
+    def __init__(self, max_entries, timeout, alias=None, local_timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.alias = alias
+        if local_timeout is None:
+            local_timeout = LOCAL_ONLY_TIMEOUT if alias is None else 0
+        self.local_timeout = min(local_timeout, timeout)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _shared(self):
+        return caches[self.alias] if self.alias else None
+
+    def _shared_key(self, key):
+        return KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user, token = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        # Jeder Request erhält eine eigene Kopie des Benutzers.
+        return copy.copy(user), token
+
+    def _set_local(self, key, user, token):
+        if self.max_entries <= 0 or self.local_timeout <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.local_timeout, user, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _from_shared(self, key, value):
+        if value is None:
+            self._count('misses')
+            return None
+        self._count('shared_hits')
+        user, token = value
+        self._set_local(key, user, token)
+        return copy.copy(user), token
+
+    def get(self, key):
+        """Gibt `(user, token)` oder None zurück."""
+        cached = self._get_local(key)
+        if cached is not None:
+            return cached
+        shared = self._shared()
+        return self._from_shared(key, shared.get(self._shared_key(key)) if shared else None)
+
+    async def aget(self, key):
+        """Async-Variante von `get()`."""
+        cached = self._get_local(key)
+        if cached is not None:
+            return cached
+        shared = self._shared()
+        return self._from_shared(key, await shared.aget(self._shared_key(key)) if shared else None)
+
+    def set(self, key, user, token):
+        self._set_local(key, user, token)
+        shared = self._shared()
+        if shared:
+            shared.set(self._shared_key(key), (user, token), self.timeout)
+
+    async def aset(self, key, user, token):
+        """Async-Variante von `set()`."""
+        self._set_local(key, user, token)
+        shared = self._shared()
+        if shared:
+            await shared.aset(self._shared_key(key), (user, token), self.timeout)
+
+    def invalidate(self, keys):
+        """
+        Entfernt die Tokens sofort und erneut nach dem Commit, damit ein
+        paralleler Request den alten Stand nicht wieder einträgt.
+        """
+        keys = [key for key in set(keys) if key]
+        if not keys:
+            return
+        self._count('invalidations', len(keys))
+        self._discard(keys)
+        transaction.on_commit(lambda: self._discard(keys))
+
+    def _discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        shared = self._shared()
+        if shared:
+            shared.delete_many([self._shared_key(key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            current = dict(self._stats)
+            current['entries'] = len(self._entries)
+        lookups = current['hits'] + current['shared_hits'] + current['misses']
+        current['hit_ratio'] = round((current['hits'] + current['shared_hits']) / lookups, 4) if lookups else None
+        return current
+
+
+token_cache = TokenCache(
+    settings.KANMIND_TOKEN_CACHE_MAX_ENTRIES,
+    settings.KANMIND_TOKEN_CACHE_TIMEOUT,
+    settings.KANMIND_TOKEN_CACHE,
+    settings.KANMIND_TOKEN_CACHE_LOCAL_TIMEOUT,
+)